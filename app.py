@@ -32,13 +32,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-from flask import Flask, jsonify, redirect, render_template, request, send_file, session, url_for
+from flask import Flask, g, jsonify, redirect, render_template, request, send_file, session, url_for
 from flask_cors import CORS
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import Flow
 
 from llm import compare_invoice_po
-from ocr import extract_text_from_pdf
+from ocr import (
+    OpenedPdf,
+    extract_text_from_pdf,
+    get_ocr_cache_stats,
+    get_ocr_readiness,
+    ocr_trace,
+    open_pdf,
+    preload_ocr_engines,
+)
+from parser import row_trace
 
 
 if os.getenv("FLASK_ENV") == "development":
@@ -56,13 +65,50 @@ CORS(app, resources={
             "http://127.0.0.1:3000"
         ],
         "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type", "Authorization"]
+        "allow_headers": ["Content-Type", "Authorization", "X-OCR-Trace", "X-Parser-Trace-Rows"]
     }
 })
 print("PRODUCTION CORS CONFIG LOADED", flush=True)
 logger.info("PRODUCTION CORS CONFIG LOADED")
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+# Warm OCR models in the background; /ready reports 503 until they are loaded.
+if os.getenv("OCR_PRELOAD", "0") == "1":
+    preload_ocr_engines(background=True)
+
+
+@app.before_request
+def _start_ocr_trace():
+    # "X-OCR-Trace: 1" logs per-box and per-row OCR detail for this request
+    # only; other requests keep one summary record per page.
+    if request.headers.get("X-OCR-Trace") == "1":
+        g.ocr_trace = ocr_trace()
+        g.ocr_trace.__enter__()
+
+
+@app.teardown_request
+def _end_ocr_trace(exc):
+    trace_block = g.pop("ocr_trace", None)
+    if trace_block is not None:
+        trace_block.__exit__(None, None, None)
+
+
+@app.before_request
+def _start_row_trace():
+    # "X-Parser-Trace-Rows: monitor" logs how every candidate line-item row
+    # containing "monitor" was parsed, for this request only.
+    rows = request.headers.get("X-Parser-Trace-Rows", "").strip()
+    if rows:
+        g.row_trace = row_trace(rows)
+        g.row_trace.__enter__()
+
+
+@app.teardown_request
+def _end_row_trace(exc):
+    trace_block = g.pop("row_trace", None)
+    if trace_block is not None:
+        trace_block.__exit__(None, None, None)
+
 
 @app.errorhandler(404)
 def not_found(e):
@@ -237,43 +283,31 @@ def verify_route():
     if invoice_header != b"%PDF" or po_header != b"%PDF":
         return jsonify({"error": True, "message": "Invalid PDF file detected."}), 400
 
+    # Each upload is parsed once: the same handle serves the encryption
+    # check, PDF type detection, and text extraction.
+    with open_pdf(invoice_file.stream.read()) as invoice_pdf, open_pdf(po_file.stream.read()) as po_pdf:
+        return _verify_opened_pdfs(invoice_pdf, po_pdf)
+
+
+def _verify_opened_pdfs(invoice_pdf: OpenedPdf, po_pdf: OpenedPdf):
     # 3b) CHECK FOR ENCRYPTED PDF
-    try:
-        import fitz
-        for label, fobj in [("Invoice", invoice_file), ("PO", po_file)]:
-            fobj.stream.seek(0)
-            doc = fitz.open(stream=fobj.stream.read(), filetype="pdf")
-            if doc.is_encrypted:
-                doc.close()
-                return jsonify({"error": True, "message": f"{label} PDF is encrypted/password-protected. Please upload an unprotected file."}), 400
-            doc.close()
-            fobj.stream.seek(0)
-    except ImportError:
-        pass
-    except Exception as exc:
-        logger.warning("Encrypted PDF check failed: %s", exc)
+    for label, doc in [("Invoice", invoice_pdf), ("PO", po_pdf)]:
+        if doc.is_encrypted:
+            return jsonify({"error": True, "message": f"{label} PDF is encrypted/password-protected. Please upload an unprotected file."}), 400
 
     # 4) CHECK FILE SIZE (max 10MB each)
     MAX_FILE_SIZE = 10 * 1024 * 1024
 
-    invoice_file.stream.seek(0, os.SEEK_END)
-    invoice_size = invoice_file.stream.tell()
-    invoice_file.stream.seek(0)
-
-    po_file.stream.seek(0, os.SEEK_END)
-    po_size = po_file.stream.tell()
-    po_file.stream.seek(0)
-
-    if invoice_size > MAX_FILE_SIZE or po_size > MAX_FILE_SIZE:
+    if len(invoice_pdf.data) > MAX_FILE_SIZE or len(po_pdf.data) > MAX_FILE_SIZE:
         return jsonify({"error": True, "message": "File size must be under 10MB."}), 400
 
     # 5) WRAP OCR + COMPARISON CALLS IN TRY/EXCEPT
     try:
         logger.info("CALL CHAIN /verify -> OCR extraction start for invoice")
-        invoice_text = extract_text_from_pdf(invoice_file.stream.read())
+        invoice_text = extract_text_from_pdf(invoice_pdf)
         logger.info("CALL CHAIN /verify -> OCR extraction complete for invoice chars=%d", len(invoice_text))
         logger.info("CALL CHAIN /verify -> OCR extraction start for purchase_order")
-        po_text = extract_text_from_pdf(po_file.stream.read())
+        po_text = extract_text_from_pdf(po_pdf)
         logger.info("CALL CHAIN /verify -> OCR extraction complete for purchase_order chars=%d", len(po_text))
 
         if len(invoice_text.strip()) < 20 or len(po_text.strip()) < 20:
@@ -399,6 +433,17 @@ def verify_invoice_json():
     })
 
 
+@app.route("/ready", methods=["GET"])
+def readiness():
+    status = get_ocr_readiness()
+    return jsonify(status), 200 if status["ready"] else 503
+
+
+@app.route("/api/ocr/cache-stats", methods=["GET"])
+def ocr_cache_stats():
+    return jsonify(get_ocr_cache_stats())
+
+
 @app.route("/export-pdf", methods=["POST"])
 def export_pdf():
     status = request.form.get("status", "Unknown")
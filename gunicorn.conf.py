@@ -0,0 +1,11 @@
+# Gunicorn settings (loaded automatically from the working directory).
+import os
+
+
+def post_fork(server, worker):
+    # Each worker owns its OCR engine pool; load the models before the worker
+    # starts accepting requests so the first upload does not pay for them.
+    if os.getenv("OCR_PRELOAD", "0") == "1":
+        from ocr import preload_ocr_engines
+
+        preload_ocr_engines()
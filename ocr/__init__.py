@@ -4,7 +4,27 @@ The package exposes the same simple API the MVP had while adding
 modular detection, preprocessing, and engine selection internally.
 """
 
+from .cache import get_ocr_cache_stats
 from .detect_pdf_type import detect_pdf_type
-from .extract import extract_pdf_content, extract_text_from_pdf
+from .diagnostics import ocr_trace
+from .document import OpenedPdf, open_pdf
+from .extract import (
+    extract_pdf_content,
+    extract_text_from_pdf,
+    get_ocr_readiness,
+    iter_pdf_pages,
+    preload_ocr_engines,
+)
 
-__all__ = ["detect_pdf_type", "extract_pdf_content", "extract_text_from_pdf"]
+__all__ = [
+    "OpenedPdf",
+    "detect_pdf_type",
+    "extract_pdf_content",
+    "extract_text_from_pdf",
+    "get_ocr_cache_stats",
+    "get_ocr_readiness",
+    "iter_pdf_pages",
+    "ocr_trace",
+    "open_pdf",
+    "preload_ocr_engines",
+]
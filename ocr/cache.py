@@ -0,0 +1,292 @@
+"""Content-addressed caches for OCR results.
+
+``OcrResultCache`` holds whole ``extract_pdf_content`` results.  Entries are
+keyed by a hash of the uploaded PDF bytes combined with the OCR
+configuration fingerprint, so re-uploads of the same invoice/PO skip
+detection, rendering, and OCR entirely.  The store is a single SQLite file
+shared by every worker process; entries expire ``OCR_CACHE_MAX_AGE_HOURS``
+after they were stored, and beyond that eviction is least-recently-used by
+total stored size.
+
+The result cache is off unless ``OCR_CACHE_ENABLED=1``.  It keeps the full
+extracted text of every uploaded invoice/PO on disk at ``OCR_CACHE_PATH``
+(relative paths resolve against the working directory) until the entry
+expires or is evicted, so enable it only where retaining document contents
+for that long is acceptable, and point it at storage with the same access
+controls as the uploads themselves.
+
+``PageOcrCache`` holds single OCR'd pages keyed by their image content, so a
+page that recurs across different documents (a letterhead, a terms annexure)
+skips preprocessing and OCR.  It lives in process memory and is bounded by
+entry count and stored size.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_CACHE_ENABLED = os.getenv("OCR_CACHE_ENABLED", "0") == "1"
+_CACHE_PATH = Path(os.getenv("OCR_CACHE_PATH", str(Path("uploads") / "cache" / "ocr_results.sqlite3")))
+_CACHE_MAX_BYTES = int(float(os.getenv("OCR_CACHE_MAX_MB", "256")) * 1024 * 1024)
+# Stored results older than this are dropped regardless of use; 0 keeps them
+# until size eviction.
+_CACHE_MAX_AGE_SECONDS = float(os.getenv("OCR_CACHE_MAX_AGE_HOURS", "24")) * 3600
+_PAGE_CACHE_ENABLED = os.getenv("OCR_PAGE_CACHE_ENABLED", "1") == "1"
+_PAGE_CACHE_MAX_ENTRIES = int(os.getenv("OCR_PAGE_CACHE_MAX_ENTRIES", "512"))
+_PAGE_CACHE_MAX_BYTES = int(float(os.getenv("OCR_PAGE_CACHE_MAX_MB", "16")) * 1024 * 1024)
+
+
+def make_cache_key(file_bytes: bytes, config_fingerprint: str) -> str:
+    """Return the cache key for *file_bytes* under the given OCR configuration."""
+    digest = hashlib.sha256()
+    digest.update(hashlib.sha256(file_bytes).digest())
+    digest.update(config_fingerprint.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class OcrResultCache:
+    """SQLite-backed result store with age expiry and size-bounded LRU eviction.
+
+    Hit/miss counters are per process; entry count and stored size are read
+    from the shared database.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        max_bytes: int = _CACHE_MAX_BYTES,
+        max_age_seconds: float = _CACHE_MAX_AGE_SECONDS,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " stored_at REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(entries)")}
+            if "stored_at" not in columns:
+                # Stores created before age expiry: their entries count as expired.
+                conn.execute("ALTER TABLE entries ADD COLUMN stored_at REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)")
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _expired_before(self, now: float) -> float | None:
+        return now - self.max_age_seconds if self.max_age_seconds > 0 else None
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    now = time.time()
+                    row = conn.execute("SELECT value, stored_at FROM entries WHERE key = ?", (key,)).fetchone()
+                    cutoff = self._expired_before(now)
+                    if row is not None and cutoff is not None and row[1] < cutoff:
+                        conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        row = None
+                    elif row is not None:
+                        conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            except sqlite3.Error as exc:
+                logger.warning("[OCR-CACHE] lookup failed: %s", exc)
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: dict) -> None:
+        payload = json.dumps(value, ensure_ascii=True).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            logger.info("[OCR-CACHE] result of %d bytes exceeds cache size; not stored", len(payload))
+            return
+        with self._lock:
+            try:
+                with self._connect() as conn:
+                    now = time.time()
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, last_access, stored_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (key, payload, len(payload), now, now),
+                    )
+                    self._evict(conn, now)
+            except sqlite3.Error as exc:
+                logger.warning("[OCR-CACHE] store failed: %s", exc)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        cutoff = self._expired_before(now)
+        if cutoff is not None:
+            expired = conn.execute("DELETE FROM entries WHERE stored_at < ?", (cutoff,)).rowcount
+            if expired:
+                logger.info("[OCR-CACHE] expired %d entries older than %.0fs", expired, self.max_age_seconds)
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logger.info("[OCR-CACHE] evicted %d entries; stored_bytes=%d", evicted, total)
+
+    def clear(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def stats(self) -> dict:
+        entries, size = 0, 0
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("[OCR-CACHE] stats query failed: %s", exc)
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "stored_bytes": size,
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+
+_RESULT_CACHE: OcrResultCache | None = None
+_RESULT_CACHE_INIT_FAILED = False
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache() -> OcrResultCache | None:
+    """Return the process-wide result cache, or None when disabled/unavailable."""
+    global _RESULT_CACHE, _RESULT_CACHE_INIT_FAILED
+    if not _CACHE_ENABLED or _RESULT_CACHE_INIT_FAILED:
+        return None
+    if _RESULT_CACHE is not None:
+        return _RESULT_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None and not _RESULT_CACHE_INIT_FAILED:
+            try:
+                _RESULT_CACHE = OcrResultCache(_CACHE_PATH)
+                logger.info("[OCR-CACHE] using %s (max_bytes=%d)", _CACHE_PATH, _RESULT_CACHE.max_bytes)
+            except (OSError, sqlite3.Error) as exc:
+                _RESULT_CACHE_INIT_FAILED = True
+                logger.warning("[OCR-CACHE] disabled; could not open %s: %s", _CACHE_PATH, exc)
+    return _RESULT_CACHE
+
+
+class PageOcrCache:
+    """In-memory LRU of OCR'd pages bounded by entry count and stored size.
+
+    Values are stored as JSON so every hit returns a fresh copy that callers
+    may modify.
+    """
+
+    def __init__(self, max_entries: int = _PAGE_CACHE_MAX_ENTRIES, max_bytes: int = _PAGE_CACHE_MAX_BYTES):
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._stored_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, key: str, value: dict) -> None:
+        payload = json.dumps(value, ensure_ascii=True).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._stored_bytes -= len(previous)
+            self._entries[key] = payload
+            self._stored_bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._stored_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._stored_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._stored_bytes = 0
+
+    def reinit_after_fork(self) -> None:
+        """Replace a lock that may have been held by another thread at fork time."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "stored_bytes": self._stored_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+_PAGE_CACHE = PageOcrCache() if _PAGE_CACHE_ENABLED else None
+if _PAGE_CACHE is not None:
+    os.register_at_fork(after_in_child=_PAGE_CACHE.reinit_after_fork)
+
+
+def get_page_cache() -> PageOcrCache | None:
+    """Return the process-wide page cache, or None when disabled."""
+    return _PAGE_CACHE
+
+
+def get_ocr_cache_stats() -> dict:
+    cache = get_result_cache()
+    if cache is None:
+        stats = {"enabled": False, "hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0, "stored_bytes": 0, "max_bytes": 0}
+    else:
+        stats = cache.stats()
+    page_cache = get_page_cache()
+    stats["page_cache"] = page_cache.stats() if page_cache is not None else {"enabled": False}
+    return stats
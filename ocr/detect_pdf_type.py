@@ -1,102 +1,191 @@
 from __future__ import annotations
 
 import logging
-from io import BytesIO
+import os
 
-import fitz
-import pdfplumber
+from .document import OpenedPdf, open_pdf
 
 logger = logging.getLogger(__name__)
 
 _MIN_TEXT_CHARS = 60
 _MIN_AVG_CHARS_PER_PAGE = 20
+# "fast" = PyMuPDF only with early exit; "full" = PyMuPDF + pdfplumber on every page.
+_DETECTION_MODE = os.getenv("PDF_DETECTION_MODE", "fast").lower()
 
 
-def _extract_with_pymupdf(data: bytes) -> tuple[str, int]:
-    parts: list[str] = []
-    page_count = 0
-    with fitz.open(stream=data, filetype="pdf") as doc:
-        page_count = len(doc)
-        for page in doc:
-            parts.append(page.get_text("text") or "")
-    return "\n".join(parts).strip(), page_count
-
-
-def _extract_with_pdfplumber(data: bytes) -> tuple[str, int]:
-    parts: list[str] = []
-    with pdfplumber.open(BytesIO(data)) as pdf:
-        page_count = len(pdf.pages)
-        for page in pdf.pages:
-            try:
-                parts.append((page.extract_text() or "").strip())
-            except Exception as exc:
-                logger.debug("pdfplumber page extraction failed: %s", exc)
-                parts.append("")
-    return "\n".join(part for part in parts if part).strip(), page_count
-
-
-def detect_pdf_type(file_bytes: bytes) -> dict:
-    """Classify a PDF as text or scanned using lightweight native extraction."""
-    if not file_bytes:
+def _extract_with_pymupdf(doc: OpenedPdf) -> tuple[str, int]:
+    parts = doc.fitz_page_texts()
+    return "\n".join(parts).strip(), len(parts)
+
+
+def _extract_with_pdfplumber(doc: OpenedPdf) -> tuple[str, int]:
+    parts = [text.strip() for text in doc.plumber_page_texts()]
+    return "\n".join(part for part in parts if part).strip(), len(parts)
+
+
+def _classify_page(page_number: int, chars: int | None, has_text_layer: bool = True) -> dict:
+    """Per-page verdict used to route pages to direct extraction or OCR.
+
+    ``chars`` is None for pages whose text was never read because the
+    document-level decision was already settled; those pages are classified
+    from the cheap font probe and re-checked during extraction.
+    """
+    if chars is None:
+        page_type = "text" if has_text_layer else "scanned"
+    else:
+        page_type = "text" if chars >= _MIN_AVG_CHARS_PER_PAGE else "scanned"
+    return {"page_number": page_number, "page_type": page_type, "chars": chars}
+
+
+def _resolve_mode(mode: str | None) -> str:
+    mode = (mode or _DETECTION_MODE).lower()
+    return mode if mode in ("fast", "full") else "fast"
+
+
+def detect_pdf_type(file_bytes: bytes | OpenedPdf, mode: str | None = None) -> dict:
+    """Classify a PDF as text or scanned using lightweight native extraction.
+
+    Accepts raw bytes or a shared :class:`OpenedPdf`; with a shared handle the
+    per-page text extracted here is reused by the extraction stage.
+
+    ``mode="fast"`` (the default, see ``PDF_DETECTION_MODE``) uses PyMuPDF
+    only and stops reading text once the document verdict is settled;
+    ``mode="full"`` extracts every page with both PyMuPDF and pdfplumber.
+    Both modes report a per-page ``pages`` classification so mixed documents
+    can send only their scanned pages to OCR.
+    """
+    if not file_bytes or (isinstance(file_bytes, OpenedPdf) and not file_bytes.data):
         return {
             "pdf_type": "unknown",
             "reason": "empty_file",
             "text_length": 0,
             "page_count": 0,
             "avg_chars_per_page": 0.0,
+            "pages": [],
         }
 
-    data = bytes(file_bytes)
+    if isinstance(file_bytes, OpenedPdf):
+        return _detect_pdf_type(file_bytes, _resolve_mode(mode))
+    with open_pdf(file_bytes) as doc:
+        return _detect_pdf_type(doc, _resolve_mode(mode))
+
 
+def _detect_pdf_type(doc: OpenedPdf, mode: str) -> dict:
     # Check for encrypted PDF
-    try:
-        doc = fitz.open(stream=data, filetype="pdf")
-        if doc.is_encrypted:
-            doc.close()
-            return {
-                "pdf_type": "encrypted",
-                "reason": "pdf_is_encrypted",
-                "text_length": 0,
-                "page_count": 0,
-                "avg_chars_per_page": 0.0,
-            }
-        doc.close()
-    except Exception as exc:
-        logger.debug("Encrypted PDF check failed: %s", exc)
+    if doc.is_encrypted:
+        return {
+            "pdf_type": "encrypted",
+            "reason": "pdf_is_encrypted",
+            "text_length": 0,
+            "page_count": 0,
+            "avg_chars_per_page": 0.0,
+            "pages": [],
+        }
 
+    if mode == "fast" and doc.fitz_doc is not None:
+        try:
+            result = _detect_fast(doc)
+        except Exception as exc:
+            logger.debug("Fast PDF type detection failed, using full detection: %s", exc)
+        else:
+            logger.info("PDF detection result: %s", result)
+            return result
+
+    result = _detect_full(doc)
+    logger.info("PDF detection result: %s", result)
+    return result
+
+
+def _verdict(text_length: int, page_count: int) -> tuple[str, str, float]:
+    avg_chars = text_length / page_count if page_count else 0.0
+    if text_length < _MIN_TEXT_CHARS or avg_chars < _MIN_AVG_CHARS_PER_PAGE:
+        return "scanned", "embedded_text_too_low", avg_chars
+    return "text", "sufficient_embedded_text", avg_chars
+
+
+def _detect_fast(doc: OpenedPdf) -> dict:
+    """PyMuPDF-only detection that reads no more page text than necessary.
+
+    Pages without any font resources cannot carry a text layer and are
+    classified as scanned without extracting text.  The remaining pages are
+    read in order until the document thresholds are provably met; pages after
+    that point keep the font-probe verdict.  The thresholds are provably
+    missed only once every font-bearing page has been read.
+    """
+    page_count = doc.page_count
+    has_fonts = [doc.fitz_page_has_fonts(index) for index in range(page_count)]
+    required_chars = max(_MIN_TEXT_CHARS, _MIN_AVG_CHARS_PER_PAGE * page_count)
+
+    page_chars: list[int | None] = [None if flag else 0 for flag in has_fonts]
+    preview_parts: list[str] = []
+    text_length = 0
+    pages_read = 0
+    for index in range(page_count):
+        if text_length >= required_chars:
+            break
+        if not has_fonts[index]:
+            continue
+        page_text = doc.fitz_page_text(index).strip()
+        pages_read += 1
+        page_chars[index] = len(page_text)
+        text_length += len(page_text)
+        if page_text:
+            preview_parts.append(page_text)
+
+    pdf_type, reason, avg_chars = _verdict(text_length, page_count)
+    return {
+        "pdf_type": pdf_type,
+        "reason": reason,
+        "text_length": text_length,
+        "page_count": page_count,
+        "avg_chars_per_page": round(avg_chars, 2),
+        "text_preview": "\n".join(preview_parts)[:500],
+        "mode": "fast",
+        "pages_read": pages_read,
+        "pages": [
+            _classify_page(index + 1, page_chars[index], has_fonts[index])
+            for index in range(page_count)
+        ],
+    }
+
+
+def _detect_full(doc: OpenedPdf) -> dict:
     fitz_text = ""
     fitz_pages = 0
     plumber_text = ""
     plumber_pages = 0
 
     try:
-        fitz_text, fitz_pages = _extract_with_pymupdf(data)
+        fitz_text, fitz_pages = _extract_with_pymupdf(doc)
     except Exception as exc:
         logger.debug("PyMuPDF type detection failed: %s", exc)
 
     try:
-        plumber_text, plumber_pages = _extract_with_pdfplumber(data)
+        plumber_text, plumber_pages = _extract_with_pdfplumber(doc)
     except Exception as exc:
         logger.debug("pdfplumber type detection failed: %s", exc)
 
     extracted_text = plumber_text if len(plumber_text) >= len(fitz_text) else fitz_text
     page_count = max(fitz_pages, plumber_pages)
     text_length = len(extracted_text.strip())
-    avg_chars = text_length / page_count if page_count else 0.0
+    pdf_type, reason, avg_chars = _verdict(text_length, page_count)
 
-    pdf_type = "text"
-    reason = "sufficient_embedded_text"
-    if text_length < _MIN_TEXT_CHARS or avg_chars < _MIN_AVG_CHARS_PER_PAGE:
-        pdf_type = "scanned"
-        reason = "embedded_text_too_low"
+    page_chars = [0] * page_count
+    if fitz_pages:
+        for index, text in enumerate(doc.fitz_page_texts()):
+            page_chars[index] = max(page_chars[index], len(text.strip()))
+    if plumber_pages:
+        for index, text in enumerate(doc.plumber_page_texts()):
+            page_chars[index] = max(page_chars[index], len(text.strip()))
 
-    result = {
+    return {
         "pdf_type": pdf_type,
         "reason": reason,
         "text_length": text_length,
         "page_count": page_count,
         "avg_chars_per_page": round(avg_chars, 2),
         "text_preview": extracted_text[:500],
+        "mode": "full",
+        "pages_read": page_count,
+        "pages": [_classify_page(index + 1, chars) for index, chars in enumerate(page_chars)],
     }
-    logger.info("PDF detection result: %s", result)
-    return result
@@ -0,0 +1,67 @@
+"""Level-guarded OCR diagnostics.
+
+Per-box and per-row detail (raw PaddleOCR items, normalized entries,
+reconstructed rows) is costly to format and floods production logs.  It is
+produced only while tracing is on: when the logger is enabled for DEBUG, when
+``OCR_TRACE=1``, or inside an :func:`ocr_trace` block scoped to one request.
+Without tracing each OCR'd page leaves a single ``[OCR-PAGE]`` summary record.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_TRACE_ALL = os.getenv("OCR_TRACE", "0") == "1"
+_REQUEST_TRACE: ContextVar[bool] = ContextVar("ocr_request_trace", default=False)
+
+
+@contextmanager
+def ocr_trace(enabled: bool = True):
+    """Trace OCR detail for the code run inside the ``with`` block.
+
+    The flag lives in a context variable, so concurrent requests on other
+    threads are unaffected; OCR worker processes receive it explicitly.
+    """
+    token = _REQUEST_TRACE.set(enabled)
+    try:
+        yield
+    finally:
+        _REQUEST_TRACE.reset(token)
+
+
+def request_trace_enabled() -> bool:
+    """True when ``OCR_TRACE`` is set or the current request asked for a trace."""
+    return _TRACE_ALL or _REQUEST_TRACE.get()
+
+
+def tracing(log: logging.Logger) -> bool:
+    """Whether detail records for *log* would be emitted; check before building them."""
+    return request_trace_enabled() or log.isEnabledFor(logging.DEBUG)
+
+
+def trace(log: logging.Logger, msg: str, *args) -> None:
+    """Emit a detail record.
+
+    Traced requests log at INFO so the records pass a production log level;
+    otherwise they are plain DEBUG records.
+    """
+    if request_trace_enabled():
+        log.info(msg, *args)
+    else:
+        log.debug(msg, *args)
+
+
+class Preview:
+    """``repr()`` of a value truncated to *limit* chars, built only when formatted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value, limit: int = 300):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        return repr(self.value)[: self.limit]
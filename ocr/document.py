@@ -0,0 +1,170 @@
+"""Shared per-upload PDF handle.
+
+A single ``/verify`` request used to parse the same bytes four times: once
+for the encryption check, twice in ``detect_pdf_type`` (PyMuPDF and
+pdfplumber), and again in ``_extract_text_pdfplumber``.  ``OpenedPdf`` opens
+each parser lazily, at most once, and memoizes per-page text so detection and
+extraction share the work.
+"""
+
+from __future__ import annotations
+
+import logging
+from io import BytesIO
+
+import fitz
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+
+class OpenedPdf:
+    """Lazily-opened PyMuPDF and pdfplumber views over one PDF upload.
+
+    Use as a context manager (or call :meth:`close`) to release both parsers.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = bytes(data)
+        self._fitz_doc = None
+        self._fitz_failed = False
+        self._plumber_pdf = None
+        self._fitz_texts: dict[int, str] = {}
+        self._plumber_texts: dict[int, str] = {}
+        self._plumber_tables: dict[int, list] = {}
+        self._plumber_layouts: dict[int, list] = {}
+
+    def __enter__(self) -> "OpenedPdf":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def fitz_doc(self):
+        """The PyMuPDF document, or None if the bytes cannot be opened."""
+        if self._fitz_doc is None and not self._fitz_failed:
+            try:
+                self._fitz_doc = fitz.open(stream=self.data, filetype="pdf")
+            except Exception as exc:
+                self._fitz_failed = True
+                logger.debug("PyMuPDF could not open document: %s", exc)
+        return self._fitz_doc
+
+    @property
+    def is_encrypted(self) -> bool:
+        doc = self.fitz_doc
+        return bool(doc is not None and doc.is_encrypted)
+
+    @property
+    def plumber_pdf(self):
+        """The pdfplumber document; raises if the bytes cannot be parsed."""
+        if self._plumber_pdf is None:
+            self._plumber_pdf = pdfplumber.open(BytesIO(self.data))
+        return self._plumber_pdf
+
+    def _require_fitz(self):
+        doc = self.fitz_doc
+        if doc is None:
+            raise RuntimeError("PyMuPDF could not open document")
+        return doc
+
+    @property
+    def page_count(self) -> int:
+        return len(self._require_fitz())
+
+    def fitz_page_text(self, index: int) -> str:
+        """Raw PyMuPDF text of one page, extracted at most once."""
+        if index not in self._fitz_texts:
+            self._fitz_texts[index] = self._require_fitz()[index].get_text("text") or ""
+        return self._fitz_texts[index]
+
+    def fitz_page_texts(self) -> list[str]:
+        """Raw PyMuPDF text of every page (raises if PyMuPDF cannot open the file)."""
+        return [self.fitz_page_text(index) for index in range(self.page_count)]
+
+    def fitz_page_has_fonts(self, index: int) -> bool:
+        """Cheap text-layer probe: a page that references no fonts has no text."""
+        return bool(self._require_fitz().get_page_fonts(index))
+
+    @property
+    def plumber_page_count(self) -> int:
+        return len(self.plumber_pdf.pages)
+
+    def plumber_page_text(self, index: int) -> str:
+        """Raw pdfplumber text of one page, extracted at most once; ``""`` if it fails."""
+        if index not in self._plumber_texts:
+            try:
+                text = self.plumber_pdf.pages[index].extract_text() or ""
+            except Exception as exc:
+                logger.warning("pdfplumber page %d text extraction failed: %s", index, exc)
+                text = ""
+            self._plumber_texts[index] = text
+        return self._plumber_texts[index]
+
+    def plumber_page_texts(self) -> list[str]:
+        """Raw pdfplumber text of every page; pages that fail extract as ``""``."""
+        return [self.plumber_page_text(index) for index in range(self.plumber_page_count)]
+
+    def plumber_page_tables(self, index: int) -> list:
+        """pdfplumber tables of one page, extracted at most once; ``[]`` if it fails."""
+        if index not in self._plumber_tables:
+            try:
+                tables = self.plumber_pdf.pages[index].extract_tables() or []
+            except Exception as exc:
+                logger.warning("pdfplumber page %d table extraction failed: %s", index, exc)
+                tables = []
+            self._plumber_tables[index] = tables
+        return self._plumber_tables[index]
+
+    def plumber_page_layout(self, index: int) -> list:
+        """One page's blocks in reading order: text strings and table rows.
+
+        Characters inside a table's bounding box are left to the table, so a
+        table's content appears once instead of in both the text and the
+        table rows.  Text lines are grouped between the tables by their
+        vertical position, keeping the order the page text had.  A page
+        without tables reuses the text read by detection; a page that fails
+        extracts as ``[]``.  Only the requested page is read, and the result
+        is memoized.
+        """
+        if index not in self._plumber_layouts:
+            try:
+                page = self.plumber_pdf.pages[index]
+                found = page.find_tables()
+                if not found:
+                    text = self.plumber_page_text(index)
+                    layout = [text] if text else []
+                else:
+                    outside = page
+                    for table in found:
+                        outside = outside.outside_bbox(table.bbox, strict=False)
+                    positioned = [(line["top"], line["text"]) for line in outside.extract_text_lines()]
+                    positioned += [(table.bbox[1], table.extract()) for table in found]
+                    positioned.sort(key=lambda block: block[0])
+                    layout = []
+                    for _, block in positioned:
+                        if isinstance(block, str) and layout and isinstance(layout[-1], str):
+                            layout[-1] += "\n" + block
+                        else:
+                            layout.append(block)
+            except Exception as exc:
+                logger.warning("pdfplumber page %d layout extraction failed: %s", index, exc)
+                layout = []
+            self._plumber_layouts[index] = layout
+        return self._plumber_layouts[index]
+
+    def close(self) -> None:
+        if self._fitz_doc is not None:
+            self._fitz_doc.close()
+            self._fitz_doc = None
+        if self._plumber_pdf is not None:
+            self._plumber_pdf.close()
+            self._plumber_pdf = None
+
+
+def open_pdf(file_bytes: bytes | OpenedPdf) -> OpenedPdf:
+    """Wrap raw bytes in an :class:`OpenedPdf`; existing handles pass through."""
+    if isinstance(file_bytes, OpenedPdf):
+        return file_bytes
+    return OpenedPdf(file_bytes)
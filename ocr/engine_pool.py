@@ -0,0 +1,189 @@
+"""Bounded pool of warm OCR engine instances.
+
+Loading a PaddleOCR model takes seconds and each instance is not safe to
+share between concurrent calls.  ``OcrEnginePool`` owns up to ``size``
+independent instances built by a factory; callers borrow one with
+:meth:`OcrEnginePool.checkout` and it is returned automatically.  Engines are
+created lazily on first checkout, or all at once by :meth:`preload` (at app
+startup or from a gunicorn ``post_fork`` hook) so that readiness can be
+reported before traffic arrives.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Pool states reported by status():
+#   cold        - no engine created yet
+#   loading     - preload() is building engines
+#   ready       - at least one engine has been created
+#   unavailable - the factory returned no engine (disabled or not installed)
+_COLD, _LOADING, _READY, _UNAVAILABLE = "cold", "loading", "ready", "unavailable"
+
+
+class OcrEnginePool:
+    """Checkout/checkin pool of at most ``size`` engines built by ``factory``.
+
+    ``factory`` returns a new engine, or None when the engine cannot be used
+    in this process; the pool then reports itself unavailable and every
+    checkout yields None so callers can fall back to another engine.
+    """
+
+    def __init__(self, factory: Callable[[], object | None], size: int = 1, name: str = "ocr"):
+        self.name = name
+        self.size = max(1, size)
+        self._factory = factory
+        self._idle: list = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._preload_requested = False
+        self.state = _COLD
+        self.error: str | None = None
+        self.load_seconds: float | None = None
+
+    # ------------------------------------------------------------------
+    # Engine creation
+    # ------------------------------------------------------------------
+    def _reserve_slot(self) -> bool:
+        """Claim the right to create one more engine; caller holds the lock."""
+        if self.state == _UNAVAILABLE or self._created >= self.size:
+            return False
+        self._created += 1
+        return True
+
+    def _build_engine(self):
+        try:
+            engine = self._factory()
+        except Exception as exc:
+            logger.warning("[OCR-POOL] %s engine creation failed: %s", self.name, exc)
+            self.error = str(exc)
+            engine = None
+        with self._cond:
+            if engine is None:
+                self._created -= 1
+                if self._created == 0:
+                    self.state = _UNAVAILABLE
+            elif self.state != _LOADING:
+                self.state = _READY
+            self._cond.notify_all()
+        return engine
+
+    def preload(self) -> bool:
+        """Create every engine now; returns True once the pool is ready.
+
+        Safe to call more than once or concurrently: only missing engines are
+        built.
+        """
+        with self._cond:
+            self._preload_requested = True
+            if self.state in (_LOADING, _UNAVAILABLE):
+                return False
+            if self.state == _READY and self._created >= self.size:
+                return True
+            self.state = _LOADING
+        started = time.monotonic()
+        engines = []
+        while True:
+            with self._cond:
+                if not self._reserve_slot():
+                    break
+            engine = self._build_engine()
+            if engine is None:
+                break
+            engines.append(engine)
+
+        with self._cond:
+            self._idle.extend(engines)
+            self.state = _READY if self._created else _UNAVAILABLE
+            self.load_seconds = round(time.monotonic() - started, 3)
+            self._cond.notify_all()
+        logger.info(
+            "[OCR-POOL] %s preload finished: state=%s engines=%d in %.2fs",
+            self.name,
+            self.state,
+            self._created,
+            self.load_seconds,
+        )
+        return self.state == _READY
+
+    def preload_in_background(self) -> threading.Thread:
+        with self._cond:
+            self._preload_requested = True
+        thread = threading.Thread(target=self.preload, name=f"{self.name}-preload", daemon=True)
+        thread.start()
+        return thread
+
+    # ------------------------------------------------------------------
+    # Checkout / checkin
+    # ------------------------------------------------------------------
+    @contextmanager
+    def checkout(self, timeout: float | None = None):
+        """Borrow an engine for the duration of the ``with`` block.
+
+        Yields None when the engine is unavailable or none became free within
+        *timeout* seconds.
+        """
+        engine = self._acquire(timeout)
+        try:
+            yield engine
+        finally:
+            if engine is not None:
+                with self._cond:
+                    self._idle.append(engine)
+                    self._cond.notify()
+
+    def _acquire(self, timeout: float | None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self.state == _UNAVAILABLE:
+                    return None
+                if self._reserve_slot():
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    logger.warning("[OCR-POOL] no %s engine free after %.1fs", self.name, timeout)
+                    return None
+                self._cond.wait(remaining)
+        return self._build_engine()
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def is_ready(self) -> bool:
+        """False while a requested preload has not finished."""
+        if self.state == _LOADING:
+            return False
+        return not (self._preload_requested and self.state == _COLD)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "state": self.state,
+                "ready": self.is_ready(),
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "load_seconds": self.load_seconds,
+                "error": self.error,
+            }
+
+    def reinit_after_fork(self) -> None:
+        """Reset locking state in a forked child.
+
+        The child inherits idle engines but not the threads that had the
+        others checked out, nor a preload thread that was still running.
+        """
+        self._cond = threading.Condition()
+        self._created = len(self._idle)
+        if self.state == _LOADING or (self.state == _READY and not self._idle):
+            self.state = _READY if self._idle else _COLD
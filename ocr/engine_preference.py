@@ -0,0 +1,115 @@
+"""Learned OCR engine order per page layout.
+
+A vendor's documents share a letterhead and layout, and for some layouts
+Tesseract reliably produces the accepted text while PaddleOCR does not.
+``EnginePreference`` remembers the recent winning engine per layout
+signature (see :func:`layout_signature`) so such pages are OCR'd with
+Tesseract first and PaddleOCR only runs when Tesseract's text is rejected.
+Because PaddleOCR then rarely gets to win, every ``_EXPLORE_EVERY``-th page
+of a layout with a preference is OCR'd in the default order again, so a
+preference learned from a run of bad scans does not last forever.  The
+history lives in process memory and is bounded by layout count.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict, deque
+
+import numpy as np
+from PIL import Image
+
+_MAX_LAYOUTS = int(os.getenv("OCR_ENGINE_PREFERENCE_MAX_LAYOUTS", "1024"))
+# Outcomes remembered per layout, and how many consecutive wins make an
+# engine the one to try first.
+_HISTORY = 5
+_MIN_STREAK = 3
+# Every this many pages of a layout with a preference ignore it (0: never).
+_EXPLORE_EVERY = int(os.getenv("OCR_ENGINE_PREFERENCE_EXPLORE_EVERY", "10"))
+# Top fraction of the page summarised by the layout signature.
+_HEADER_FRACTION = 0.25
+
+
+def layout_signature(image: Image.Image) -> str:
+    """64-bit average hash of where the ink lies in the page's header band.
+
+    The band (letterhead, logo, address block) is reduced to a 16x4 grid and
+    each cell marked by whether it is darker than the band's mean, so pages
+    from the same template map to the same signature while the line items
+    below do not affect it.
+    """
+    gray = image if image.mode == "L" else image.convert("L")
+    band = gray.crop((0, 0, gray.width, max(int(gray.height * _HEADER_FRACTION), 1)))
+    cells = np.asarray(band.resize((16, 4), Image.Resampling.BOX), dtype=np.float32)
+    bits = (cells < cells.mean()).flatten()
+    return f"{int(np.packbits(bits).view('>u8')[0]):016x}"
+
+
+class EnginePreference:
+    """Recent winning engine per layout signature, least-recently-used layouts dropped first."""
+
+    def __init__(self, max_layouts: int = _MAX_LAYOUTS, explore_every: int = _EXPLORE_EVERY):
+        self.max_layouts = max(1, max_layouts)
+        self.explore_every = max(0, explore_every)
+        self._history: OrderedDict[str, deque] = OrderedDict()
+        self._since_explore: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, layout: str, engine: str) -> None:
+        with self._lock:
+            history = self._history.pop(layout, None) or deque(maxlen=_HISTORY)
+            history.append(engine)
+            self._history[layout] = history
+            while len(self._history) > self.max_layouts:
+                evicted, _ = self._history.popitem(last=False)
+                self._since_explore.pop(evicted, None)
+
+    def preferred_engine(self, layout: str) -> str | None:
+        """The engine that won the last ``_MIN_STREAK`` pages of *layout*, if any.
+
+        Every ``explore_every``-th call that would return a preference returns
+        None instead, so that page is OCR'd in the default order and the other
+        engine gets a chance to win the layout back.
+        """
+        with self._lock:
+            history = self._history.get(layout)
+            if history is None or len(history) < _MIN_STREAK:
+                return None
+            self._history.move_to_end(layout)
+            recent = list(history)[-_MIN_STREAK:]
+            if recent.count(recent[0]) != _MIN_STREAK:
+                self._since_explore.pop(layout, None)
+                return None
+            asked = self._since_explore.get(layout, 0) + 1
+            if self.explore_every and asked >= self.explore_every:
+                self._since_explore.pop(layout, None)
+                return None
+            self._since_explore[layout] = asked
+        return recent[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._history.clear()
+            self._since_explore.clear()
+
+    def reinit_after_fork(self) -> None:
+        """Replace a lock that may have been held by another thread at fork time."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            preferred: dict[str, int] = {}
+            for history in self._history.values():
+                recent = list(history)[-_MIN_STREAK:]
+                if len(recent) == _MIN_STREAK and recent.count(recent[0]) == _MIN_STREAK:
+                    preferred[recent[0]] = preferred.get(recent[0], 0) + 1
+            return {"layouts": len(self._history), "max_layouts": self.max_layouts, "preferred": preferred}
+
+
+_ENGINE_PREFERENCE = EnginePreference()
+os.register_at_fork(after_in_child=_ENGINE_PREFERENCE.reinit_after_fork)
+
+
+def get_engine_preference() -> EnginePreference:
+    return _ENGINE_PREFERENCE
@@ -1,22 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import logging
+import math
+import multiprocessing
 import os
 import re
 import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import copy_context
 from inspect import signature
 from io import BytesIO
 from pathlib import Path
+from typing import Iterator
 from uuid import uuid4
 
 import numpy as np
-import pdfplumber
 import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import pytesseract
 from PIL import Image
 from pytesseract import TesseractError, TesseractNotFoundError
 
+from .cache import get_page_cache, get_result_cache, make_cache_key
 from .detect_pdf_type import detect_pdf_type
+from .diagnostics import Preview, ocr_trace, request_trace_enabled, trace, tracing
+from .document import OpenedPdf, open_pdf
+from .engine_pool import OcrEnginePool
+from .engine_preference import get_engine_preference, layout_signature
+from . import tesseract_backend
+from .tesseract_backend import _initialize_tesseract
 
 logger = logging.getLogger(__name__)
 
@@ -25,49 +39,88 @@ try:
 except ImportError:  # pragma: no cover - depends on runtime package availability
     cv2 = None
 
-PaddleOCR = None  # Lazy imported inside _get_paddle_ocr()
+PaddleOCR = None  # Lazy imported inside _create_paddle_ocr()
 
 _MIN_DIRECT_TEXT_CHARS = 80
-_PADDLE_OCR = None
-_PADDLE_OCR_INIT_FAILED = False
-_PADDLE_OCR_RUNNER = None
+# A directly-extracted page with less text than this is re-routed to OCR.
+_MIN_PAGE_TEXT_CHARS = 20
+# "structured" reads embedded-text pages as the text outside detected tables
+# plus each table's rows; "legacy" appends pdfplumber's tables to the full
+# page text, repeating their content.
+_TABLE_MODE = os.getenv("PDF_TABLE_MODE", "structured").lower()
+_RENDER_DPI = 300
+# Adaptive rendering picks each page's DPI from the text line height measured
+# on a quick low-DPI probe, never above what the preprocessing working image
+# (_WORKING_LONG_EDGE) can use.  Pages whose OCR confidence falls below
+# _RERENDER_CONFIDENCE are rendered and OCR'd again at that maximum.
+_ADAPTIVE_DPI = os.getenv("OCR_ADAPTIVE_DPI", "1") == "1"
+_RERENDER_CONFIDENCE = float(os.getenv("OCR_RERENDER_CONFIDENCE", "0.6"))
+_PROBE_DPI = 100
+_MIN_RENDER_DPI = 150
+_TARGET_LINE_HEIGHT_PX = 32
+# Pages that would render to more pixels than this are rendered as grayscale
+# horizontal strips into a one-byte-per-pixel buffer instead of one RGB(A)
+# bitmap, bounding rendering memory on small instances.
+_RENDER_PIXEL_BUDGET = int(os.getenv("OCR_RENDER_PIXEL_BUDGET", "12000000"))
+# Page metadata sampled from this run's memory use; kept out of the page cache.
+_RSS_METADATA = ("peak_rss_mb", "rss_delta_mb")
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# Pages that are a single upright, full-page image (typical scans) skip
+# rendering: the embedded image is decoded at its native resolution straight
+# to grayscale.
+_DIRECT_IMAGE = os.getenv("OCR_DIRECT_IMAGE", "1") == "1"
+# Fraction of the page edge an image may fall short by and still count as full-page.
+_FULL_PAGE_TOLERANCE = 0.02
+# Bump whenever _preprocess_for_ocr changes output so cached results expire.
+_PREPROCESS_VERSION = "2"
+# Run Tesseract OSD only when a cheap projection-profile check cannot confirm
+# the page is upright.
+_ORIENTATION_PRECHECK = os.getenv("OCR_ORIENTATION_PRECHECK", "1") == "1"
+_PRECHECK_LONG_EDGE = 1200
+# "full" runs every geometry step on the 2400px working image; "proxy" finds
+# the crop boxes and skew angle on a small proxy and applies them to the
+# render in a single affine warp.
+_PREPROCESS_MODE = os.getenv("OCR_PREPROCESS_MODE", "full").lower()
+_WORKING_LONG_EDGE = 2400
+_PROXY_LONG_EDGE = 800
+# Page-parallel OCR is opt-in: 1 = sequential in the request thread, N > 1 =
+# a persistent pool of N worker processes per server process, 0 = one
+# worker per CPU, capped.  Workers are started with "spawn" by default, never
+# forked from a threaded server process mid-request.
+_OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+_OCR_MAX_AUTO_WORKERS = 4
+_OCR_POOL_START_METHOD = os.getenv("OCR_POOL_START_METHOD", "spawn")
+# Number of independent PaddleOCR instances per process.
+_PADDLE_POOL_SIZE = int(os.getenv("PADDLE_POOL_SIZE", "1"))
+# Seconds to wait for a free PaddleOCR instance before falling back to Tesseract.
+_PADDLE_CHECKOUT_TIMEOUT = float(os.getenv("PADDLE_CHECKOUT_TIMEOUT", "120"))
+_PADDLE_INIT_KWARGS: dict | None = None
 _PADDLE_OCR_RUNNER_NAME = "uninitialized"
+_PADDLE_OCR_RUNNER_KWARGS: dict = {}
+_PADDLE_WORD_BOX_SUPPORTED = False
+# Pages per PaddleOCR inference call; 1 disables batching.
+_PADDLE_BATCH_SIZE = max(1, int(os.getenv("PADDLE_BATCH_SIZE", "4")))
+# Preprocessed pages at least _STRIPE_MIN_ASPECT times taller than wide (long
+# single-page invoices) are OCR'd as overlapping, roughly square stripes that
+# PaddleOCR processes as one batch.
+_STRIPE_OCR = os.getenv("OCR_STRIPE_OCR", "1") == "1"
+_STRIPE_MIN_ASPECT = float(os.getenv("OCR_STRIPE_MIN_ASPECT", "2.0"))
+_STRIPE_OVERLAP = 0.15
+# "race" OCRs every page with PaddleOCR and Tesseract concurrently and keeps
+# the first result that passes the quality check; "ordered" tries one engine
+# and falls back to the other.  In ordered mode a page layout on which
+# Tesseract keeps winning is tried with Tesseract first.
+_ENGINE_MODE = os.getenv("OCR_ENGINE_MODE", "ordered").lower()
+_ENGINE_PREFERENCE = os.getenv("OCR_ENGINE_PREFERENCE", "1") == "1"
+# Pages read with less confidence than this are flagged uncertain; a
+# Tesseract-first page this uncertain is also offered to PaddleOCR.
+_UNCERTAIN_CONFIDENCE = 0.6
 _DEBUG_DIR = Path("uploads") / "debug"
 _OCR_DEBUG = os.getenv("OCR_DEBUG", "0") == "1"
 
 # ---------------------------------------------------------------------------
 # Tesseract Setup
 # ---------------------------------------------------------------------------
-_TESSERACT_INITIALIZED = False
-_TESSERACT_LOCK = threading.Lock()
-
-
-def _initialize_tesseract() -> None:
-    """Thread-safe, lazy initialization for pytesseract."""
-    global _TESSERACT_INITIALIZED
-    if _TESSERACT_INITIALIZED:
-        return
-    with _TESSERACT_LOCK:
-        if _TESSERACT_INITIALIZED:
-            return
-        try:
-            import platform
-            if platform.system() == "Windows":
-                _tesseract_cmd = os.getenv("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
-                pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
-            else:
-                _tesseract_cmd = os.getenv("TESSERACT_CMD")
-                if _tesseract_cmd:
-                    pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
-            
-            _tess_version = pytesseract.get_tesseract_version()
-            logger.info("[TESSERACT] initialized successfully")
-            logger.info("[TESSERACT] version=%s, path=%s", _tess_version, pytesseract.pytesseract.tesseract_cmd)
-        except Exception as exc:
-            logger.warning("[TESSERACT] initialization check failed: %s. Pytesseract will run with default binary.", exc)
-        _TESSERACT_INITIALIZED = True
-
-
 def test_tesseract_ocr(image_path: str) -> None:
     _initialize_tesseract()
     try:
@@ -89,114 +142,171 @@ def _clean_text(text: str) -> str:
     return text.strip()
 
 
-def _extract_text_pdfplumber(data: bytes) -> tuple[str, list[dict]]:
+def _table_text(rows: list[list[str]]) -> str:
+    """A table as ``" | "``-joined rows of its non-empty cells."""
+    lines = []
+    for row in rows:
+        cells = [cell for cell in row if cell]
+        if cells:
+            lines.append(" | ".join(cells))
+    return "\n".join(lines)
+
+
+def _extract_text_pdfplumber(doc: OpenedPdf, page_indices: list[int] | None = None) -> tuple[str, list[dict]]:
+    """Extract embedded text and tables, reusing text already read by detection.
+
+    *page_indices* restricts extraction to those zero-based pages (in order);
+    ``None`` extracts every page.
+
+    In ``structured`` table mode each page dict also carries
+    ``text_outside_tables`` and ``tables`` (``{"rows": [[cell, ...], ...]}``
+    with cells kept in column position), and a page's ``text`` holds each
+    table once, at its place in the page.  ``legacy`` mode appends the tables
+    to the full page text, so table content appears twice.
+    """
     parts: list[str] = []
     pages: list[dict] = []
-    with pdfplumber.open(BytesIO(data)) as pdf:
-        for index, page in enumerate(pdf.pages):
-            try:
-                raw_text = page.extract_text() or ""
-                table_rows = page.extract_tables() or []
-            except Exception as exc:
-                logger.warning("pdfplumber page %d failed: %s", index, exc)
-                raw_text = ""
-                table_rows = []
-
-            page_parts: list[str] = []
-            if raw_text.strip():
-                page_parts.append(raw_text.strip())
-
-            for table in table_rows:
-                normalized_rows = []
-                for row in table:
-                    cells = [cell.strip() for cell in row if cell and cell.strip()]
-                    if cells:
-                        normalized_rows.append(" | ".join(cells))
-                if normalized_rows:
-                    page_parts.append("\n".join(normalized_rows))
-
-            page_text = "\n".join(page_parts).strip()
-            pages.append(
-                {
-                    "page_number": index + 1,
-                    "text": page_text,
-                    "confidence": 1.0 if page_text else 0.0,
-                    "engine": "pdfplumber",
-                }
-            )
-            if page_text:
-                parts.append(page_text)
+    structured = _TABLE_MODE == "structured"
+    if page_indices is None:
+        page_indices = list(range(doc.plumber_page_count))
+    for index in page_indices:
+        tables = []
+        if structured:
+            body_parts = []
+            page_parts = []
+            for block in doc.plumber_page_layout(index):
+                if isinstance(block, str):
+                    if block.strip():
+                        body_parts.append(block.strip())
+                        page_parts.append(body_parts[-1])
+                    continue
+                rows = [[" ".join((cell or "").split()) for cell in row] for row in block]
+                rows = [row for row in rows if any(row)]
+                if rows:
+                    tables.append({"rows": rows})
+                    page_parts.append(_table_text(rows))
+            body_text = "\n".join(body_parts)
+        else:
+            body_text = doc.plumber_page_text(index).strip()
+            page_parts = [body_text] if body_text else []
+            for raw_table in doc.plumber_page_tables(index):
+                rows = [[cell.strip() for cell in row if cell and cell.strip()] for row in raw_table]
+                rows = [row for row in rows if row]
+                if rows:
+                    tables.append({"rows": rows})
+                    page_parts.append(_table_text(rows))
+
+        page_text = "\n".join(page_parts).strip()
+        page = {
+            "page_number": index + 1,
+            "text": page_text,
+            "confidence": 1.0 if page_text else 0.0,
+            "engine": "pdfplumber",
+        }
+        if structured:
+            page["text_outside_tables"] = body_text
+            page["tables"] = tables
+        pages.append(page)
+        if page_text:
+            parts.append(page_text)
 
     return _clean_text("\n\n".join(parts)), pages
 
 
-_PADDLE_LOCK = threading.Lock()
+def _paddle_enabled() -> bool:
+    return os.getenv("ENABLE_PADDLEOCR", "1") != "0"
 
 
-def _get_paddle_ocr():
-    global _PADDLE_OCR, _PADDLE_OCR_INIT_FAILED, PaddleOCR
-    if os.getenv("ENABLE_PADDLEOCR", "1") == "0":
+def _create_paddle_ocr():
+    """Build one PaddleOCR instance for the engine pool, or None if unavailable.
+
+    The first instance probes the installed PaddleOCR version for compatible
+    init kwargs; later instances reuse the kwargs that worked.
+    """
+    global _PADDLE_INIT_KWARGS, PaddleOCR
+    if not _paddle_enabled():
         logger.info("[PADDLE] disabled via environment variable")
         return None
-    if _PADDLE_OCR is not None:
-        return _PADDLE_OCR
-    if _PADDLE_OCR_INIT_FAILED:
+
+    if PaddleOCR is None:
+        try:
+            from paddleocr import PaddleOCR as LazyPaddleOCR
+            PaddleOCR = LazyPaddleOCR
+        except ImportError as exc:
+            logger.warning("PaddleOCR import unavailable; falling back to pytesseract OCR. error=%s", exc)
+            PaddleOCR = None
+
+    if PaddleOCR is None:
         return None
-    with _PADDLE_LOCK:
-        # Double-check after acquiring lock
-        if _PADDLE_OCR is not None:
-            return _PADDLE_OCR
-        if _PADDLE_OCR_INIT_FAILED:
-            return None
 
-        if PaddleOCR is None:
-            try:
-                from paddleocr import PaddleOCR as LazyPaddleOCR
-                PaddleOCR = LazyPaddleOCR
-            except ImportError as exc:
-                logger.warning("PaddleOCR import unavailable; falling back to pytesseract OCR. error=%s", exc)
-                PaddleOCR = None
+    if _PADDLE_INIT_KWARGS is not None:
+        return PaddleOCR(**_PADDLE_INIT_KWARGS)
+
+    init_signature = signature(PaddleOCR.__init__)
+    base_kwargs = {"lang": "en"}
+    if "use_doc_orientation_classify" in init_signature.parameters:
+        base_kwargs["use_doc_orientation_classify"] = False
+    if "use_doc_unwarping" in init_signature.parameters:
+        base_kwargs["use_doc_unwarping"] = False
+    # NOTE: return_word_box is intentionally NOT set at init time.
+    # Passing an unsupported kwarg at init permanently breaks the
+    # instance.  Word-level boxes are requested at call time inside
+    # _call_paddle_runner() where failures can be caught and retried safely.
+    logger.info("[OCR-INIT] Initializing PaddleOCR (word-level boxes will be requested at call time)")
+
+    init_attempts = []
+    if "use_textline_orientation" in init_signature.parameters:
+        init_attempts.append(("textline_orientation", {**base_kwargs, "use_textline_orientation": True}))
+        init_attempts.append(("plain_predict", {**base_kwargs, "use_textline_orientation": False}))
+    elif "use_angle_cls" in init_signature.parameters:
+        init_attempts.append(("angle_cls", {**base_kwargs, "use_angle_cls": True}))
+        init_attempts.append(("plain_predict", {**base_kwargs, "use_angle_cls": False}))
+    else:
+        init_attempts.append(("plain_predict", base_kwargs))
 
-        if PaddleOCR is None:
-            return None
-        init_signature = signature(PaddleOCR.__init__)
-        base_kwargs = {"lang": "en"}
-        if "use_doc_orientation_classify" in init_signature.parameters:
-            base_kwargs["use_doc_orientation_classify"] = False
-        if "use_doc_unwarping" in init_signature.parameters:
-            base_kwargs["use_doc_unwarping"] = False
-        # NOTE: return_word_box is intentionally NOT set at init time.
-        # Passing an unsupported kwarg at init permanently breaks the singleton
-        # instance.  Word-level boxes are requested at call time inside
-        # _run_paddle_ocr() where failures can be caught and retried safely.
-        logger.info("[OCR-INIT] Initializing PaddleOCR (word-level boxes will be requested at call time)")
-
-        init_attempts = []
-        if "use_textline_orientation" in init_signature.parameters:
-            init_attempts.append(("textline_orientation", {**base_kwargs, "use_textline_orientation": True}))
-            init_attempts.append(("plain_predict", {**base_kwargs, "use_textline_orientation": False}))
-        elif "use_angle_cls" in init_signature.parameters:
-            init_attempts.append(("angle_cls", {**base_kwargs, "use_angle_cls": True}))
-            init_attempts.append(("plain_predict", {**base_kwargs, "use_angle_cls": False}))
-        else:
-            init_attempts.append(("plain_predict", base_kwargs))
+    last_exc = None
+    for mode_name, init_kwargs in init_attempts:
+        try:
+            ocr = PaddleOCR(**init_kwargs)
+        except Exception as exc:
+            last_exc = exc
+            logger.warning("PaddleOCR initialization attempt failed for mode=%s: %s", mode_name, exc)
+            continue
+        logger.info("PaddleOCR initialized with mode=%s kwargs=%s", mode_name, list(init_kwargs.keys()))
+        _PADDLE_INIT_KWARGS = init_kwargs
+        return ocr
+
+    logger.error("PaddleOCR initialization failed after compatibility fallbacks: %s", last_exc)
+    return None
+
+
+_PADDLE_POOL = OcrEnginePool(_create_paddle_ocr, size=_PADDLE_POOL_SIZE, name="paddleocr")
+os.register_at_fork(after_in_child=_PADDLE_POOL.reinit_after_fork)
 
-        last_exc = None
-        for mode_name, init_kwargs in init_attempts:
-            try:
-                _PADDLE_OCR = PaddleOCR(**init_kwargs)
-                logger.info("PaddleOCR initialized with mode=%s kwargs=%s", mode_name, list(init_kwargs.keys()))
-                break
-            except Exception as exc:
-                last_exc = exc
-                logger.warning("PaddleOCR initialization attempt failed for mode=%s: %s", mode_name, exc)
-
-        if _PADDLE_OCR is None:
-            _PADDLE_OCR_INIT_FAILED = True
-            logger.error("PaddleOCR initialization failed after compatibility fallbacks: %s", last_exc)
-            logger.warning("PaddleOCR initialization failed: %s", last_exc)
-            return None
-    return _PADDLE_OCR
+
+def preload_ocr_engines(background: bool = False) -> bool:
+    """Warm the OCR engine pools so the first request does not pay model loading.
+
+    Call at app startup or from a gunicorn ``post_fork`` hook.  With
+    *background* the pools load on daemon threads and readiness is reported
+    by :func:`get_ocr_readiness` meanwhile.
+    """
+    pools = [tesseract_backend.get_engine_pool()]
+    if _paddle_enabled():
+        pools.append(_PADDLE_POOL)
+    if background:
+        for pool in pools:
+            pool.preload_in_background()
+        return False
+    return all([pool.preload() or pool.state == "unavailable" for pool in pools])
+
+
+def get_ocr_readiness() -> dict:
+    engines = {
+        "paddleocr": _PADDLE_POOL.status(),
+        "tesseract": {**tesseract_backend.get_engine_pool().status(), "backend": tesseract_backend.backend_name()},
+    }
+    return {"ready": all(status["ready"] for status in engines.values()), "engines": engines}
 
 
 def _resolve_paddle_runner(ocr) -> tuple[object | None, str]:
@@ -269,6 +379,7 @@ def _append_from_structured_dict(normalized: list[dict], item) -> bool:
     # ------------------------------------------------------------------
     word_result = item.get("word_result")
     if isinstance(word_result, (list, tuple)) and word_result:
+        detail = tracing(logger)
         parsed_any = False
         for widx, wentry in enumerate(word_result):
             if not hasattr(wentry, "get"):
@@ -278,10 +389,12 @@ def _append_from_structured_dict(normalized: list[dict], item) -> bool:
             word_score = _safe_float(wentry.get("word_score") or wentry.get("score"), 0.0)
             if _append_normalized_entry(normalized, word_text, word_score, word_box):
                 parsed_any = True
-                logger.debug(
-                    "[OCR-WORD] word[%d] text=%r score=%.4f box=%s",
-                    widx, word_text, word_score, word_box,
-                )
+                if detail:
+                    trace(
+                        logger,
+                        "[OCR-WORD] word[%d] text=%r score=%.4f box=%s",
+                        widx, word_text, word_score, word_box,
+                    )
         if parsed_any:
             return True
 
@@ -479,7 +592,8 @@ def _normalize_paddle_result(result) -> list[dict]:
         selected_mode = "empty"
         chosen = []
 
-    logger.info(
+    trace(
+        logger,
         "[OCR-NORM] word_level_entries_count=%d line_level_entries_count=%d "
         "selected_reconstruction_mode=%s",
         word_level_count,
@@ -496,11 +610,6 @@ def _normalize_paddle_result(result) -> list[dict]:
     return chosen
 
 
-def _preview_value(value, limit: int = 300) -> str:
-    preview = repr(value)
-    return preview[:limit]
-
-
 def _ensure_debug_dir() -> Path:
     _DEBUG_DIR.mkdir(parents=True, exist_ok=True)
     return _DEBUG_DIR
@@ -533,9 +642,15 @@ def _resize_long_edge(image: np.ndarray, max_long_edge: int = 2400) -> np.ndarra
     return cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
 
 
-def _crop_main_document_region(image: np.ndarray) -> np.ndarray:
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    """BGR working images become grayscale; grayscale renders pass through."""
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+
+def _main_document_box(image: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Padded (x0, y0, x1, y1) of the largest paper-like contour, if any."""
     height, width = image.shape[:2]
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    gray = _to_gray(image)
     blurred = cv2.GaussianBlur(gray, (5, 5), 0)
     edges = cv2.Canny(blurred, 50, 150)
     kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 9))
@@ -556,7 +671,7 @@ def _crop_main_document_region(image: np.ndarray) -> np.ndarray:
         best_area = area
 
     if best_rect is None:
-        return image
+        return None
 
     x, y, w, h = best_rect
     pad_x = max(int(w * 0.02), 10)
@@ -565,11 +680,20 @@ def _crop_main_document_region(image: np.ndarray) -> np.ndarray:
     y0 = max(y - pad_y, 0)
     x1 = min(x + w + pad_x, width)
     y1 = min(y + h + pad_y, height)
+    return x0, y0, x1, y1
+
+
+def _crop_main_document_region(image: np.ndarray) -> np.ndarray:
+    box = _main_document_box(image)
+    if box is None:
+        return image
+    x0, y0, x1, y1 = box
     return image[y0:y1, x0:x1]
 
 
-def _crop_text_region(image: np.ndarray) -> np.ndarray:
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def _text_region_box(image: np.ndarray) -> tuple[int, int, int, int] | None:
+    """Padded (x0, y0, x1, y1) around the inked text area, if it is large enough."""
+    gray = _to_gray(image)
     inverted = cv2.bitwise_not(gray)
     thresholded = cv2.threshold(inverted, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
     kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (25, 5))
@@ -577,11 +701,11 @@ def _crop_text_region(image: np.ndarray) -> np.ndarray:
 
     coords = cv2.findNonZero(merged)
     if coords is None:
-        return image
+        return None
 
     x, y, w, h = cv2.boundingRect(coords)
     if w * h < image.shape[0] * image.shape[1] * 0.05:
-        return image
+        return None
 
     pad_x = max(int(w * 0.02), 8)
     pad_y = max(int(h * 0.03), 8)
@@ -589,16 +713,25 @@ def _crop_text_region(image: np.ndarray) -> np.ndarray:
     y0 = max(y - pad_y, 0)
     x1 = min(x + w + pad_x, image.shape[1])
     y1 = min(y + h + pad_y, image.shape[0])
+    return x0, y0, x1, y1
+
+
+def _crop_text_region(image: np.ndarray) -> np.ndarray:
+    box = _text_region_box(image)
+    if box is None:
+        return image
+    x0, y0, x1, y1 = box
     return image[y0:y1, x0:x1]
 
 
-def _deskew_image(image: np.ndarray) -> np.ndarray:
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+def _skew_angle(image: np.ndarray) -> float:
+    """Rotation (degrees) that levels the text, or 0.0 when already level."""
+    gray = _to_gray(image)
     inverted = cv2.bitwise_not(gray)
     thresholded = cv2.threshold(inverted, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)[1]
     coords = cv2.findNonZero(thresholded)
     if coords is None or len(coords) < 10:
-        return image
+        return 0.0
 
     angle = cv2.minAreaRect(coords)[-1]
     if angle < -45:
@@ -607,6 +740,13 @@ def _deskew_image(image: np.ndarray) -> np.ndarray:
         angle = angle - 90
 
     if abs(angle) < 0.3:
+        return 0.0
+    return angle
+
+
+def _deskew_image(image: np.ndarray) -> np.ndarray:
+    angle = _skew_angle(image)
+    if not angle:
         return image
 
     height, width = image.shape[:2]
@@ -621,33 +761,106 @@ def _deskew_image(image: np.ndarray) -> np.ndarray:
     )
 
 
-def _correct_orientation(image: np.ndarray, page_number: int, batch_id: str) -> np.ndarray:
-    _initialize_tesseract()
+def _gap_fraction(profile: np.ndarray) -> float:
+    """Share of near-empty bins between the first and last inked bin."""
+    inked = np.flatnonzero(profile > 0)
+    if inked.size == 0:
+        return 0.0
+    span = profile[inked[0] : inked[-1] + 1]
+    return float((span <= span.max() * 0.02).mean())
+
+
+def _looks_upright(image: np.ndarray) -> bool:
+    """Cheap orientation pre-check on a downscaled thumbnail.
+
+    Horizontal text lines leave blank gaps between rows of ink, so the row
+    projection profile of an upright (or upside-down) page has many empty
+    bins while the column profile has few; pages turned by 90/270 degrees
+    show the opposite.  Within each line, capitals, digits, and ascenders put
+    more ink above the x-height band than descenders put below it, which
+    separates upright from upside-down.  Returns False whenever the evidence
+    is not clear, so the caller falls back to a full OSD pass.
+    """
+    thumb = _resize_long_edge(_to_gray(image), _PRECHECK_LONG_EDGE)
+    ink = cv2.threshold(thumb, 0, 1, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)[1]
+    if not 0.002 <= ink.mean() <= 0.5:
+        return False
+
+    rows = ink.sum(axis=1, dtype=np.float64)
+    cols = ink.sum(axis=0, dtype=np.float64)
+    row_gaps, col_gaps = _gap_fraction(rows), _gap_fraction(cols)
+    if row_gaps < 0.2 or row_gaps < col_gaps * 1.5:
+        return False
+
+    in_line = (rows > rows.max() * 0.02).astype(np.int8)
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], in_line, [0]))))
+    above = below = 0.0
+    line_count = 0
+    for start, end in zip(edges[::2], edges[1::2]):
+        line = rows[start:end]
+        if line.size < 4:
+            continue
+        core = np.flatnonzero(line >= line.max() * 0.5)
+        above += line[: core[0]].sum()
+        below += line[core[-1] + 1 :].sum()
+        line_count += 1
+    return bool(line_count >= 3 and above >= 1.25 * below)
+
+
+def _correct_orientation(
+    image: np.ndarray,
+    page_number: int,
+    batch_id: str,
+    page_meta: dict | None = None,
+) -> np.ndarray:
+    if page_meta is None:
+        page_meta = {}
+    page_meta.setdefault("osd_skipped", 0)
+    page_meta.setdefault("osd_executed", 0)
+    if _ORIENTATION_PRECHECK:
+        try:
+            upright = _looks_upright(image)
+        except Exception as exc:
+            logger.debug("[ORIENTATION] Page %d pre-check failed: %s", page_number, exc)
+            upright = False
+        if upright:
+            page_meta["osd_skipped"] += 1
+            logger.debug("[ORIENTATION] Page %d upright by projection pre-check; OSD skipped", page_number)
+            return image
+
+    page_meta["osd_executed"] += 1
     try:
-        # Convert to PIL Image for pytesseract
-        pil_img = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        osd = pytesseract.image_to_osd(pil_img)
-        logger.info("[ORIENTATION] Page %d OSD: %s", page_number, osd.replace("\n", " | "))
-        
-        # Search for Rotate: <angle>
-        match = re.search(r"Rotate:\s*(\d+)", osd)
-        if match:
-            angle = int(match.group(1))
+        pil_img = Image.fromarray(image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        osd = tesseract_backend.detect_orientation(pil_img)
+        trace(logger, "[ORIENTATION] Page %d OSD: %s", page_number, osd)
+
+        if osd:
+            angle = osd["rotate"]
             if angle == 90:
-                logger.info("[ORIENTATION] Page %d rotating 90 deg clockwise", page_number)
+                trace(logger, "[ORIENTATION] Page %d rotating 90 deg clockwise", page_number)
                 return cv2.rotate(image, cv2.ROTATE_90_CLOCKWISE)
             elif angle == 180:
-                logger.info("[ORIENTATION] Page %d rotating 180 deg", page_number)
+                trace(logger, "[ORIENTATION] Page %d rotating 180 deg", page_number)
                 return cv2.rotate(image, cv2.ROTATE_180)
             elif angle == 270:
-                logger.info("[ORIENTATION] Page %d rotating 270 deg clockwise", page_number)
+                trace(logger, "[ORIENTATION] Page %d rotating 270 deg clockwise", page_number)
                 return cv2.rotate(image, cv2.ROTATE_90_COUNTERCLOCKWISE)
     except Exception as exc:
         logger.debug("[ORIENTATION] Page %d orientation check failed/skipped: %s", page_number, exc)
     return image
 
 
-def _preprocess_for_ocr(image: Image.Image, page_number: int, batch_id: str) -> Image.Image:
+def _preprocess_for_ocr(
+    image: Image.Image,
+    page_number: int,
+    batch_id: str,
+    page_meta: dict | None = None,
+) -> Image.Image:
+    """Return the binarised, enlarged page image fed to the OCR engines.
+
+    Per-page preprocessing facts (e.g. OSD skipped/executed counts) are
+    recorded in *page_meta* when given.
+    """
     _save_debug_image(image, batch_id, page_number, "original")
 
     if cv2 is None:
@@ -661,31 +874,90 @@ def _preprocess_for_ocr(image: Image.Image, page_number: int, batch_id: str) ->
         _save_debug_image(resized, batch_id, page_number, "final_preprocessed")
         return resized
 
-    cv_image = cv2.cvtColor(np.array(image.convert("RGB")), cv2.COLOR_RGB2BGR)
-    cv_image = _correct_orientation(cv_image, page_number, batch_id)
-    cv_image = _resize_long_edge(cv_image)
-    cv_image = _crop_main_document_region(cv_image)
-    cv_image = _crop_text_region(cv_image)
-    cv_image = _deskew_image(cv_image)
-    _save_debug_image(cv_image, batch_id, page_number, "cropped")
+    if image.mode == "L":
+        # Strip-rendered pages arrive as grayscale and stay single-channel.
+        cv_image = np.array(image)
+    else:
+        cv_image = np.array(image if image.mode == "RGB" else image.convert("RGB"))
+        cv2.cvtColor(cv_image, cv2.COLOR_RGB2BGR, dst=cv_image)
+    cv_image = _correct_orientation(cv_image, page_number, batch_id, page_meta)
+    if _PREPROCESS_MODE == "proxy":
+        gray = _crop_and_deskew_via_proxy(cv_image)
+    else:
+        cv_image = _resize_long_edge(cv_image, _WORKING_LONG_EDGE)
+        cv_image = _crop_main_document_region(cv_image)
+        cv_image = _crop_text_region(cv_image)
+        cv_image = _deskew_image(cv_image)
+        gray = _to_gray(cv_image)
+    del cv_image
+    _save_debug_image(gray, batch_id, page_number, "cropped")
+    return _binarize_for_ocr(gray, page_number, batch_id)
+
+
+def _crop_and_deskew_via_proxy(image: np.ndarray) -> np.ndarray:
+    """Proxy-mode geometry: crop, deskew, and downscale in one warp.
+
+    The document box, text box, and skew angle are measured on a
+    ``_PROXY_LONG_EDGE`` copy, mapped back to render coordinates, and folded
+    into a single affine transform that produces the same grayscale working
+    image the full pipeline builds at ``_WORKING_LONG_EDGE``.
+    """
+    height, width = image.shape[:2]
+    long_edge = max(height, width)
+    work_scale = min(1.0, _WORKING_LONG_EDGE / float(long_edge))
+    proxy_scale = min(1.0, _PROXY_LONG_EDGE / float(long_edge))
+    proxy = _resize_long_edge(image, _PROXY_LONG_EDGE)
+
+    x0, y0, x1, y1 = _main_document_box(proxy) or (0, 0, proxy.shape[1], proxy.shape[0])
+    text_box = _text_region_box(proxy[y0:y1, x0:x1])
+    if text_box is not None:
+        tx0, ty0, tx1, ty1 = text_box
+        x0, y0, x1, y1 = x0 + tx0, y0 + ty0, x0 + tx1, y0 + ty1
+    angle = _skew_angle(proxy[y0:y1, x0:x1])
+
+    # Crop box in render pixels, then the working-image size it maps to.
+    to_render = 1.0 / proxy_scale
+    origin_x, origin_y = x0 * to_render, y0 * to_render
+    out_w = max(int(round((x1 - x0) * to_render * work_scale)), 1)
+    out_h = max(int(round((y1 - y0) * to_render * work_scale)), 1)
+
+    crop_and_scale = np.array(
+        [[work_scale, 0.0, -origin_x * work_scale], [0.0, work_scale, -origin_y * work_scale], [0.0, 0.0, 1.0]]
+    )
+    rotate = np.vstack([cv2.getRotationMatrix2D((out_w / 2.0, out_h / 2.0), angle, 1.0), [0.0, 0.0, 1.0]])
+    matrix = (rotate @ crop_and_scale)[:2]
+
+    gray = _to_gray(image)
+    if not angle:
+        # Axis-aligned: a crop plus INTER_AREA resize matches the full pipeline.
+        crop = gray[int(origin_y) : int(round(y1 * to_render)), int(origin_x) : int(round(x1 * to_render))]
+        return cv2.resize(crop, (out_w, out_h), interpolation=cv2.INTER_AREA)
+    return cv2.warpAffine(gray, matrix, (out_w, out_h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
 
-    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+def _binarize_for_ocr(gray: np.ndarray, page_number: int, batch_id: str) -> Image.Image:
+    """Contrast-equalise, threshold, denoise, sharpen, and enlarge the text region."""
+    # Threshold and sharpen write into their input buffers, and each
+    # intermediate is released before the 2.5x enlargement allocates.
     clahe = cv2.createCLAHE(clipLimit=2.5, tileGridSize=(8, 8))
-    enhanced = clahe.apply(gray)
-    thresholded = cv2.adaptiveThreshold(
-        enhanced,
+    thresholded = clahe.apply(gray)
+    cv2.adaptiveThreshold(
+        thresholded,
         255,
         cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
         cv2.THRESH_BINARY,
         31,
         15,
+        dst=thresholded,
     )
     _save_debug_image(thresholded, batch_id, page_number, "thresholded")
 
-    denoised = cv2.fastNlMeansDenoising(thresholded, None, 15, 7, 21)
+    sharpened = cv2.fastNlMeansDenoising(thresholded, None, 15, 7, 21)
+    del thresholded
     sharpen_kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
-    sharpened = cv2.filter2D(denoised, -1, sharpen_kernel)
+    cv2.filter2D(sharpened, -1, sharpen_kernel, dst=sharpened)
     final_image = cv2.resize(sharpened, None, fx=2.5, fy=2.5, interpolation=cv2.INTER_CUBIC)
+    del sharpened
     _save_debug_image(final_image, batch_id, page_number, "final_preprocessed")
     return Image.fromarray(final_image)
 
@@ -729,185 +1001,139 @@ def _split_ocr_token(token: str) -> list[str]:
     return parts if parts else [token]
 
 
-def _compute_adaptive_y_threshold(positioned_rows: list[tuple[float, float, float, float, str, float]]) -> float:
+def _compute_adaptive_y_threshold(box_heights: np.ndarray) -> float:
     """Estimate a per-document Y-grouping threshold from the distribution of
     box heights so that it adapts to fonts and scan resolutions.
 
-    Each entry in *positioned_rows* is
-    ``(y_center, x_left, box_height, x_right, text, confidence)``.
-
     The threshold is set to ``0.6 × median_box_height`` clamped between 8 px
     and 40 px.  For typical invoice scans at 300 DPI this yields roughly the
     correct line-gap tolerance without being too loose (which would merge
     adjacent rows).
     """
-    heights = sorted(entry[2] for entry in positioned_rows if entry[2] > 0)
-    if not heights:
+    heights = box_heights[box_heights > 0]
+    if not heights.size:
         return 15.0
-    median_h = heights[len(heights) // 2]
+    median_h = float(np.partition(heights, heights.size // 2)[heights.size // 2])
     return max(8.0, min(40.0, median_h * 0.6))
 
 
+def _box_geometry(boxes: list) -> np.ndarray:
+    """``(y_center, x_left, box_height, x_right)`` per box as an ``(n, 4)`` array."""
+    try:
+        points = np.asarray(boxes, dtype=np.float64)
+    except ValueError:
+        points = None
+    if points is None or points.ndim != 3 or points.shape[2] < 2:
+        # Boxes with differing point counts: measure them one by one.
+        geometry = np.empty((len(boxes), 4), dtype=np.float64)
+        for index, box in enumerate(boxes):
+            xs = [point[0] for point in box]
+            ys = [point[1] for point in box]
+            geometry[index] = (sum(ys) / len(ys), min(xs), max(ys) - min(ys), max(xs))
+        return geometry
+    xs, ys = points[:, :, 0], points[:, :, 1]
+    return np.column_stack((ys.sum(axis=1) / ys.shape[1], xs.min(axis=1), ys.max(axis=1) - ys.min(axis=1), xs.max(axis=1)))
+
+
 def _group_paddle_lines(result: list[dict]) -> tuple[list[str], list[float], float]:
     """Reconstruct spatial OCR lines from PaddleOCR bounding-box entries.
 
     Algorithm
     ---------
-    1. Collect each OCR entry with its bounding box; compute y-center,
-       x-left, box-height, and x-right so we can sort and gap-detect.
+    1. Collect each OCR entry's text and bounding box; the box geometry
+       (y-center, x-left, box-height, x-right) is held in one numpy array.
     2. Compute an *adaptive* Y-threshold from the median box height so the
        grouping tolerates different font sizes and scan resolutions.
-    3. Sort entries by (y_bucket, x_left) and cluster into logical rows using
-       the adaptive threshold.
-    4. Within each row, sort by x_left and reconstruct the text by inserting
-       whitespace proportional to the pixel gap between adjacent boxes.
+    3. Sort boxes by (y_bucket, x_left) and start a new logical row wherever
+       consecutive y-centers differ by more than the threshold.
+    4. Within each row, order boxes by x_left and join their text with
+       single spaces.
     5. Apply OCR-safe token splitting at alpha/digit boundaries to every
        individual OCR token *before* joining.
-    6. Emit detailed diagnostics at DEBUG level for every box and every
-       reconstructed row so the corruption site can be pinpointed.
+    6. Emit per-box and per-row diagnostics only while tracing (see
+       :mod:`ocr.diagnostics`).
     """
     # ------------------------------------------------------------------
-    # Phase 1 – collect entries with full spatial info
+    # Phase 1 – collect entries with their boxes
     # ------------------------------------------------------------------
-    # Each tuple: (y_center, x_left, box_height, x_right, text, confidence)
-    positioned_rows: list[tuple[float, float, float, float, str, float]] = []
+    detail = tracing(logger)
+    texts: list[str] = []
+    boxes: list = []
     fallback_lines: list[str] = []
     confidences: list[float] = []
 
-    logger.debug("[OCR-RECON] === Starting OCR spatial reconstruction ===")
-    logger.debug("[OCR-RECON] Total normalized entries: %d", len(result or []))
+    if detail:
+        trace(logger, "[OCR-RECON] === Starting OCR spatial reconstruction ===")
+        trace(logger, "[OCR-RECON] Total normalized entries: %d", len(result or []))
 
     for idx, entry in enumerate(result or []):
         raw_text = entry.get("text", "")
         text = _clean_text(raw_text)
         confidence = _safe_float(entry.get("confidence"), 0.0)
         box = entry.get("box")
-
-        logger.debug(
-            "[OCR-RECON] Box[%d] raw_text=%r confidence=%.4f box=%s",
-            idx,
-            raw_text,
-            confidence,
-            box,
-        )
+        if detail:
+            trace(logger, "[OCR-RECON] Box[%d] raw_text=%r confidence=%.4f box=%s", idx, raw_text, confidence, box)
 
         if not text:
-            logger.debug("[OCR-RECON] Box[%d] skipped (empty text after clean)", idx)
             continue
-
         confidences.append(confidence)
-
         if box:
-            xs = [point[0] for point in box]
-            ys = [point[1] for point in box]
-            x_left = min(xs)
-            x_right = max(xs)
-            y_center = sum(ys) / len(ys)
-            box_height = max(ys) - min(ys)
-            logger.debug(
-                "[OCR-RECON] Box[%d] y_center=%.1f x_left=%.1f x_right=%.1f "
-                "box_height=%.1f text=%r conf=%.4f",
-                idx,
-                y_center,
-                x_left,
-                x_right,
-                box_height,
-                text,
-                confidence,
-            )
-            positioned_rows.append((y_center, x_left, box_height, x_right, text, confidence))
+            texts.append(text)
+            boxes.append(box)
         else:
-            logger.debug(
-                "[OCR-RECON] Box[%d] has no bounding box; treating as fallback line: %r",
-                idx,
-                text,
-            )
+            if detail:
+                trace(logger, "[OCR-RECON] Box[%d] has no bounding box; treating as fallback line: %r", idx, text)
             fallback_lines.append(text)
 
+    geometry = _box_geometry(boxes) if boxes else np.empty((0, 4), dtype=np.float64)
+    y_center, x_left, box_height = geometry[:, 0], geometry[:, 1], geometry[:, 2]
+
     # ------------------------------------------------------------------
     # Phase 2 – adaptive Y-threshold
     # ------------------------------------------------------------------
-    y_threshold = _compute_adaptive_y_threshold(positioned_rows)
-    logger.debug(
-        "[OCR-RECON] Adaptive Y-threshold=%.1f px (from %d positioned boxes)",
-        y_threshold,
-        len(positioned_rows),
-    )
+    y_threshold = _compute_adaptive_y_threshold(box_height)
+    if detail:
+        trace(
+            logger,
+            "[OCR-RECON] Adaptive Y-threshold=%.1f px (from %d positioned boxes)",
+            y_threshold,
+            len(texts),
+        )
 
     # ------------------------------------------------------------------
     # Phase 3 – sort and cluster into logical rows
     # ------------------------------------------------------------------
     lines: list[str] = []
-    if positioned_rows:
-        # Coarse bucket by y (rounded to threshold granularity) then fine x
-        positioned_rows.sort(key=lambda e: (round(e[0] / y_threshold), e[1]))
-
-        grouped: list[list[tuple[float, float, float, float, str, float]]] = []
-        for row in positioned_rows:
-            y_center = row[0]
-            if not grouped or abs(grouped[-1][-1][0] - y_center) > y_threshold:
-                grouped.append([row])
-            else:
-                grouped[-1].append(row)
+    if texts:
+        # Coarse bucket by y (rounded to threshold granularity) then fine x;
+        # lexsort is stable, so ties keep their input order.
+        order = np.lexsort((x_left, np.round(y_center / y_threshold)))
+        row_ids = np.concatenate(([0], np.cumsum(np.abs(np.diff(y_center[order])) > y_threshold)))
+        order = order[np.lexsort((x_left[order], row_ids))]
+        groups = np.split(order, np.flatnonzero(np.diff(row_ids)) + 1)
 
-        logger.debug("[OCR-RECON] Logical row groups: %d", len(grouped))
+        if detail:
+            trace(logger, "[OCR-RECON] Logical row groups: %d", len(groups))
 
         # ------------------------------------------------------------------
-        # Phase 4 – per-row reconstruction with gap-aware whitespace
+        # Phase 4 – per-row reconstruction
         # ------------------------------------------------------------------
-        for row_idx, group in enumerate(grouped):
-            # Sort within the row by x_left
-            group.sort(key=lambda e: e[1])
-
-            tokens_in_row: list[str] = []
-            for token_idx, entry in enumerate(group):
-                y_center, x_left, box_height, x_right, text, confidence = entry
-
-                # Phase 5 – OCR-safe token splitting at alpha/digit boundaries
-                raw_sub_tokens = _split_ocr_token(text)
-                tokens_in_row.append((x_left, x_right, raw_sub_tokens))
-
-            # Build the reconstructed line text with heuristic spacing
-            # Rule: if the pixel gap between adjacent boxes exceeds 0.5× the
-            # average char width (estimated as box_width / len(text)),
-            # insert a space.  We always insert at least one space between
-            # tokens to preserve word boundaries.
-            reconstructed_parts: list[str] = []
-            for token_idx, (x_left, x_right, sub_tokens) in enumerate(tokens_in_row):
-                token_str = " ".join(sub_tokens)
-                if token_idx == 0:
-                    reconstructed_parts.append(token_str)
-                else:
-                    # Gap between previous box's right edge and this box's left
-                    prev_x_right = tokens_in_row[token_idx - 1][1]
-                    gap_px = x_left - prev_x_right
-                    # Estimate average char width from current token
-                    box_width = x_right - x_left
-                    text_len = max(len(sub_tokens[-1]), 1) if sub_tokens else 1
-                    avg_char_w = box_width / text_len if box_width > 0 else 10.0
-                    # Always at least one space; extra space for large gaps
-                    if gap_px > avg_char_w * 1.5:
-                        reconstructed_parts.append("  ")  # double-space → visible gap
-                    else:
-                        reconstructed_parts.append(" ")
-                    reconstructed_parts.append(token_str)
-
-            line_text = "".join(reconstructed_parts).strip()
-            # Collapse multiple spaces to single space
-            line_text = re.sub(r"  +", " ", line_text)
-
-            logger.debug(
-                "[OCR-RECON] Row[%d] boxes=%d reconstructed=%r",
-                row_idx,
-                len(group),
-                line_text,
-            )
-            logger.info(
-                "[OCR-ROW] row_index=%d token_count=%d reconstructed_text=%r",
-                row_idx,
-                len(tokens_in_row),
-                line_text,
-            )
+        # Wide gaps between boxes used to get a double space, but runs of
+        # spaces are collapsed below, so every separator is a single space.
+        for row_idx, group in enumerate(groups):
+            # Phase 5 – OCR-safe token splitting at alpha/digit boundaries
+            tokens_in_row = [" ".join(_split_ocr_token(texts[index])) for index in group]
+            line_text = re.sub(r"  +", " ", " ".join(tokens_in_row).strip())
+
+            if detail:
+                trace(
+                    logger,
+                    "[OCR-ROW] row_index=%d boxes=%d token_count=%d reconstructed_text=%r",
+                    row_idx,
+                    len(group),
+                    len(tokens_in_row),
+                    line_text,
+                )
 
             if line_text:
                 lines.append(line_text)
@@ -915,13 +1141,14 @@ def _group_paddle_lines(result: list[dict]) -> tuple[list[str], list[float], flo
     lines.extend(fallback_lines)
     average_confidence = sum(confidences) / len(confidences) if confidences else 0.0
 
-    logger.info(
-        "[OCR-RECON] Reconstruction complete: %d rows produced (%d fallback), avg_conf=%.4f",
-        len(lines),
-        len(fallback_lines),
-        average_confidence,
-    )
-    logger.info("[OCR-RECON] All reconstructed rows BEFORE parser: %s", lines)
+    if detail:
+        trace(
+            logger,
+            "[OCR-RECON] Reconstruction complete: %d rows produced (%d fallback), avg_conf=%.4f",
+            len(lines),
+            len(fallback_lines),
+            average_confidence,
+        )
 
     return lines, confidences, round(average_confidence, 4)
 
@@ -937,8 +1164,28 @@ def _describe_paddle_first_item(result):
     return result
 
 
-def _run_paddle_ocr(image: Image.Image):
-    """Run PaddleOCR on *image*, attempting word-level boxes first.
+def _paddle_runner_for(ocr):
+    """Return the inference method of *ocr*; its call kwargs are inspected once per process."""
+    global _PADDLE_OCR_RUNNER_NAME, _PADDLE_OCR_RUNNER_KWARGS, _PADDLE_WORD_BOX_SUPPORTED
+    runner, runner_name = _resolve_paddle_runner(ocr)
+    if runner is None:
+        logger.warning("No compatible PaddleOCR inference method found on OCR instance.")
+        return None
+    if runner_name != _PADDLE_OCR_RUNNER_NAME:
+        parameters = signature(runner).parameters
+        _PADDLE_OCR_RUNNER_KWARGS = {"use_textline_orientation": True} if "use_textline_orientation" in parameters else {}
+        _PADDLE_WORD_BOX_SUPPORTED = "return_word_box" in parameters
+        _PADDLE_OCR_RUNNER_NAME = runner_name
+        logger.info(
+            "PaddleOCR method selected: %s (return_word_box=%s)",
+            _PADDLE_OCR_RUNNER_NAME,
+            _PADDLE_WORD_BOX_SUPPORTED,
+        )
+    return runner
+
+
+def _call_paddle_runner(runner, paddle_input):
+    """Call the PaddleOCR runner, attempting word-level boxes first.
 
     Strategy
     --------
@@ -950,42 +1197,11 @@ def _run_paddle_ocr(image: Image.Image):
        preserves full compatibility with older PaddleOCR versions.
     3. Always log which mode was actually used so failures are visible.
     """
-    global _PADDLE_OCR_RUNNER, _PADDLE_OCR_RUNNER_NAME
-    ocr = _get_paddle_ocr()
-    if ocr is None:
-        return None, "unavailable"
-
-    if _PADDLE_OCR_RUNNER is None:
-        _PADDLE_OCR_RUNNER, _PADDLE_OCR_RUNNER_NAME = _resolve_paddle_runner(ocr)
-        logger.info("PaddleOCR method selected: %s", _PADDLE_OCR_RUNNER_NAME)
-
-    if _PADDLE_OCR_RUNNER is None:
-        logger.warning("No compatible PaddleOCR inference method found on OCR instance.")
-        return None, "unavailable"
-
-    runner_signature = signature(_PADDLE_OCR_RUNNER)
-    base_kwargs: dict = {}
-    if "use_textline_orientation" in runner_signature.parameters:
-        base_kwargs["use_textline_orientation"] = True
-
-    logger.info("PaddleOCR input image type before conversion: %s", type(image).__name__)
-    image = image.convert("RGB")
-    paddle_image = np.array(image)
-    print("[PADDLE_INPUT]", flush=True)
-    print(f"shape={paddle_image.shape}", flush=True)
-    print(f"mode={image.mode}", flush=True)
-    logger.info("PaddleOCR numpy image shape=%s dtype=%s", paddle_image.shape, paddle_image.dtype)
-
-    # ------------------------------------------------------------------
-    # Attempt 1: with return_word_box=True (word-level segmentation)
-    # ------------------------------------------------------------------
-    word_box_supported = "return_word_box" in runner_signature.parameters
-    if word_box_supported:
-        word_kwargs = {**base_kwargs, "return_word_box": True}
+    if _PADDLE_WORD_BOX_SUPPORTED:
         try:
-            result = _PADDLE_OCR_RUNNER(paddle_image, **word_kwargs)
-            logger.info("[OCR-RUN] selected_reconstruction_mode=word_level (return_word_box=True succeeded)")
-            return result, _PADDLE_OCR_RUNNER_NAME
+            result = runner(paddle_input, **_PADDLE_OCR_RUNNER_KWARGS, return_word_box=True)
+            trace(logger, "[OCR-RUN] selected_reconstruction_mode=word_level (return_word_box=True succeeded)")
+            return result
         except TypeError as exc:
             logger.warning(
                 "[OCR-RUN] return_word_box=True raised TypeError; falling back to line-level. error=%s",
@@ -998,29 +1214,178 @@ def _run_paddle_ocr(image: Image.Image):
                 exc,
             )
     else:
-        logger.info("[OCR-RUN] return_word_box not in runner signature; using line-level mode directly")
+        trace(logger, "[OCR-RUN] return_word_box not in runner signature; using line-level mode directly")
 
-    # ------------------------------------------------------------------
-    # Attempt 2: without return_word_box (guaranteed-compatible fallback)
-    # ------------------------------------------------------------------
     try:
-        result = _PADDLE_OCR_RUNNER(paddle_image, **base_kwargs)
-        logger.info("[OCR-RUN] selected_reconstruction_mode=line_level (return_word_box not used)")
-        return result, _PADDLE_OCR_RUNNER_NAME
+        result = runner(paddle_input, **_PADDLE_OCR_RUNNER_KWARGS)
+        trace(logger, "[OCR-RUN] selected_reconstruction_mode=line_level (return_word_box not used)")
+        return result
     except Exception as exc:
         logger.error("[OCR-RUN] Line-level OCR call also failed: %s", exc)
-        return None, _PADDLE_OCR_RUNNER_NAME
+        return None
 
 
-def _ocr_page_with_paddle(image: Image.Image) -> tuple[str, float]:
-    result, method_name = _run_paddle_ocr(image)
+def _run_paddle_ocr_batch(images: list[Image.Image]) -> tuple[list, str]:
+    """Run PaddleOCR over several page images and return one raw result per image.
 
-    # ------------------------------------------------------------------
-    # Diagnostics: raw PaddleOCR output BEFORE normalization
-    # ------------------------------------------------------------------
-    logger.info("[OCR-DIAG] === Raw PaddleOCR output ===")
-    logger.info("[OCR-DIAG] method=%s result_type=%s", method_name, type(result).__name__)
-    logger.info("[OCR-DIAG] result_sample: %s", _preview_value(_describe_paddle_first_item(result)))
+    ``predict`` (PaddleOCR 3.x) accepts a list of arrays and batches text
+    detection and recognition internally, so pages are sent in chunks of
+    ``PADDLE_BATCH_SIZE``.  Each per-image result is wrapped in a list so it
+    has the same shape as a single-image call.  The legacy ``ocr`` runner, and
+    any batch call that fails or returns the wrong number of results, is
+    handled one image at a time.
+
+    With ``PADDLE_POOL_SIZE`` above one, inputs spanning several batches
+    (e.g. the stripes of a tall page) are split across that many pooled
+    engines running in threads.
+    """
+    if not _paddle_enabled():
+        return [None] * len(images), "unavailable"
+    workers = min(_PADDLE_POOL_SIZE, math.ceil(len(images) / _PADDLE_BATCH_SIZE))
+    if workers <= 1:
+        return _run_paddle_ocr_on_engine(images)
+    size = math.ceil(len(images) / workers)
+    chunks = [images[start : start + size] for start in range(0, len(images), size)]
+    with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+        # Each thread runs in a copy of this context so a request trace
+        # flag (ocr.diagnostics) follows the work.
+        futures = [executor.submit(copy_context().run, _run_paddle_ocr_on_engine, chunk) for chunk in chunks]
+        outcomes = [future.result() for future in futures]
+    results = [result for chunk_results, _ in outcomes for result in chunk_results]
+    method_names = [name for _, name in outcomes if name != "unavailable"]
+    return results, method_names[0] if method_names else "unavailable"
+
+
+def _run_paddle_ocr_on_engine(images: list[Image.Image]) -> tuple[list, str]:
+    with _PADDLE_POOL.checkout(timeout=_PADDLE_CHECKOUT_TIMEOUT) as ocr:
+        runner = _paddle_runner_for(ocr) if ocr is not None else None
+        if runner is None:
+            return [None] * len(images), "unavailable"
+        return _run_paddle_runner_batched(runner, images), _PADDLE_OCR_RUNNER_NAME
+
+
+def _run_paddle_runner_batched(runner, images: list[Image.Image]) -> list:
+    results: list = []
+    step = _PADDLE_BATCH_SIZE if _PADDLE_OCR_RUNNER_NAME == "predict" else 1
+    for start in range(0, len(images), step):
+        arrays = [np.array(image.convert("RGB")) for image in images[start : start + step]]
+        if tracing(logger):
+            trace(logger, "[OCR-RUN] PaddleOCR input shapes=%s", [array.shape for array in arrays])
+        if len(arrays) > 1:
+            batch_result = _call_paddle_runner(runner, arrays)
+            try:
+                batch_result = list(batch_result) if batch_result is not None else None
+            except TypeError:
+                batch_result = None
+            if batch_result is not None and len(batch_result) == len(arrays):
+                results.extend([item] for item in batch_result)
+                continue
+            logger.warning(
+                "[OCR-RUN] batched call returned %s results for %d pages; retrying page by page",
+                "no" if batch_result is None else len(batch_result),
+                len(arrays),
+            )
+        results.extend(_call_paddle_runner(runner, array) for array in arrays)
+    return results
+
+
+def _stripe_bounds(width: int, height: int) -> list[tuple[int, int, int, int]]:
+    """Split a tall page into overlapping stripes; ``[]`` when it is not tall enough.
+
+    Returns ``(top, bottom, own_top, own_bottom)`` row ranges.  Stripes are
+    about as tall as the page is wide and overlap by ``_STRIPE_OVERLAP`` of
+    that, comfortably more than a text line, so every line lies whole inside
+    at least one stripe.  Each stripe owns the rows up to the middle of its
+    overlaps; a box is kept only from the stripe owning its centre, which
+    drops both the second copy of lines inside an overlap and the clipped
+    fragments at stripe edges.
+    """
+    if not _STRIPE_OCR or width <= 0 or height < width * _STRIPE_MIN_ASPECT:
+        return []
+    stripe_height = width
+    step = max(stripe_height - int(stripe_height * _STRIPE_OVERLAP), 1)
+    tops = list(range(0, height - stripe_height + 1, step))
+    if tops[-1] + stripe_height < height:
+        tops.append(height - stripe_height)
+
+    bounds: list[tuple[int, int, int, int]] = []
+    for index, top in enumerate(tops):
+        bottom = top + stripe_height
+        own_top = 0 if index == 0 else (top + tops[index - 1] + stripe_height) // 2
+        own_bottom = height if index == len(tops) - 1 else (tops[index + 1] + bottom) // 2
+        bounds.append((top, bottom, own_top, own_bottom))
+    return bounds
+
+
+def _merge_stripe_entries(stripe_entries: list[list[dict]], bounds: list[tuple[int, int, int, int]]) -> list[dict]:
+    """Shift stripe boxes into page coordinates and drop overlap duplicates."""
+    merged: list[dict] = []
+    boxless_seen: set[str] = set()
+    for entries, (top, _, own_top, own_bottom) in zip(stripe_entries, bounds):
+        for entry in entries:
+            box = entry.get("box")
+            if not box:
+                # Without a box the owner is unknown; keep the first copy.
+                if entry["text"] not in boxless_seen:
+                    boxless_seen.add(entry["text"])
+                    merged.append(entry)
+                continue
+            page_box = [[x, y + top] for x, y in box]
+            y_center = sum(point[1] for point in page_box) / len(page_box)
+            if own_top <= y_center < own_bottom:
+                merged.append({**entry, "box": page_box})
+    return merged
+
+
+def _ocr_pages_with_paddle(images: list[Image.Image]) -> list[tuple[str, float]]:
+    """OCR preprocessed page images with PaddleOCR in batches; one (text, confidence) per image.
+
+    Tall pages are cut into stripes (see :func:`_stripe_bounds`) that join
+    the same batch as the other pages, and their boxes are merged back into
+    one page before line reconstruction.
+    """
+    if not images:
+        return []
+    inputs: list[Image.Image] = []
+    layouts: list[list[tuple[int, int, int, int]]] = []
+    for image in images:
+        bounds = _stripe_bounds(image.width, image.height)
+        if bounds:
+            trace(logger, "[OCR-STRIPE] %dx%d page split into %d stripes", image.width, image.height, len(bounds))
+            inputs.extend(image.crop((0, top, image.width, bottom)) for top, bottom, _, _ in bounds)
+        else:
+            inputs.append(image)
+        layouts.append(bounds)
+
+    results, method_name = _run_paddle_ocr_batch(inputs)
+    outputs: list[tuple[str, float]] = []
+    position = 0
+    for bounds in layouts:
+        if not bounds:
+            outputs.append(_paddle_result_to_page_text(results[position], method_name))
+            position += 1
+            continue
+        stripe_results = results[position : position + len(bounds)]
+        position += len(bounds)
+        if all(result is None for result in stripe_results):
+            outputs.append(("", 0.0))
+            continue
+        stripe_entries = [_normalize_paddle_result(result) for result in stripe_results]
+        outputs.append(_paddle_entries_to_page_text(_merge_stripe_entries(stripe_entries, bounds), method_name))
+    return outputs
+
+
+def _paddle_result_to_page_text(result, method_name: str) -> tuple[str, float]:
+    if tracing(logger):
+        _trace_raw_paddle_result(result, method_name)
+    return _paddle_entries_to_page_text(_normalize_paddle_result(result), method_name)
+
+
+def _trace_raw_paddle_result(result, method_name: str) -> None:
+    """Log raw PaddleOCR output BEFORE normalization."""
+    trace(logger, "[OCR-DIAG] === Raw PaddleOCR output ===")
+    trace(logger, "[OCR-DIAG] method=%s result_type=%s", method_name, type(result).__name__)
+    trace(logger, "[OCR-DIAG] result_sample: %s", Preview(_describe_paddle_first_item(result)))
 
     # Log each raw box if the result is iterable in the standard PaddleOCR
     # [[box, [text, conf]], ...] or [[[x,y],...], [text, conf]] format so
@@ -1032,62 +1397,48 @@ def _ocr_page_with_paddle(image: Image.Image) -> tuple[str, float]:
         if raw_items and isinstance(raw_items[0], list) and raw_items[0] and isinstance(raw_items[0][0], list):
             raw_items = raw_items[0]
         for raw_idx, raw_item in enumerate(raw_items or []):
-            logger.debug("[OCR-DIAG] raw_box[%d]: %s", raw_idx, _preview_value(raw_item))
+            trace(logger, "[OCR-DIAG] raw_box[%d]: %s", raw_idx, Preview(raw_item))
     except Exception as _diag_exc:  # pragma: no cover – best-effort diagnostics
-        logger.debug("[OCR-DIAG] Could not iterate raw boxes: %s", _diag_exc)
-
-    # ------------------------------------------------------------------
-    # Normalize and reconstruct
-    # ------------------------------------------------------------------
-    normalized_result = _normalize_paddle_result(result)
-
-    logger.info(
-        "[OCR-DIAG] Normalized entries: %d",
-        len(normalized_result),
-    )
-    for norm_idx, norm_entry in enumerate(normalized_result):
-        logger.info(
-            "[OCR-DIAG] norm_entry[%d] text=%r confidence=%.4f box=%s",
-            norm_idx,
-            norm_entry.get("text"),
-            _safe_float(norm_entry.get("confidence"), 0.0),
-            norm_entry.get("box"),
-        )
+        trace(logger, "[OCR-DIAG] Could not iterate raw boxes: %s", _diag_exc)
+
+
+def _paddle_entries_to_page_text(normalized_result: list[dict], method_name: str) -> tuple[str, float]:
+    """Reconstruct page text from normalized PaddleOCR entries."""
+    detail = tracing(logger)
+    if detail:
+        trace(logger, "[OCR-DIAG] Normalized entries: %d", len(normalized_result))
+        for norm_idx, norm_entry in enumerate(normalized_result):
+            trace(
+                logger,
+                "[OCR-DIAG] norm_entry[%d] text=%r confidence=%.4f box=%s",
+                norm_idx,
+                norm_entry.get("text"),
+                _safe_float(norm_entry.get("confidence"), 0.0),
+                norm_entry.get("box"),
+            )
 
     extracted_lines, confidences, confidence = _group_paddle_lines(normalized_result)
-
-    # ------------------------------------------------------------------
-    # Diagnostics: reconstructed rows BEFORE parser entry
-    # ------------------------------------------------------------------
-    logger.info("[OCR-DIAG] === Reconstructed rows BEFORE parser ===")
-    for line_idx, line in enumerate(extracted_lines):
-        logger.info("[OCR-DIAG] reconstructed_row[%d]: %r", line_idx, line)
-
     page_text = _clean_text("\n".join(extracted_lines))
 
-    logger.info(
-        "[OCR-DIAG] avg_confidence=%.4f line_count=%d text_preview=%r",
-        confidence,
-        len(extracted_lines),
-        page_text[:300],
-    )
-
     if _looks_like_coordinate_text(page_text):
         logger.warning(
             "[OCR-DIAG] Flattened text looks like coordinate arrays; rejecting before parser. preview=%s",
-            _preview_value(page_text),
+            Preview(page_text),
         )
         return "", 0.0
 
-    logger.info(
-        "[OCR-DIAG] method=%s normalized_entries=%d reconstructed_rows=%d "
-        "output_chars=%d preview=%r",
-        method_name,
-        len(normalized_result),
-        len(extracted_lines),
-        len(page_text),
-        page_text[:300],
-    )
+    if detail:
+        trace(
+            logger,
+            "[OCR-DIAG] method=%s normalized_entries=%d reconstructed_rows=%d "
+            "avg_confidence=%.4f output_chars=%d preview=%r",
+            method_name,
+            len(normalized_result),
+            len(extracted_lines),
+            confidence,
+            len(page_text),
+            page_text[:300],
+        )
 
     if not page_text:
         return "", 0.0
@@ -1095,12 +1446,7 @@ def _ocr_page_with_paddle(image: Image.Image) -> tuple[str, float]:
 
 
 def _ocr_page_with_tesseract(image: Image.Image) -> tuple[str, float]:
-    _initialize_tesseract()
-    data = pytesseract.image_to_data(
-        image,
-        config="--oem 3 --psm 6",
-        output_type=pytesseract.Output.DICT,
-    )
+    data = tesseract_backend.image_to_data(image)
     tokens: list[str] = []
     confidences: list[float] = []
     for index, token in enumerate(data.get("text", [])):
@@ -1121,75 +1467,795 @@ def _ocr_page_with_tesseract(image: Image.Image) -> tuple[str, float]:
     return text, round(average_confidence, 4)
 
 
-def _extract_text_ocr(data: bytes) -> tuple[str, list[dict], str]:
+def _is_low_quality_ocr(page_text: str, confidence: float | None) -> bool:
+    """Return True when OCR output is sparse, coordinate-heavy, or low-confidence."""
+    if not page_text:
+        return False
+    if _looks_like_coordinate_text(page_text):
+        return True
+    if confidence is not None and 0.0 < confidence < 0.50:
+        return True
+    if len(page_text.strip()) > 10 and not re.search(r"[A-Za-z]", page_text):
+        return True
+    return False
+
+
+def _passes_quality_check(page_text: str, confidence: float) -> bool:
+    return bool(page_text) and not _is_low_quality_ocr(page_text, confidence)
+
+
+def _paddle_available() -> bool:
+    """PaddleOCR is enabled and its pool has not found it unusable."""
+    return _paddle_enabled() and _PADDLE_POOL.state != "unavailable"
+
+
+def _ocr_rendered_pages(images: list[Image.Image], page_numbers: list[int], batch_id: str) -> list[dict]:
+    """Preprocess and OCR rendered pages, running PaddleOCR over them as one batch.
+
+    Engine choice follows ``OCR_ENGINE_MODE``: in ``race`` mode both engines
+    run concurrently, otherwise pages go to PaddleOCR first and Tesseract on
+    rejection, except that layouts where Tesseract keeps winning (see
+    :mod:`ocr.engine_preference`) go to Tesseract first.  When both engines
+    were available the winning engine is recorded as ``engine_win`` in the
+    page metadata.
+    """
+    page_metas: list[dict] = [{} for _ in page_numbers]
+    processed_images = []
+    for image, page_number, page_meta in zip(images, page_numbers, page_metas):
+        processed_images.append(_preprocess_for_ocr(image, page_number, batch_id, page_meta))
+        page_meta["peak_rss_mb"] = _current_rss_mb()
+    contested = _paddle_available()
+    learning = contested and _ENGINE_PREFERENCE
+    if learning:
+        for processed, page_meta in zip(processed_images, page_metas):
+            page_meta["layout_signature"] = layout_signature(processed)
+    if contested and _ENGINE_MODE == "race":
+        strategies = ["race"] * len(processed_images)
+        outputs = _race_ocr_engines(processed_images)
+    else:
+        preference = get_engine_preference()
+        tesseract_first = [
+            learning and preference.preferred_engine(page_meta["layout_signature"]) == "pytesseract"
+            for page_meta in page_metas
+        ]
+        strategies = ["pytesseract_first" if first else "paddleocr_first" for first in tesseract_first]
+        outputs = _ocr_pages_in_order(processed_images, tesseract_first)
+    ocr_rss_mb = _current_rss_mb()
+
     pages: list[dict] = []
-    text_parts: list[str] = []
-    engine_used = "pytesseract"
+    for page_number, page_meta, strategy, (page_text, confidence, engine) in zip(
+        page_numbers, page_metas, strategies, outputs
+    ):
+        page_meta["ocr_strategy"] = strategy
+        page_meta["peak_rss_mb"] = _max_rss(page_meta["peak_rss_mb"], ocr_rss_mb)
+        if contested and _passes_quality_check(page_text, confidence):
+            page_meta["engine_win"] = engine
+        pages.append(
+            {
+                "page_number": page_number,
+                "text": page_text,
+                "confidence": confidence,
+                "engine": engine,
+                "uncertain": confidence < _UNCERTAIN_CONFIDENCE if confidence else True,
+                "metadata": page_meta,
+            }
+        )
+    return pages
+
+
+def _ocr_pages_in_order(images: list[Image.Image], tesseract_first: list[bool]) -> list[tuple[str, float, str]]:
+    """OCR each page with its first engine, falling back to the other on rejection.
+
+    Pages flagged in *tesseract_first* are read by Tesseract before the rest
+    go to PaddleOCR as one batch, joined by any Tesseract-first pages whose
+    text was rejected or read with uncertain confidence.  PaddleOCR's text is
+    used when it passes; otherwise Tesseract's is kept.  Returns
+    ``(text, confidence, engine)`` per page.
+    """
+    outputs: list[tuple[str, float, str] | None] = [None] * len(images)
+    tesseract_outputs: dict[int, tuple[str, float]] = {}
+    for index, image in enumerate(images):
+        if tesseract_first[index]:
+            page_text, confidence = _ocr_page_with_tesseract(image)
+            tesseract_outputs[index] = (page_text, confidence)
+            if confidence >= _UNCERTAIN_CONFIDENCE and _passes_quality_check(page_text, confidence):
+                outputs[index] = (page_text, confidence, "pytesseract")
+
+    paddle_indices = [index for index, output in enumerate(outputs) if output is None]
+    paddle_outputs = _ocr_pages_with_paddle([images[index] for index in paddle_indices])
+    for index, (page_text, confidence) in zip(paddle_indices, paddle_outputs):
+        # Dynamic Adaptive Fallback: check if the PaddleOCR output is sparse, coordinate-heavy,
+        # or has extremely low average confidence. If so, fall back to Tesseract OCR.
+        if _passes_quality_check(page_text, confidence):
+            outputs[index] = (page_text, confidence, "paddleocr")
+            continue
+        trace(
+            logger,
+            "[OCR-FALLBACK] page_index=%d PaddleOCR text failed quality check (is_low_quality=%s); using pytesseract",
+            index,
+            _is_low_quality_ocr(page_text, confidence),
+        )
+        if index not in tesseract_outputs:
+            tesseract_outputs[index] = _ocr_page_with_tesseract(images[index])
+        outputs[index] = (*tesseract_outputs[index], "pytesseract")
+    return outputs
+
+
+def _race_ocr_engines(images: list[Image.Image]) -> list[tuple[str, float, str]]:
+    """OCR *images* with PaddleOCR and Tesseract concurrently; first accepted result wins.
+
+    PaddleOCR reads the whole batch in one thread while Tesseract reads the
+    pages one by one in another.  As soon as a page is decided its pending
+    Tesseract job is cancelled.  Work already running cannot be interrupted;
+    it finishes in the background and its result is discarded.  When neither
+    engine's text passes the quality check, Tesseract's is kept as in the
+    ordered mode, or PaddleOCR's if Tesseract failed on the page.  Only a
+    page both engines failed on raises, which the caller retries page by
+    page.  Returns ``(text, confidence, engine)`` per page.
+    """
+    if not images:
+        return []
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr-race")
+    try:
+        paddle_future = executor.submit(copy_context().run, _ocr_pages_with_paddle, images)
+        tesseract_futures = [
+            executor.submit(copy_context().run, _ocr_page_with_tesseract, image) for image in images
+        ]
+        outputs: list[tuple[str, float, str]] = []
+        for index, tesseract_future in enumerate(tesseract_futures):
+            winner = None
+            # Each engine's (text, confidence, engine) for this page, in
+            # fallback order, once it finished without raising.
+            finished: dict[str, tuple[str, float, str]] = {}
+            pending = {paddle_future, tesseract_future}
+            while winner is None and pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # Prefer PaddleOCR when both finished together.
+                for future in sorted(done, key=lambda item: item is not paddle_future):
+                    try:
+                        if future is paddle_future:
+                            output = (*future.result()[index], "paddleocr")
+                        else:
+                            output = (*future.result(), "pytesseract")
+                    except Exception as exc:
+                        engine = "PaddleOCR" if future is paddle_future else "Tesseract"
+                        logger.warning("[OCR-RACE] %s failed on page_index=%d: %s", engine, index, exc)
+                        continue
+                    finished[output[2]] = output
+                    if _passes_quality_check(output[0], output[1]):
+                        winner = output
+                        break
+            if winner is None:
+                winner = finished.get("pytesseract") or finished.get("paddleocr")
+            if winner is None:
+                tesseract_future.result()  # both engines failed: re-raise Tesseract's error
+            tesseract_future.cancel()
+            trace(logger, "[OCR-RACE] page_index=%d won by %s", index, winner[2])
+            outputs.append(winner)
+        return outputs
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _failed_ocr_page(index: int, exc: Exception) -> dict:
+    logger.warning("OCR page %d failed: %s", index, exc)
+    return {
+        "page_number": index + 1,
+        "text": "",
+        "confidence": 0.0,
+        "engine": None,
+        "uncertain": True,
+        "error": str(exc),
+    }
+
+
+def _max_render_dpi(page) -> float:
+    """Highest DPI that survives preprocessing's resize to the working image."""
+    if not _ADAPTIVE_DPI:
+        return float(_RENDER_DPI)
+    long_edge_pt = max(page.get_size()) or 1.0
+    return round(min(float(_RENDER_DPI), _WORKING_LONG_EDGE * 72 / long_edge_pt), 1)
+
+
+def _estimate_line_height_pt(page) -> float | None:
+    """Median text line height of *page* in points, from a ``_PROBE_DPI`` render.
+
+    Lines are runs of inked rows in the horizontal projection profile.  Runs
+    taller than a quarter of the page (photos, dark borders) are ignored, as
+    are slivers under half the typical run height: table rules, underlines,
+    and descenders that the threshold cut off from their line.  Returns None
+    when fewer than two lines are found.
+    """
+    gray = page.render(scale=_PROBE_DPI / 72, grayscale=True).to_numpy()
+    if gray.ndim == 3:
+        gray = gray[:, :, 0]
+    height, width = gray.shape
+    inked_rows = (gray < 128).sum(axis=1) >= max(2, width // 200)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], inked_rows, [False])).astype(np.int8)))
+    runs = edges[1::2] - edges[::2]
+    runs = runs[(runs >= 3) & (runs <= height / 4)]
+    if len(runs):
+        runs = runs[runs >= np.percentile(runs, 75) / 2]
+    if len(runs) < 2:
+        return None
+    return float(np.median(runs)) * 72 / _PROBE_DPI
+
+
+def _dpi_for_line_height(line_height_pt: float | None, max_dpi: float) -> float:
+    if line_height_pt is None:
+        return max_dpi
+    dpi = _TARGET_LINE_HEIGHT_PX * 72 / line_height_pt
+    return round(max(min(_MIN_RENDER_DPI, max_dpi), min(dpi, max_dpi)), 1)
+
+
+def _render_page_in_strips(page, scale: float) -> tuple[Image.Image, int]:
+    """Render *page* in grayscale strips of at most ``_RENDER_PIXEL_BUDGET`` pixels.
+
+    Each strip is copied into one preallocated page buffer and released, so
+    only a single strip bitmap exists at a time.  Returns the grayscale page
+    and the number of strips.
+    """
+    width_pt, height_pt = page.get_size()
+    # pdfium rounds rendered bitmap sizes up.
+    width_px = max(math.ceil(width_pt * scale), 1)
+    height_px = max(math.ceil(height_pt * scale), 1)
+    rows_per_strip = max(1, _RENDER_PIXEL_BUDGET // width_px)
+    buffer = np.full((height_px, width_px), 255, dtype=np.uint8)
+    strips = 0
+    for top in range(0, height_px, rows_per_strip):
+        bottom = min(top + rows_per_strip, height_px)
+        crop = (0, max(height_pt - bottom / scale, 0.0), 0, top / scale)
+        bitmap = page.render(scale=scale, crop=crop, grayscale=True)
+        strip = bitmap.to_numpy()
+        rows = min(strip.shape[0], bottom - top)
+        cols = min(strip.shape[1], width_px)
+        buffer[top : top + rows, :cols] = strip[:rows, :cols, 0] if strip.ndim == 3 else strip[:rows, :cols]
+        del strip
+        bitmap.close()
+        strips += 1
+    return Image.fromarray(buffer), strips
+
+
+def _full_page_image(page):
+    """The page's image object when the page is one upright image covering it, else None."""
+    image = _sole_page_image(page)
+    if image is None:
+        return None
+    a, b, c, d, _, _ = image.get_matrix().get()
+    if abs(b) > 1e-6 or abs(c) > 1e-6 or a <= 0 or d <= 0:
+        return None
+    left, bottom, right, top = image.get_pos()
+    box_left, box_bottom, box_right, box_top = page.get_cropbox()
+    slack_x = (box_right - box_left) * _FULL_PAGE_TOLERANCE
+    slack_y = (box_top - box_bottom) * _FULL_PAGE_TOLERANCE
+    if (
+        left > box_left + slack_x
+        or bottom > box_bottom + slack_y
+        or right < box_right - slack_x
+        or top < box_top - slack_y
+    ):
+        return None
+    return image
+
+
+def _decode_image_gray(image) -> np.ndarray | None:
+    """Decode a pdfium image object to a 2-D uint8 array at native resolution.
+
+    JPEG streams are decoded by OpenCV directly to luma, skipping chroma
+    upsampling and colour conversion.  Other filters go through pdfium's
+    decoder; colour results larger than ``_RENDER_PIXEL_BUDGET`` return None
+    so the page is strip-rendered instead.
+    """
+    metadata = image.get_metadata()
+    if image.get_filters() == ["DCTDecode"] and metadata.bits_per_pixel in (8, 24) and cv2 is not None:
+        raw = image.get_data(decode_simple=False)
+        gray = cv2.imdecode(np.frombuffer(raw, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is not None:
+            return gray
+    if metadata.bits_per_pixel > 8 and metadata.width * metadata.height > _RENDER_PIXEL_BUDGET:
+        return None
+    bitmap = image.get_bitmap(render=False)
+    try:
+        array = bitmap.to_numpy()
+        if array.ndim == 2:
+            return array.copy()
+        if array.shape[2] == 1:
+            return array[:, :, 0].copy()
+        if cv2 is None:
+            return None
+        return cv2.cvtColor(array, cv2.COLOR_BGR2GRAY if array.shape[2] == 3 else cv2.COLOR_BGRA2GRAY)
+    finally:
+        bitmap.close()
+
+
+def _embedded_page_image(page) -> tuple[Image.Image, dict] | None:
+    """Grayscale page image taken straight from a full-page embedded image, or None."""
+    try:
+        image = _full_page_image(page)
+        gray = _decode_image_gray(image) if image is not None else None
+    except Exception as exc:
+        logger.debug("[OCR-DIRECT] embedded image could not be decoded: %s", exc)
+        return None
+    if gray is None:
+        return None
+    rotation = page.get_rotation()
+    if rotation:
+        # /Rotate turns the page clockwise when displayed.
+        gray = np.ascontiguousarray(np.rot90(gray, k=-(rotation // 90)))
+    # pdfium reports the page size as displayed, i.e. after /Rotate.
+    dpi = round(gray.shape[1] * 72 / page.get_width(), 1)
+    info = {
+        "render_dpi": dpi,
+        # Native pixels are all there is; a re-render would only resample them.
+        "max_render_dpi": dpi,
+        "line_height_pt": None,
+        "render_bytes": int(gray.size),
+        "render_strips": 0,
+        "render_source": "embedded_image",
+    }
+    return Image.fromarray(gray), info
+
+
+def _render_pdf_page(pdf, index: int, dpi: float | None = None) -> tuple[Image.Image, dict]:
+    """Render one page and return it with its render facts for page metadata.
+
+    *dpi* ``None`` picks the page's DPI adaptively (or ``_RENDER_DPI`` when
+    ``OCR_ADAPTIVE_DPI=0``), and takes a single full-page image straight from
+    the PDF instead of rendering when ``OCR_DIRECT_IMAGE`` is on.  Pages over
+    ``_RENDER_PIXEL_BUDGET`` are rendered in grayscale strips.
+    """
+    page = pdf[index]
+    strips = 1
+    try:
+        if dpi is None and _DIRECT_IMAGE:
+            embedded = _embedded_page_image(page)
+            if embedded is not None:
+                return embedded
+        max_dpi = _max_render_dpi(page)
+        line_height_pt = None
+        if dpi is None:
+            if _ADAPTIVE_DPI:
+                line_height_pt = _estimate_line_height_pt(page)
+            dpi = _dpi_for_line_height(line_height_pt, max_dpi)
+        scale = dpi / 72
+        width_pt, height_pt = page.get_size()
+        if width_pt * height_pt * scale * scale > _RENDER_PIXEL_BUDGET:
+            image, strips = _render_page_in_strips(page, scale)
+        else:
+            image = page.render(scale=scale).to_pil()
+    finally:
+        page.close()
+    info = {
+        "render_dpi": dpi,
+        "max_render_dpi": max_dpi,
+        "line_height_pt": round(line_height_pt, 2) if line_height_pt else None,
+        "render_bytes": image.width * image.height * len(image.getbands()),
+        "render_strips": strips,
+        "render_source": "pdfium",
+    }
+    return image, info
+
+
+def _rerender_low_confidence_pages(pdf, results: dict[int, dict], render_info: dict[int, dict], batch_id: str) -> None:
+    """OCR low-confidence pages again at their maximum DPI, keeping the better result."""
+    retry = [
+        index
+        for index, info in render_info.items()
+        if info["render_dpi"] < info["max_render_dpi"]
+        and not results[index].get("error")
+        and (results[index].get("confidence") or 0.0) < _RERENDER_CONFIDENCE
+    ]
+    if not retry:
+        return
+
+    images: list[Image.Image] = []
+    retry_info: list[dict] = []
+    for index in retry:
+        image, info = _render_pdf_page(pdf, index, dpi=render_info[index]["max_render_dpi"])
+        images.append(image)
+        retry_info.append(info)
+    try:
+        pages = _ocr_rendered_pages(images, [index + 1 for index in retry], batch_id)
+    except Exception as exc:
+        logger.warning("[OCR-DPI] re-render of %d low-confidence pages failed: %s", len(retry), exc)
+        return
+
+    for index, page, info in zip(retry, pages, retry_info):
+        before = results[index].get("confidence") or 0.0
+        after = page.get("confidence") or 0.0
+        trace(
+            logger,
+            "[OCR-DPI] page=%d re-rendered %.0f -> %.0f dpi: confidence %.3f -> %.3f",
+            index + 1,
+            render_info[index]["render_dpi"],
+            info["render_dpi"],
+            before,
+            after,
+        )
+        render_info[index]["rerendered"] = True
+        if after > before:
+            results[index] = page
+            render_info[index].update(
+                render_dpi=info["render_dpi"],
+                render_bytes=info["render_bytes"],
+                render_strips=info["render_strips"],
+            )
+
+
+def _current_rss_mb() -> float | None:
+    """This process's resident set size right now, or None where unavailable (non-Linux)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            resident_pages = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(resident_pages * _PAGE_SIZE / (1024 * 1024), 1)
+
+
+def _max_rss(*samples: float | None) -> float | None:
+    present = [sample for sample in samples if sample is not None]
+    return max(present) if present else None
+
+
+def _ocr_pdf_pages(pdf, page_indices: list[int], batch_id: str) -> list[dict]:
+    """Render *page_indices* of an open pdfium document and OCR them as one batch.
+
+    Failures are reported in the returned page dicts instead of raised, so one
+    bad page never aborts the rest of the document; if the batch fails as a
+    whole its pages are retried one at a time.  The ``engine`` of a failed
+    page is left as ``None`` and filled in by the caller once the
+    document-level engine is known.
+
+    Pages already in the page cache (see :func:`_page_image_key`) are
+    replayed without rendering or OCR.  The metadata of each rendered page
+    records ``peak_rss_mb``, the highest process RSS sampled after its render,
+    after its preprocessing and after its batch's OCR, and ``rss_delta_mb``,
+    that peak less the RSS sampled just before its render.  These are point
+    samples: memory allocated and freed between them is not seen, other
+    threads' allocations are included, and the post-OCR sample is shared by
+    the pages of one PaddleOCR batch.  Each page is logged as one
+    ``[OCR-PAGE]`` summary record.
+    """
+    page_cache = get_page_cache()
+    fingerprint = _ocr_config_fingerprint() if page_cache is not None else ""
+    results: dict[int, dict] = {}
+    images: list[Image.Image] = []
+    rendered_indices: list[int] = []
+    render_info: dict[int, dict] = {}
+    image_keys: dict[int, str] = {}
+    rss_before: dict[int, float | None] = {}
+    rss_rendered: dict[int, float | None] = {}
+    for index in page_indices:
+        try:
+            if page_cache is not None:
+                key = _page_image_key(pdf, index, fingerprint)
+                if key is not None and _replay_cached_page(page_cache, key, index, results):
+                    continue
+            rss_before[index] = _current_rss_mb()
+            image, render_info[index] = _render_pdf_page(pdf, index)
+            rss_rendered[index] = _current_rss_mb()
+            if page_cache is not None:
+                key = key or _bitmap_key(image, fingerprint)
+                if _replay_cached_page(page_cache, key, index, results):
+                    del render_info[index]
+                    continue
+                image_keys[index] = key
+            images.append(image)
+            rendered_indices.append(index)
+        except Exception as exc:
+            results[index] = _failed_ocr_page(index, exc)
+
+    if images:
+        try:
+            ocr_pages = _ocr_rendered_pages(images, [index + 1 for index in rendered_indices], batch_id)
+            results.update(zip(rendered_indices, ocr_pages))
+        except Exception as exc:
+            if len(images) == 1:
+                results[rendered_indices[0]] = _failed_ocr_page(rendered_indices[0], exc)
+            else:
+                logger.warning("[OCR-BATCH] batch of %d pages failed (%s); retrying page by page", len(images), exc)
+                for image, index in zip(images, rendered_indices):
+                    try:
+                        results[index] = _ocr_rendered_pages([image], [index + 1], batch_id)[0]
+                    except Exception as page_exc:
+                        results[index] = _failed_ocr_page(index, page_exc)
+
+    images.clear()
+    _rerender_low_confidence_pages(pdf, results, render_info, batch_id)
+    for index in page_indices:
+        metadata = results[index].setdefault("metadata", {})
+        metadata.update(render_info.get(index, {}))
+        if index in image_keys and not results[index].get("error"):
+            metadata["image_key"] = image_keys[index]
+        if index in rss_before:
+            peak_rss_mb = _max_rss(rss_rendered.get(index), metadata.get("peak_rss_mb"))
+            before = rss_before[index]
+            metadata["peak_rss_mb"] = peak_rss_mb
+            metadata["rss_delta_mb"] = (
+                round(peak_rss_mb - before, 1) if peak_rss_mb is not None and before is not None else None
+            )
+        _log_page_summary(results[index], batch_id)
+    _remember_ocr_pages(results[index] for index in page_indices)
+    _learn_engine_wins(results[index] for index in page_indices)
+    return [results[index] for index in page_indices]
+
+
+def _page_image_key(pdf, index: int, fingerprint: str) -> str | None:
+    """Page-cache key from the embedded image of a page that is nothing but one image.
+
+    The image stream is hashed as stored, before decoding or rendering,
+    together with its placement and the page geometry.  Returns None for
+    any other page; those are keyed by their rendered bitmap instead.
+    """
+    page = pdf[index]
+    try:
+        image = _sole_page_image(page)
+        if image is None:
+            return None
+        metadata = image.get_metadata()
+        digest = hashlib.sha256()
+        digest.update(
+            f"{fingerprint};xobject;page={page.get_size()}/{page.get_rotation()};"
+            f"matrix={image.get_matrix().get()};size={image.get_size()};"
+            f"bpp={metadata.bits_per_pixel};colorspace={metadata.colorspace};"
+            f"filters={image.get_filters()}".encode("utf-8")
+        )
+        digest.update(image.get_data(decode_simple=False))
+        return digest.hexdigest()
+    except Exception as exc:
+        logger.debug("[OCR-PAGE-CACHE] page %d image stream unreadable: %s", index + 1, exc)
+        return None
+    finally:
+        page.close()
+
+
+def _sole_page_image(page):
+    """The page's image object when it is the page's only content, else None."""
+    if pdfium_c.FPDFPage_GetAnnotCount(page.raw) > 0:
+        return None
+    objects = page.get_objects(max_depth=0)
+    first = next(objects, None)
+    if first is None or first.type != pdfium_c.FPDF_PAGEOBJ_IMAGE or next(objects, None) is not None:
+        return None
+    return first
+
+
+def _bitmap_key(image: Image.Image, fingerprint: str) -> str:
+    """Page-cache key from the rendered page bitmap."""
+    digest = hashlib.sha256()
+    digest.update(f"{fingerprint};bitmap;{image.mode};{image.size}".encode("utf-8"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def _replay_cached_page(page_cache, key: str, index: int, results: dict[int, dict]) -> bool:
+    cached = page_cache.get(key)
+    if cached is None:
+        return False
+    cached["page_number"] = index + 1
+    cached.setdefault("metadata", {})["page_cache_hit"] = True
+    results[index] = cached
+    return True
+
+
+def _learn_engine_wins(pages) -> None:
+    """Feed each page's winning engine into the per-layout engine preference."""
+    preference = get_engine_preference()
+    for page in pages:
+        metadata = page.get("metadata") or {}
+        if metadata.get("engine_win") and metadata.get("layout_signature") and not metadata.get("page_cache_hit"):
+            preference.record(metadata["layout_signature"], metadata["engine_win"])
+
+
+def _remember_ocr_pages(pages) -> None:
+    """Store freshly OCR'd pages that carry an ``image_key`` in the page cache."""
+    page_cache = get_page_cache()
+    if page_cache is None:
+        return
+    for page in pages:
+        metadata = page.get("metadata") or {}
+        key = metadata.get("image_key")
+        if key is None or metadata.get("page_cache_hit") or page.get("error"):
+            continue
+        page_cache.put(
+            key,
+            {
+                **{name: value for name, value in page.items() if name != "page_number"},
+                "metadata": {name: value for name, value in metadata.items() if name not in _RSS_METADATA},
+            },
+        )
+
+
+def _log_page_summary(page: dict, batch_id: str) -> None:
+    metadata = page.get("metadata") or {}
+    logger.info(
+        "[OCR-PAGE] batch=%s page=%d engine=%s confidence=%.4f chars=%d lines=%d "
+        "dpi=%s render_strips=%s osd=%s rerendered=%s cache_hit=%s peak_rss_mb=%s rss_delta_mb=%s%s",
+        batch_id,
+        page["page_number"],
+        page.get("engine") or "failed",
+        page.get("confidence") or 0.0,
+        len(page.get("text") or ""),
+        len((page.get("text") or "").splitlines()),
+        metadata.get("render_dpi"),
+        metadata.get("render_strips"),
+        metadata.get("osd_executed"),
+        metadata.get("rerendered", False),
+        metadata.get("page_cache_hit", False),
+        metadata.get("peak_rss_mb"),
+        metadata.get("rss_delta_mb"),
+        f" error={page['error']!r}" if page.get("error") else "",
+    )
+
+
+def _ocr_page_batches(page_indices: list[int], workers: int) -> list[list[int]]:
+    """Group pages into OCR batches.
+
+    Batching only pays off for PaddleOCR, so Tesseract-only deployments keep
+    one rendered page in memory at a time.  With several workers the batch
+    size shrinks until every worker has pages to process.
+    """
+    size = _PADDLE_BATCH_SIZE if _paddle_enabled() else 1
+    if workers > 1:
+        size = min(size, max(1, math.ceil(len(page_indices) / workers)))
+    return [page_indices[start : start + size] for start in range(0, len(page_indices), size)]
+
+
+# ---------------------------------------------------------------------------
+# Page-parallel OCR (process pool)
+# ---------------------------------------------------------------------------
+# The pool is created on first use and kept for the life of the process, so
+# each worker loads its OCR engines once rather than once per request.  Each
+# worker keeps the pdfium handle of the document it last worked on (pdfium
+# is not thread-safe and its documents cannot be pickled), keyed by batch id.
+_WORKER_PDF: tuple[str, object] | None = None
+_OCR_POOL: ProcessPoolExecutor | None = None
+_OCR_POOL_LOCK = threading.Lock()
+
+
+def _ocr_pages_in_worker(
+    data: bytes, page_indices: list[int], batch_id: str, trace_request: bool = False
+) -> list[dict]:
+    global _WORKER_PDF
+    if _WORKER_PDF is None or _WORKER_PDF[0] != batch_id:
+        if _WORKER_PDF is not None:
+            _WORKER_PDF[1].close()
+        _WORKER_PDF = (batch_id, pdfium.PdfDocument(BytesIO(data), autoclose=True))
+    with ocr_trace(trace_request):
+        return _ocr_pdf_pages(_WORKER_PDF[1], page_indices, batch_id)
+
+
+def _get_ocr_pool(workers: int) -> ProcessPoolExecutor:
+    """The process-wide OCR pool, sized by the first caller and shared by all requests."""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None:
+            context = multiprocessing.get_context(_OCR_POOL_START_METHOD or None)
+            _OCR_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            logger.info("[OCR-POOL] started %d %s worker processes", workers, context.get_start_method())
+        return _OCR_POOL
+
+
+def _discard_ocr_pool(pool: ProcessPoolExecutor | None = None) -> None:
+    """Shut down the OCR pool (only if it is still *pool*, when given); the next request starts a new one."""
+    global _OCR_POOL
+    with _OCR_POOL_LOCK:
+        if _OCR_POOL is None or (pool is not None and _OCR_POOL is not pool):
+            return
+        discarded, _OCR_POOL = _OCR_POOL, None
+    discarded.shutdown(wait=False, cancel_futures=True)
+
+
+def _forget_ocr_pool_after_fork() -> None:
+    """A forked server process must not use its parent's pool or lock."""
+    global _OCR_POOL, _OCR_POOL_LOCK
+    _OCR_POOL = None
+    _OCR_POOL_LOCK = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_ocr_pool_after_fork)
+
+
+def _resolve_ocr_workers(workers: int | None, page_count: int) -> int:
+    if workers is None:
+        workers = _OCR_WORKERS or min(os.cpu_count() or 1, _OCR_MAX_AUTO_WORKERS)
+    return max(1, min(workers, page_count))
+
+
+def _ocr_pages_parallel(data: bytes, page_indices: list[int], workers: int, batch_id: str) -> list[dict]:
+    """OCR *page_indices* in the process-wide OCR pool and return them in that order.
+
+    The document is split into *workers* batches; concurrent requests share
+    the pool, so at most its size of pages are OCR'd at once per process.
+    If the pool cannot be started or a worker dies (e.g. OOM-killed), the
+    pool is discarded and the pages that did not complete are OCR'd
+    sequentially in this process.
+    """
+    results: dict[int, dict] = {}
+    pool = None
+    try:
+        pool = _get_ocr_pool(workers)
+        trace_request = request_trace_enabled()
+        futures = {
+            pool.submit(_ocr_pages_in_worker, data, batch, batch_id, trace_request): batch
+            for batch in _ocr_page_batches(page_indices, workers)
+        }
+        for future in as_completed(futures):
+            pages = future.result()
+            # Pages OCR'd in a worker land in its caches; keep them in this
+            # process's caches as well.
+            _remember_ocr_pages(pages)
+            _learn_engine_wins(pages)
+            results.update(zip(futures[future], pages))
+    except (BrokenProcessPool, OSError, RuntimeError) as exc:
+        logger.warning(
+            "[OCR-POOL] process pool failed after %d/%d pages (%s); finishing sequentially",
+            len(results),
+            len(page_indices),
+            exc,
+        )
+        _discard_ocr_pool(pool)
+
+    missing = [index for index in page_indices if index not in results]
+    if missing:
+        pdf = pdfium.PdfDocument(BytesIO(data), autoclose=True)
+        try:
+            for batch in _ocr_page_batches(missing, 1):
+                results.update(zip(batch, _ocr_pdf_pages(pdf, batch, batch_id)))
+        finally:
+            pdf.close()
+
+    return [results[index] for index in page_indices]
+
+
+def _extract_text_ocr(
+    data: bytes,
+    workers: int | None = None,
+    page_indices: list[int] | None = None,
+) -> tuple[str, list[dict], str]:
+    """OCR the pages of *data*.
+
+    *page_indices* restricts OCR to those zero-based pages; ``None`` OCRs
+    every page.  *workers* bounds the process pool used for page-parallel OCR; ``None``
+    uses ``OCR_WORKERS`` from the environment.  With one worker (or a
+    single-page document) pages are processed sequentially in-process, which
+    keeps peak memory to one rendered page for low-memory containers.
+    """
     batch_id = uuid4().hex[:12]
     try:
         pdf = pdfium.PdfDocument(BytesIO(data), autoclose=True)
     except Exception as exc:
         logger.error("Failed to open PDF for OCR: %s", exc)
         return "", [], "none"
-    scale = 300 / 72
 
     try:
-        for index in range(len(pdf)):
-            page = pdf[index]
-            try:
-                bitmap = page.render(scale=scale)
-                pil_image = bitmap.to_pil()
-                processed = _preprocess_for_ocr(pil_image, index + 1, batch_id)
-
-                page_text, confidence = _ocr_page_with_paddle(processed)
-                
-                # Dynamic Adaptive Fallback: check if the PaddleOCR output is sparse, coordinate-heavy,
-                # or has extremely low average confidence. If so, fall back to Tesseract OCR.
-                is_low_quality = False
-                if page_text:
-                    if _looks_like_coordinate_text(page_text):
-                        is_low_quality = True
-                    elif confidence is not None and 0.0 < confidence < 0.50:
-                        is_low_quality = True
-                    elif len(page_text.strip()) > 10 and not re.search(r"[A-Za-z]", page_text):
-                        is_low_quality = True
-
-                if page_text and not is_low_quality:
-                    engine = "paddleocr"
-                    engine_used = "paddleocr"
-                else:
-                    logger.warning("[OCR-FALLBACK] PaddleOCR page text failed quality check (is_low_quality=%s); falling back to Tesseract.", is_low_quality)
-                    logger.info("[OCR-FALLBACK] using pytesseract")
-                    page_text, confidence = _ocr_page_with_tesseract(processed)
-                    engine = "pytesseract"
-
-                pages.append(
-                    {
-                        "page_number": index + 1,
-                        "text": page_text,
-                        "confidence": confidence,
-                        "engine": engine,
-                        "uncertain": confidence < 0.6 if confidence else True,
-                    }
-                )
-                if page_text:
-                    text_parts.append(page_text)
-            except Exception as exc:
-                logger.warning("OCR page %d failed: %s", index, exc)
-                pages.append(
-                    {
-                        "page_number": index + 1,
-                        "text": "",
-                        "confidence": 0.0,
-                        "engine": engine_used,
-                        "uncertain": True,
-                        "error": str(exc),
-                    }
-                )
-            finally:
-                page.close()
+        page_count = len(pdf)
+        if page_indices is None:
+            page_indices = list(range(page_count))
+        else:
+            page_indices = [index for index in page_indices if 0 <= index < page_count]
+        workers = _resolve_ocr_workers(workers, len(page_indices))
+        if workers > 1:
+            # Workers open their own handles; ours is not needed meanwhile.
+            pdf.close()
+            pdf = None
+            logger.info("[OCR-POOL] OCR %d pages with %d worker processes", len(page_indices), workers)
+            pages = _ocr_pages_parallel(data, page_indices, workers, batch_id)
+        else:
+            pages = [
+                page
+                for batch in _ocr_page_batches(page_indices, 1)
+                for page in _ocr_pdf_pages(pdf, batch, batch_id)
+            ]
     finally:
-        pdf.close()
+        if pdf is not None:
+            pdf.close()
+
+    engine_used = "paddleocr" if any(page["engine"] == "paddleocr" for page in pages) else "pytesseract"
+    for page in pages:
+        if page["engine"] is None:
+            page["engine"] = engine_used
+    text_parts = [page["text"] for page in pages if page["text"]]
 
     extracted_text = _clean_text("\n\n".join(text_parts))
     logger.info(
@@ -1201,10 +2267,37 @@ def _extract_text_ocr(data: bytes) -> tuple[str, list[dict], str]:
     return extracted_text, pages, engine_used
 
 
-def extract_pdf_content(file_bytes: bytes) -> dict:
-    """Return text plus OCR metadata while avoiding OCR for text PDFs."""
-    logger.info("CALL CHAIN OCR entrypoint=extract_pdf_content bytes=%d", len(file_bytes or b""))
-    if not file_bytes:
+def _ocr_config_fingerprint() -> str:
+    """Describe every setting that changes OCR output, for result-cache keys."""
+    engine = "paddleocr" if _paddle_enabled() else "pytesseract"
+    dpi = f"{_RENDER_DPI}-adaptive-{_RERENDER_CONFIDENCE}" if _ADAPTIVE_DPI else str(_RENDER_DPI)
+    return (
+        f"engine={engine};tesseract={tesseract_backend.backend_name()};"
+        f"dpi={dpi};preprocess={_PREPROCESS_VERSION}-{_PREPROCESS_MODE};routing=page;"
+        f"stripes={_STRIPE_MIN_ASPECT if _STRIPE_OCR else 'off'};"
+        f"direct_image={'on' if _DIRECT_IMAGE else 'off'};"
+        f"engines={_ENGINE_MODE}{'-learned' if _ENGINE_PREFERENCE else ''};"
+        f"tables={_TABLE_MODE}"
+    )
+
+
+def _has_errors(result: dict) -> bool:
+    """Whether *result* or any of its pages records an extraction error."""
+    return bool(result.get("error")) or any(page.get("error") for page in result.get("pages") or ())
+
+
+def extract_pdf_content(file_bytes: bytes | OpenedPdf) -> dict:
+    """Return text plus OCR metadata while avoiding OCR for text PDFs.
+
+    *file_bytes* may be raw bytes or a shared :class:`OpenedPdf` handle; a
+    handle passed in stays open and is reused by detection and extraction.
+
+    Results are memoized in the persistent OCR result cache keyed by the file
+    bytes and the OCR configuration, so identical re-uploads skip extraction.
+    """
+    data = file_bytes.data if isinstance(file_bytes, OpenedPdf) else bytes(file_bytes or b"")
+    logger.info("CALL CHAIN OCR entrypoint=extract_pdf_content bytes=%d", len(data))
+    if not data:
         return {
             "text": "",
             "pages": [],
@@ -1213,8 +2306,45 @@ def extract_pdf_content(file_bytes: bytes) -> dict:
             "confidence": 0.0,
         }
 
-    data = bytes(file_bytes)
-    detection = detect_pdf_type(data)
+    cache = get_result_cache()
+    cache_key = make_cache_key(data, _ocr_config_fingerprint()) if cache is not None else None
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info("[OCR-CACHE] hit key=%s", cache_key[:16])
+            return cached
+
+    if isinstance(file_bytes, OpenedPdf):
+        result = _extract_pdf_content_uncached(file_bytes)
+    else:
+        with open_pdf(data) as doc:
+            result = _extract_pdf_content_uncached(doc)
+    # Errors (encrypted file, OCR engine unavailable, a page whose OCR
+    # crashed) may be transient or user-fixable, so only clean extractions
+    # are stored.
+    if cache is not None and not _has_errors(result):
+        cache.put(cache_key, result)
+    return result
+
+
+def _route_pages(detection: dict) -> tuple[list[int], list[int]]:
+    """Split zero-based page indices into (direct-text pages, OCR pages)."""
+    direct_indices: list[int] = []
+    ocr_indices: list[int] = []
+    for index, page in enumerate(detection.get("pages") or []):
+        (direct_indices if page["page_type"] == "text" else ocr_indices).append(index)
+    return direct_indices, ocr_indices
+
+
+def _average_confidence(pages: list[dict]) -> float:
+    confidences = [page["confidence"] for page in pages if page.get("confidence") is not None]
+    if not confidences:
+        return 0.0
+    return round(sum(confidences) / len(confidences), 4)
+
+
+def _extract_pdf_content_uncached(doc: OpenedPdf) -> dict:
+    detection = detect_pdf_type(doc)
     logger.info("CALL CHAIN OCR detect_pdf_type -> pdf_type=%s", detection.get("pdf_type"))
 
     if detection["pdf_type"] == "encrypted":
@@ -1228,28 +2358,51 @@ def extract_pdf_content(file_bytes: bytes) -> dict:
             "error": "PDF is encrypted or password-protected",
         }
 
+    # Route each page on its own: pages with a usable text layer are read
+    # directly and only image-only pages are rendered and OCR'd.
+    direct_indices, ocr_indices = _route_pages(detection)
+
     direct_text = ""
     direct_pages: list[dict] = []
-    if detection["pdf_type"] == "text":
+    if direct_indices:
         try:
-            logger.info("CALL CHAIN OCR -> _extract_text_pdfplumber")
-            direct_text, direct_pages = _extract_text_pdfplumber(data)
+            logger.info("CALL CHAIN OCR -> _extract_text_pdfplumber pages=%d", len(direct_indices))
+            direct_text, direct_pages = _extract_text_pdfplumber(doc, direct_indices)
         except Exception as exc:
             logger.warning("Direct text extraction failed, falling back to OCR: %s", exc)
-
-    if detection["pdf_type"] == "text" and len(direct_text) >= _MIN_DIRECT_TEXT_CHARS:
+            direct_text, direct_pages = "", []
+            ocr_indices = sorted(ocr_indices + direct_indices)
+
+    # Pages classified from the font probe alone (text never read during
+    # detection) can still turn out to carry almost no text.
+    thin_indices = [
+        page["page_number"] - 1
+        for page in direct_pages
+        if len(page["text"]) < _MIN_PAGE_TEXT_CHARS
+    ]
+    all_thin = bool(direct_pages) and len(thin_indices) == len(direct_pages)
+    if thin_indices and not all_thin:
+        direct_pages = [page for page in direct_pages if page["page_number"] - 1 not in thin_indices]
+        ocr_indices = sorted(ocr_indices + thin_indices)
+
+    if not ocr_indices and len(direct_text) >= _MIN_DIRECT_TEXT_CHARS:
         return {
             "text": direct_text,
             "pages": direct_pages,
-            "pdf_type": detection["pdf_type"],
+            "pdf_type": "text",
             "engine": "pdfplumber",
             "confidence": 1.0 if direct_text else 0.0,
             "detection": detection,
         }
+    # Too little embedded text overall: OCR the whole document.
+    ocr_all = not ocr_indices or not direct_pages or all_thin
 
     try:
-        logger.info("CALL CHAIN OCR -> _extract_text_ocr")
-        ocr_text, ocr_pages, engine = _extract_text_ocr(data)
+        logger.info(
+            "CALL CHAIN OCR -> _extract_text_ocr pages=%s",
+            "all" if ocr_all else len(ocr_indices),
+        )
+        ocr_text, ocr_pages, engine = _extract_text_ocr(doc.data, page_indices=None if ocr_all else ocr_indices)
     except (TesseractNotFoundError, TesseractError, OSError, RuntimeError) as exc:
         logger.error("OCR unavailable: %s", exc)
         return {
@@ -1262,21 +2415,101 @@ def extract_pdf_content(file_bytes: bytes) -> dict:
             "error": str(exc),
         }
 
-    overall_confidence = 0.0
-    confidences = [page["confidence"] for page in ocr_pages if page.get("confidence") is not None]
-    if confidences:
-        overall_confidence = round(sum(confidences) / len(confidences), 4)
+    if ocr_all:
+        return {
+            "text": ocr_text or direct_text,
+            "pages": ocr_pages if ocr_text else direct_pages,
+            "pdf_type": "scanned" if ocr_text else detection["pdf_type"],
+            "engine": engine if ocr_text else "pdfplumber",
+            "confidence": _average_confidence(ocr_pages) if ocr_text else (1.0 if direct_text else 0.0),
+            "detection": detection,
+        }
 
+    pages = sorted(direct_pages + ocr_pages, key=lambda page: page["page_number"])
+    text = _clean_text("\n\n".join(page["text"] for page in pages if page["text"]))
+    logger.info(
+        "[OCR-HYBRID] direct_pages=%d ocr_pages=%d engine=%s",
+        len(direct_pages),
+        len(ocr_pages),
+        engine,
+    )
     return {
-        "text": ocr_text or direct_text,
-        "pages": ocr_pages if ocr_text else direct_pages,
-        "pdf_type": "scanned" if ocr_text else detection["pdf_type"],
-        "engine": engine if ocr_text else "pdfplumber",
-        "confidence": overall_confidence if ocr_text else (1.0 if direct_text else 0.0),
+        "text": text,
+        "pages": pages,
+        "pdf_type": "mixed",
+        "engine": "hybrid",
+        "confidence": _average_confidence(pages),
         "detection": detection,
     }
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+def iter_pdf_pages(file_bytes: bytes | OpenedPdf) -> Iterator[dict]:
+    """Yield each page's text, confidence, and engine as soon as it is extracted.
+
+    Pages come out in order and are routed like :func:`extract_pdf_content`:
+    pages with a usable text layer are read directly, the rest are rendered
+    and OCR'd one at a time so at most one rendered page is held in memory.
+    Only the page about to be yielded is read by pdfplumber.  Each page is
+    judged on its own; the document-wide "too little text, OCR everything"
+    fallback needs the whole document and does not apply.  A page whose OCR
+    fails is attributed to the OCR engine used so far, as in
+    :func:`extract_pdf_content`.  A cached ``extract_pdf_content`` result for
+    the same bytes is replayed.
+
+    Raises ``ValueError`` for encrypted PDFs.
+    """
+    data = file_bytes.data if isinstance(file_bytes, OpenedPdf) else bytes(file_bytes or b"")
+    logger.info("CALL CHAIN OCR entrypoint=iter_pdf_pages bytes=%d", len(data))
+    if not data:
+        return
+
+    cache = get_result_cache()
+    if cache is not None:
+        cached = cache.get(make_cache_key(data, _ocr_config_fingerprint()))
+        if cached is not None:
+            yield from cached["pages"]
+            return
+
+    doc = file_bytes if isinstance(file_bytes, OpenedPdf) else open_pdf(data)
+    pdf = None
+    try:
+        detection = detect_pdf_type(doc)
+        if detection["pdf_type"] == "encrypted":
+            raise ValueError("PDF is encrypted or password-protected")
+        direct_indices = set(_route_pages(detection)[0])
+        page_count = len(detection.get("pages") or [])
+        batch_id = uuid4().hex[:12]
+        ocr_engine = "pytesseract"
+        for index in range(page_count):
+            page = None
+            if index in direct_indices:
+                try:
+                    page = _extract_text_pdfplumber(doc, [index])[1][0]
+                except Exception as exc:
+                    logger.warning("Direct text extraction of page %d failed, falling back to OCR: %s", index + 1, exc)
+            if page is None or len(page["text"]) < _MIN_PAGE_TEXT_CHARS:
+                try:
+                    if pdf is None:
+                        pdf = pdfium.PdfDocument(BytesIO(data), autoclose=True)
+                    ocr_page = _ocr_pdf_pages(pdf, [index], batch_id)[0]
+                except Exception as exc:
+                    ocr_page = _failed_ocr_page(index, exc)
+                if ocr_page["engine"] == "paddleocr":
+                    ocr_engine = "paddleocr"
+                elif ocr_page["engine"] is None:
+                    ocr_page["engine"] = ocr_engine
+                    ocr_page["confidence"] = 0.0
+                # Keep a thin text layer rather than a failed OCR attempt.
+                if not (ocr_page.get("error") and page is not None and page["text"]):
+                    page = ocr_page
+            yield page
+    finally:
+        if pdf is not None:
+            pdf.close()
+        if doc is not file_bytes:
+            doc.close()
+
+
+def extract_text_from_pdf(file_bytes: bytes | OpenedPdf) -> str:
     logger.info("CALL CHAIN OCR public entrypoint=extract_text_from_pdf")
     return extract_pdf_content(file_bytes).get("text", "")
@@ -0,0 +1,219 @@
+"""Tesseract word recognition and orientation detection.
+
+pytesseract launches a ``tesseract`` process for every call and round-trips
+the page through temporary image files; with an OSD call and a recognition
+call per page that dominates latency in the Tesseract-only deployment.  When
+the optional ``tesserocr`` bindings are installed, pages are instead handled
+by long-lived ``PyTessBaseAPI`` instances, borrowed from an
+:class:`~ocr.engine_pool.OcrEnginePool`, that take in-memory images.
+
+``TESSERACT_BACKEND`` selects ``tesserocr``, ``pytesseract``, or ``auto``
+(tesserocr whenever it can be initialised, otherwise pytesseract).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+import pytesseract
+from PIL import Image
+
+from .engine_pool import OcrEnginePool
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tesserocr
+except ImportError:  # pragma: no cover - depends on runtime package availability
+    tesserocr = None
+
+_BACKEND = os.getenv("TESSERACT_BACKEND", "auto").lower()
+# Number of persistent tesserocr API instances per process.
+_POOL_SIZE = int(os.getenv("TESSERACT_POOL_SIZE", "1"))
+# Seconds to wait for a free instance before spawning pytesseract instead.
+_CHECKOUT_TIMEOUT = float(os.getenv("TESSERACT_CHECKOUT_TIMEOUT", "30"))
+_TESSDATA_PATH = os.getenv("TESSDATA_PREFIX", "")
+_LANG = "eng"
+_PYTESSERACT_CONFIG = "--oem 3 --psm 6"
+
+# ---------------------------------------------------------------------------
+# pytesseract (subprocess) setup
+# ---------------------------------------------------------------------------
+_TESSERACT_INITIALIZED = False
+_TESSERACT_LOCK = threading.Lock()
+
+
+def _initialize_tesseract() -> None:
+    """Thread-safe, lazy initialization for pytesseract."""
+    global _TESSERACT_INITIALIZED
+    if _TESSERACT_INITIALIZED:
+        return
+    with _TESSERACT_LOCK:
+        if _TESSERACT_INITIALIZED:
+            return
+        try:
+            import platform
+            if platform.system() == "Windows":
+                _tesseract_cmd = os.getenv("TESSERACT_CMD", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+                pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
+            else:
+                _tesseract_cmd = os.getenv("TESSERACT_CMD")
+                if _tesseract_cmd:
+                    pytesseract.pytesseract.tesseract_cmd = _tesseract_cmd
+
+            _tess_version = pytesseract.get_tesseract_version()
+            logger.info("[TESSERACT] initialized successfully")
+            logger.info("[TESSERACT] version=%s, path=%s", _tess_version, pytesseract.pytesseract.tesseract_cmd)
+        except Exception as exc:
+            logger.warning("[TESSERACT] initialization check failed: %s. Pytesseract will run with default binary.", exc)
+        _TESSERACT_INITIALIZED = True
+
+
+# ---------------------------------------------------------------------------
+# tesserocr (in-process) engine
+# ---------------------------------------------------------------------------
+class TesserocrEngine:
+    """A recognition API plus a lazily-created OSD API, reused across pages.
+
+    Not thread-safe; the engine pool hands each instance to one caller at a
+    time.
+    """
+
+    def __init__(self):
+        self._init_kwargs = {"lang": _LANG, "oem": tesserocr.OEM.DEFAULT}
+        if _TESSDATA_PATH:
+            self._init_kwargs["path"] = _TESSDATA_PATH
+        self._api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK, **self._init_kwargs)
+        self._osd_api = None
+
+    def image_to_data(self, image: Image.Image) -> dict:
+        """Word text, confidence (0-100), and boxes in pytesseract's DICT layout."""
+        data: dict[str, list] = {"text": [], "conf": [], "left": [], "top": [], "width": [], "height": []}
+        level = tesserocr.RIL.WORD
+        try:
+            self._api.SetImage(image)
+            self._api.Recognize()
+            iterator = self._api.GetIterator()
+            if iterator is None:
+                return data
+            for word in tesserocr.iterate_level(iterator, level):
+                text = word.GetUTF8Text(level)
+                box = word.BoundingBox(level)
+                if not text or box is None:
+                    continue
+                left, top, right, bottom = box
+                data["text"].append(text)
+                data["conf"].append(word.Confidence(level))
+                data["left"].append(left)
+                data["top"].append(top)
+                data["width"].append(right - left)
+                data["height"].append(bottom - top)
+        finally:
+            self._api.Clear()
+        return data
+
+    def detect_orientation(self, image: Image.Image) -> dict | None:
+        if self._osd_api is None:
+            self._osd_api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.OSD_ONLY, **self._init_kwargs)
+        try:
+            self._osd_api.SetImage(image)
+            osd = self._osd_api.DetectOrientationScript()
+        finally:
+            self._osd_api.Clear()
+        if not osd:
+            return None
+        # orient_deg is how far the content is rotated clockwise; Tesseract's
+        # "Rotate" value is the clockwise correction that undoes it.
+        return {
+            "rotate": (360 - int(osd["orient_deg"])) % 360,
+            "orientation_conf": float(osd["orient_conf"]),
+            "script": osd.get("script_name"),
+            "script_conf": float(osd.get("script_conf") or 0.0),
+        }
+
+    def close(self) -> None:
+        self._api.End()
+        if self._osd_api is not None:
+            self._osd_api.End()
+
+
+def _create_tesserocr_engine() -> TesserocrEngine | None:
+    if _BACKEND == "pytesseract":
+        return None
+    if tesserocr is None:
+        if _BACKEND == "tesserocr":
+            logger.error("[TESSERACT] TESSERACT_BACKEND=tesserocr but tesserocr is not installed; using pytesseract")
+        return None
+    try:
+        engine = TesserocrEngine()
+    except RuntimeError as exc:
+        # Usually a missing tessdata directory; see TESSDATA_PREFIX.
+        logger.warning("[TESSERACT] tesserocr could not be initialised (%s); using pytesseract", exc)
+        return None
+    logger.info("[TESSERACT] persistent tesserocr engine ready (tesseract %s)", tesserocr.tesseract_version().split()[1])
+    return engine
+
+
+_ENGINE_POOL = OcrEnginePool(_create_tesserocr_engine, size=_POOL_SIZE, name="tesseract")
+os.register_at_fork(after_in_child=_ENGINE_POOL.reinit_after_fork)
+
+
+def get_engine_pool() -> OcrEnginePool:
+    return _ENGINE_POOL
+
+
+def backend_name() -> str:
+    """The backend that serves calls in this process (for cache fingerprints)."""
+    if _BACKEND == "pytesseract" or tesserocr is None or _ENGINE_POOL.state == "unavailable":
+        return "pytesseract"
+    return "tesserocr"
+
+
+# ---------------------------------------------------------------------------
+# Public calls
+# ---------------------------------------------------------------------------
+def image_to_data(image: Image.Image) -> dict:
+    """Recognise *image* as a single text block (``--psm 6``).
+
+    Returns pytesseract's ``Output.DICT`` layout; ``conf`` values are 0-100
+    with negative values for non-word entries.
+    """
+    with _ENGINE_POOL.checkout(timeout=_CHECKOUT_TIMEOUT) as engine:
+        if engine is not None:
+            try:
+                return engine.image_to_data(image)
+            except Exception as exc:
+                logger.warning("[TESSERACT] tesserocr recognition failed (%s); retrying with pytesseract", exc)
+    _initialize_tesseract()
+    return pytesseract.image_to_data(
+        image,
+        config=_PYTESSERACT_CONFIG,
+        output_type=pytesseract.Output.DICT,
+    )
+
+
+def detect_orientation(image: Image.Image) -> dict | None:
+    """Orientation and script detection (OSD).
+
+    Returns a dict with ``rotate`` (clockwise degrees that make the page
+    upright), ``orientation_conf``, ``script``, and ``script_conf``, or None
+    when Tesseract could not decide.  pytesseract errors propagate.
+    """
+    with _ENGINE_POOL.checkout(timeout=_CHECKOUT_TIMEOUT) as engine:
+        if engine is not None:
+            try:
+                return engine.detect_orientation(image)
+            except Exception as exc:
+                logger.warning("[TESSERACT] tesserocr OSD failed (%s); retrying with pytesseract", exc)
+    _initialize_tesseract()
+    osd = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+    if not osd:
+        return None
+    return {
+        "rotate": int(osd.get("rotate", 0)),
+        "orientation_conf": float(osd.get("orientation_conf", 0.0)),
+        "script": osd.get("script"),
+        "script_conf": float(osd.get("script_conf", 0.0)),
+    }
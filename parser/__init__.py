@@ -1,4 +1,10 @@
-from .line_items import build_structured_document, extract_line_items, extract_line_items_with_diagnostics, extract_totals
+from .line_items import (
+    LineItemStream,
+    build_structured_document,
+    extract_line_items,
+    extract_line_items_with_diagnostics,
+    extract_totals,
+)
 from .normalize import (
     normalize_currency_value,
     normalize_item_name,
@@ -6,8 +12,10 @@ from .normalize import (
     normalize_percentage,
     normalize_quantity,
 )
+from .row_trace import row_trace
 
 __all__ = [
+    "LineItemStream",
     "build_structured_document",
     "extract_line_items",
     "extract_line_items_with_diagnostics",
@@ -17,4 +25,5 @@ __all__ = [
     "normalize_ocr_text",
     "normalize_percentage",
     "normalize_quantity",
+    "row_trace",
 ]
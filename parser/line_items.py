@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import re
+from typing import Iterable
 
 from .normalize import (
     is_ocr_item_label_token,
@@ -14,6 +15,8 @@ from .normalize import (
     normalize_quantity,
     strip_ocr_field_labels,
 )
+from .row_trace import row_trace_predicate
+from .table_header import _HEADER_CANDIDATE_ROWS, detect_header_columns, header_columns
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,7 @@ _SKIP_LINE_PATTERN = re.compile(
 _DOCUMENT_TOTAL_PATTERN = re.compile(
     r"(?i)\b(?:grand total|total amount|invoice total|net amount|subtotal)\b\s*[:=\-]?\s*((?:rs\.?\s*)?[0-9][0-9, .]*)"
 )
+_ITEMS_MARKER_PATTERN = re.compile(r"(?i)\bitems?\s*:")
 _ROW_START_PATTERN = re.compile(r"(?i)^\s*(?:[-*]|(?:\d+\s*[.)-]))\s*")
 _KEYWORD_PATTERN = re.compile(r"(?i)\b(?:qty|quantity|qnty|price|rate|amount|tax|gst|vat|total)\b")
 _NUMBER_PATTERN = re.compile(r"(?<![A-Za-z])(?:rs\.?\s*)?[0-9oilszgb]+(?:[.,][0-9oilszgb]+)?\s*%?", re.IGNORECASE)
@@ -67,7 +71,7 @@ def _clean_ocr_text(text: str) -> str:
     # cleaned = re.sub(r"([A-Za-z])([0-9])", r"\1 \2", cleaned)
     # cleaned = re.sub(r"([0-9])([A-Za-z])", r"\1 \2", cleaned)
     cleaned = re.sub(r"(?<!\n)(\b\d+\.\s+[A-Za-z])", r"\n\1", cleaned)
-    cleaned = re.sub(r"(?<!\n)(\b(?:total|grand total|total amount)\b\s*:)", r"\n\1", cleaned, flags=re.I)
+    cleaned = re.sub(r"(?<!\n)(?<!grand )(\b(?:grand total|total amount|total)\b\s*:)", r"\n\1", cleaned, flags=re.I)
     cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
     return cleaned.strip()
 
@@ -133,9 +137,12 @@ def _is_candidate_line(line: str) -> bool:
 
 def _split_candidate_lines(text: str) -> list[dict]:
     cleaned_text = _clean_ocr_text(text)
-    if re.search(r"(?i)\bitems?\s*:", cleaned_text):
-        cleaned_text = re.split(r"(?i)\bitems?\s*:", cleaned_text, maxsplit=1)[1]
+    if _ITEMS_MARKER_PATTERN.search(cleaned_text):
+        cleaned_text = _ITEMS_MARKER_PATTERN.split(cleaned_text, maxsplit=1)[1]
+    return _candidate_lines_from_cleaned_text(cleaned_text)
 
+
+def _candidate_lines_from_cleaned_text(cleaned_text: str) -> list[dict]:
     raw_lines = []
     for line in cleaned_text.split("\n"):
         line = line.strip()
@@ -168,14 +175,13 @@ def _split_candidate_lines(text: str) -> list[dict]:
     return candidates
 
 
-def _extract_item_name(line: str) -> str:
-    tokens = re.findall(r"\S+", line)
+def _item_name_from_words(line: str, words: list[tuple[str, str]]) -> str:
     head_tokens: list[str] = []
     started = False
-    for token in tokens:
-        if is_ocr_item_label_token(token) and not started:
+    for token, kind in words:
+        if kind == "item_label" and not started:
             continue
-        if is_ocr_stop_label_token(token):
+        if kind in ("item_label", "label"):
             if started:
                 break
             continue
@@ -195,8 +201,8 @@ def _extract_field(pattern_name: str, line: str):
     return match.group(1)
 
 
-def _extract_columnar_values(line: str, header_indices: dict = None) -> tuple[dict, float, str] | None:
-    parts = [part.strip() for part in line.split("|")]
+def _extract_columnar_values(row: "_RowTokens", header_indices: dict = None) -> tuple[dict, float, str] | None:
+    parts = row.cells
     
     # If dynamic header mapping is available and valid, map fields explicitly by column index
     if header_indices and len(parts) >= max(header_indices.values()) + 1:
@@ -218,7 +224,7 @@ def _extract_columnar_values(line: str, header_indices: dict = None) -> tuple[di
                 
                 usable_fields = [key for key in ("qty", "price", "total") if parsed.get(key) is not None]
                 if usable_fields:
-                    parsed = _finalize_numeric_inference(line, parsed, PARSER_PATH_A, "_extract_columnar_values")
+                    parsed = _finalize_numeric_inference(row, parsed, PARSER_PATH_A, "_extract_columnar_values")
                     if parsed:
                         return parsed, 0.98, "columnar"
 
@@ -271,16 +277,17 @@ def _extract_columnar_values(line: str, header_indices: dict = None) -> tuple[di
             parsed["total"] = normalize_currency_value(values[2])
     if len(values) >= 4:
         parsed["total"] = normalize_currency_value(values[3])
-    parsed = _finalize_numeric_inference(line, parsed, PARSER_PATH_A, "_extract_columnar_values")
+    parsed = _finalize_numeric_inference(row, parsed, PARSER_PATH_A, "_extract_columnar_values")
     if not parsed:
         return None
     return parsed, 0.95, "columnar"
 
 
-def _extract_labeled_values(line: str) -> tuple[dict, float, str] | None:
-    item = _extract_item_name(line)
+def _extract_labeled_values(row: "_RowTokens") -> tuple[dict, float, str] | None:
+    item = row.item_name
     if not item:
         return None
+    line = row.line
 
     parsed = {
         "item": item,
@@ -292,7 +299,7 @@ def _extract_labeled_values(line: str) -> tuple[dict, float, str] | None:
     usable_fields = [key for key in ("qty", "price", "tax", "total") if parsed.get(key) is not None]
     if not usable_fields:
         return None
-    parsed = _finalize_numeric_inference(line, parsed, PARSER_PATH_B, "_extract_labeled_values")
+    parsed = _finalize_numeric_inference(row, parsed, PARSER_PATH_B, "_extract_labeled_values")
     if not parsed:
         return None
     return parsed, 0.9 if len(usable_fields) >= 2 else 0.78, "labeled"
@@ -308,13 +315,21 @@ def _numeric_matches(line: str) -> list[dict]:
         left_context = line[max(0, match.start() - 16):match.start()].lower()
         right_context = line[match.end():match.end() + 16].lower()
         segment = f"{left_context}{token.lower()}{right_context}"
+        is_percent = "%" in token or any(label in segment for label in ("tax", "gst", "vat"))
+        if is_percent:
+            kind = "percent"
+        elif token[:2].lower() == "rs":
+            kind = "currency"
+        else:
+            kind = "numeric"
         matches.append(
             {
                 "text": token,
+                "kind": kind,
                 "value": value,
                 "start": match.start(),
                 "end": match.end(),
-                "is_percent": "%" in token or any(label in segment for label in ("tax", "gst", "vat")),
+                "is_percent": is_percent,
                 "segment": segment,
                 "left_context": left_context,
                 "right_context": right_context,
@@ -323,6 +338,75 @@ def _numeric_matches(line: str) -> list[dict]:
     return matches
 
 
+class _RowTokens:
+    """A candidate row tokenized once for every row extractor.
+
+    ``numbers`` are the row's numeric tokens (kind ``numeric``, ``percent``
+    or ``currency``) with their parsed values; ``words`` pairs each
+    whitespace token with its kind (``pipe``, ``item_label``, ``label`` or
+    ``word``).  Derived values that several extractors and the failure
+    classification need are computed on first use and then reused.
+    """
+
+    __slots__ = ("line", "_numbers", "_words", "_cells", "_item_name", "_numeric_item_name")
+
+    def __init__(self, line: str):
+        self.line = line
+        self._numbers: list[dict] | None = None
+        self._words: list[tuple[str, str]] | None = None
+        self._cells: list[str] | None = None
+        self._item_name: str | None = None
+        self._numeric_item_name: str | None = None
+
+    @property
+    def numbers(self) -> list[dict]:
+        if self._numbers is None:
+            self._numbers = _numeric_matches(self.line)
+        return self._numbers
+
+    @property
+    def words(self) -> list[tuple[str, str]]:
+        if self._words is None:
+            words = []
+            for token in self.line.split():
+                if token == "|":
+                    kind = "pipe"
+                elif is_ocr_item_label_token(token):
+                    kind = "item_label"
+                elif is_ocr_stop_label_token(token):
+                    kind = "label"
+                else:
+                    kind = "word"
+                words.append((token, kind))
+            self._words = words
+        return self._words
+
+    @property
+    def cells(self) -> list[str]:
+        """The row split on ``|`` (a single cell when it has no pipes)."""
+        if self._cells is None:
+            self._cells = [part.strip() for part in self.line.split("|")]
+        return self._cells
+
+    @property
+    def item_name(self) -> str:
+        """Item name read from the words before the first field label."""
+        if self._item_name is None:
+            self._item_name = _item_name_from_words(self.line, self.words)
+        return self._item_name
+
+    @property
+    def non_percent_numbers(self) -> list[dict]:
+        return [entry for entry in self.numbers if not entry["is_percent"]]
+
+    @property
+    def numeric_item_name(self) -> str:
+        """Item name left after removing the row's non-percent numbers."""
+        if self._numeric_item_name is None:
+            self._numeric_item_name = _clean_item_name_from_numeric_tokens(self.line, self.non_percent_numbers)
+        return self._numeric_item_name
+
+
 def _log_numeric_assignment(line: str, values: list[dict], qty: object, price: object, item: str) -> None:
     logger.info(
         "Numeric inference line=%r detected numeric tokens=%s assigned qty=%r assigned price=%r final cleaned item name=%r",
@@ -492,13 +576,14 @@ def _apply_mathematical_consistency(parsed: dict) -> dict:
     return parsed
 
 
-def _finalize_numeric_inference(line: str, parsed: dict, parser_path: str, parser_function: str) -> dict | None:
-    values = _numeric_matches(line)
-    non_percent_values = [entry for entry in values if not entry["is_percent"]]
+def _finalize_numeric_inference(row: _RowTokens, parsed: dict, parser_path: str, parser_function: str) -> dict | None:
+    line = row.line
+    values = row.numbers
+    non_percent_values = row.non_percent_numbers
     if not non_percent_values and not parsed.get("item"):
         return None
 
-    item = _clean_item_name_from_numeric_tokens(line, non_percent_values) or normalize_item_name(parsed.get("item"))
+    item = row.numeric_item_name or normalize_item_name(parsed.get("item"))
     qty, price, tax, total = _choose_qty_price_tax_total(values, line)
     finalized = {"item": item, "qty": qty, "price": price, "tax": tax}
     if total is not None:
@@ -541,13 +626,14 @@ def _clean_item_name_from_numeric_tokens(line: str, values: list[dict]) -> str:
     return normalize_item_name(strip_ocr_field_labels(cleaned_line))
 
 
-def _extract_trailing_numeric_values(line: str) -> tuple[dict, float, str] | None:
-    values = _numeric_matches(line)
+def _extract_trailing_numeric_values(row: _RowTokens) -> tuple[dict, float, str] | None:
+    line = row.line
+    values = row.numbers
     if len(values) < 2:
         return None
 
-    non_percent_values = [entry for entry in values if not entry["is_percent"]]
-    item = _clean_item_name_from_numeric_tokens(line, non_percent_values)
+    non_percent_values = row.non_percent_numbers
+    item = row.numeric_item_name
     if not item:
         pivot = non_percent_values[-2]["start"] if len(non_percent_values) >= 2 else values[0]["start"]
         item = normalize_item_name(strip_ocr_field_labels(re.sub(_NUMBER_PATTERN, " ", line)))
@@ -560,7 +646,7 @@ def _extract_trailing_numeric_values(line: str) -> tuple[dict, float, str] | Non
     parsed = {"item": item, "qty": qty, "price": price, "tax": tax}
     if total is not None:
         parsed["total"] = total
-    parsed = _finalize_numeric_inference(line, parsed, PARSER_PATH_C, "_extract_trailing_numeric_values")
+    parsed = _finalize_numeric_inference(row, parsed, PARSER_PATH_C, "_extract_trailing_numeric_values")
     if not parsed:
         return None
 
@@ -621,12 +707,15 @@ _ACTIVE_ROW_EXTRACTORS = (
 )
 
 
-def _parse_candidate_line(line: str, confidence: float | None = None, header_indices: dict = None) -> dict | None:
+def _parse_candidate_line(
+    line: str | _RowTokens, confidence: float | None = None, header_indices: dict = None
+) -> dict | None:
+    row = line if isinstance(line, _RowTokens) else _RowTokens(line)
     for extractor in _ACTIVE_ROW_EXTRACTORS:
         if extractor == _extract_columnar_values:
-            extracted = extractor(line, header_indices=header_indices)
+            extracted = extractor(row, header_indices=header_indices)
         else:
-            extracted = extractor(line)
+            extracted = extractor(row)
         if not extracted:
             continue
         parsed, base_confidence, strategy = extracted
@@ -645,20 +734,22 @@ def _parse_candidate_line(line: str, confidence: float | None = None, header_ind
     return None
 
 
-def _classify_failed_row(cleaned_line: str) -> str:
+def _classify_failed_row(cleaned_line: str | _RowTokens) -> str:
+    row = cleaned_line if isinstance(cleaned_line, _RowTokens) else _RowTokens(cleaned_line)
+    cleaned_line = row.line
     if not cleaned_line.strip():
         return "no rows found"
 
-    if not _extract_item_name(cleaned_line):
+    if not row.item_name:
         return "regex mismatch"
 
-    numeric_values = _numeric_matches(cleaned_line)
+    numeric_values = row.numbers
     if len(numeric_values) < 2 and not _KEYWORD_PATTERN.search(cleaned_line) and "|" not in cleaned_line:
         return "regex mismatch"
 
     parsed_with_missing_values = False
     for extractor in _ACTIVE_ROW_EXTRACTORS:
-        extracted = extractor(cleaned_line)
+        extracted = extractor(row)
         if not extracted:
             continue
         parsed, _, _ = extracted
@@ -677,7 +768,8 @@ def _classify_failed_row(cleaned_line: str) -> str:
     return "regex mismatch"
 
 
-def extract_line_items_with_diagnostics(text: str, confidence: float | None = None) -> dict:
+def _unparseable_text_result(text: str) -> dict | None:
+    """Diagnostics for text that cannot hold line items (empty or coordinate arrays)."""
     if not text or not text.strip():
         trace = {
             "raw_ocr_text": str(text or ""),
@@ -718,104 +810,214 @@ def extract_line_items_with_diagnostics(text: str, confidence: float | None = No
             "failure_reason": "coordinate_payload_detected",
             "trace": trace,
         }
+    return None
 
-    items: list[dict] = []
-    seen: set[tuple] = set()
-    skipped_rows: list[dict] = []
-    normalized_text = _clean_ocr_text(text)
-    candidate_lines = _split_candidate_lines(text)
-    
-    # Task: Print [TRACE_MONITOR_SOURCE] for rows containing monitor
-    for idx, entry in enumerate(candidate_lines):
-        raw_line = entry["raw"]
-        cleaned_line = entry["cleaned"]
-        if "monitor" in raw_line.lower():
-            # Get numeric matches
-            tokens = _numeric_matches(cleaned_line)
-            # Parse it to get selected qty, price, total
-            parsed = _parse_candidate_line(cleaned_line, confidence=confidence, header_indices={})
-            selected_qty = parsed.get("qty") if parsed else None
-            selected_price = parsed.get("price") if parsed else None
-            selected_total = parsed.get("total") if parsed else None
-            
-            print("[TRACE_MONITOR_SOURCE]", flush=True)
-            print(f"raw_candidate_row={raw_line}", flush=True)
-            print(f"numeric_tokens={tokens}", flush=True)
-            print(f"selected_qty={selected_qty}", flush=True)
-            print(f"selected_price={selected_price}", flush=True)
-            print(f"selected_total={selected_total}", flush=True)
-            
-            # Show 3 rows before and after in candidate list
-            before_rows = [c["raw"] for c in candidate_lines[max(0, idx-3):idx]]
-            after_rows = [c["raw"] for c in candidate_lines[idx+1:idx+4]]
-            print("Surrounding rows before:", before_rows, flush=True)
-            print("Surrounding rows after:", after_rows, flush=True)
-            
-            # Show 3 rows before and after in raw OCR text split
-            ocr_lines = [line.strip() for line in normalized_text.split("\n") if line.strip()]
-            ocr_idx = -1
-            for o_idx, o_line in enumerate(ocr_lines):
-                if raw_line in o_line or o_line in raw_line:
-                    ocr_idx = o_idx
-                    break
-            if ocr_idx != -1:
-                ocr_before = ocr_lines[max(0, ocr_idx-3):ocr_idx]
-                ocr_after = ocr_lines[ocr_idx+1:ocr_idx+4]
-                print("Surrounding raw OCR rows before:", ocr_before, flush=True)
-                print("Surrounding raw OCR rows after:", ocr_after, flush=True)
-
-    trace = {
-        "raw_ocr_text": text,
-        "normalized_ocr_text": normalized_text,
-        "candidate_rows": [entry["raw"] for entry in candidate_lines],
-        "cleaned_rows": [entry["cleaned"] for entry in candidate_lines],
-        "parsed_line_items": [],
-        "skipped_rows": skipped_rows,
+
+def _detect_header_indices(text: str) -> dict:
+    """Column positions from the first pipe-delimited header row of *text* (``{}`` if none)."""
+    header_indices = detect_header_columns(text)
+    if header_indices:
+        logger.info("[HEADER-ALIGN] Dynamic column header mapping: %s", header_indices)
+    return header_indices
+
+
+def _parse_table_row(cells: list[str], columns: dict, confidence: float | None = None) -> dict | None:
+    """Line item from one table row whose cells are mapped by header *columns*.
+
+    Cells are typed by their column, so no field is re-inferred from the
+    joined row text as :func:`_extract_columnar_values` does.
+    """
+    def cell(field: str) -> str:
+        index = columns.get(field)
+        return cells[index] if index is not None and index < len(cells) else ""
+
+    item = normalize_item_name(strip_ocr_field_labels(cell("item")))
+    if not item:
+        return None
+    if _is_tax_or_subtotal_line(item) or _is_tax_or_subtotal_line(cell("item")):
+        logger.info("[FILTER-TAX] Excluded tax/subtotal table row from items: %r", item)
+        return None
+
+    tax = normalize_percentage(cell("gst")) if "%" in cell("gst") else None
+    parsed = {
+        "item": item,
+        "qty": normalize_quantity(cell("qty")),
+        "price": normalize_currency_value(cell("price")),
+        "tax": tax if tax is not None and tax <= 100 else None,
     }
+    total = normalize_currency_value(cell("total"))
+    if total is not None:
+        parsed["total"] = total
+    if all(parsed.get(key) is None for key in ("qty", "price", "total")):
+        return None
 
-    logger.info("Parser raw OCR text (%d chars): %s", len(text), text)
-    logger.info("Parser normalized OCR text (%d chars): %s", len(normalized_text), normalized_text)
-    logger.info("Parser split candidate rows (%d): %s", len(trace["candidate_rows"]), trace["candidate_rows"])
-    logger.info("Parser cleaned rows (%d): %s", len(trace["cleaned_rows"]), trace["cleaned_rows"])
-    logger.info(
-        "Parser entrypoint=extract_line_items_with_diagnostics active_paths=%s legacy_disabled=%s",
-        ["_extract_columnar_values", "_extract_labeled_values", "_extract_trailing_numeric_values"],
-        ["_extract_token_fallback"],
-    )
+    parsed = _apply_mathematical_consistency(parsed)
+    parsed["confidence"] = 0.98 if confidence is None else round((0.98 + confidence) / 2, 4)
+    parsed["parse_strategy"] = "table"
+    return parsed
 
-    # Dynamic table header detection and column alignment mapping
-    header_indices = {}
-    for line in text.split("\n"):
-        if "|" in line:
-            parts = [p.strip().lower() for p in line.split("|")]
-            if any(h in parts for h in ("item", "description", "particulars", "qty", "quantity", "price", "rate", "total", "amount", "hsn", "sac")):
-                for idx, part in enumerate(parts):
-                    if not part:
-                        continue
-                    if any(k in part for k in ("item", "description", "desc", "particulars")):
-                        header_indices["item"] = idx
-                    elif any(k in part for k in ("qty", "quantity", "qnty")):
-                        header_indices["qty"] = idx
-                    elif any(k in part for k in ("price", "rate", "unit price")):
-                        if "total" not in part and "taxable" not in part:
-                            header_indices["price"] = idx
-                    elif "total" in part or "amount" in part:
-                        if "taxable" not in part:
-                            header_indices["total"] = idx
-                    elif "hsn" in part or "sac" in part:
-                        header_indices["hsn"] = idx
-                    elif "taxable" in part:
-                        header_indices["taxable"] = idx
-                    elif any(k in part for k in ("cgst", "sgst", "igst", "utgst", "gst")):
-                        header_indices["gst"] = idx
-                logger.info("[HEADER-ALIGN] Dynamic column header mapping: %s", header_indices)
-                break
 
-    for entry in candidate_lines:
+# Rows at the top of a structured table searched for its header row; a
+# header-like row deeper in a table is data, not a new header.
+_TABLE_HEADER_SEARCH_ROWS = _HEADER_CANDIDATE_ROWS
+_NUMERIC_COLUMNS = ("qty", "price", "total")
+
+
+def _table_cells(table: dict) -> list[list[str]]:
+    """Rows of a structured table with each cell's whitespace collapsed."""
+    return [[" ".join(str(cell or "").split()) for cell in row] for row in table.get("rows") or ()]
+
+
+def _table_row_text(cells: list[str]) -> str:
+    return " | ".join(cell for cell in cells if cell)
+
+
+def _has_number(cell: str) -> bool:
+    return any(normalize_currency_value(token) is not None for token in cell.split())
+
+
+def _rows_fit_columns(rows: list[list[str]], columns: dict) -> bool:
+    """Whether most *rows* hold text under the item column and numbers under the numeric columns."""
+    item = columns.get("item")
+    numeric = [columns[field] for field in _NUMERIC_COLUMNS if field in columns]
+    fitting = 0
+    for cells in rows:
+        item_cell = cells[item] if item is not None and item < len(cells) else ""
+        values = [cells[index] for index in numeric if index < len(cells) and cells[index]]
+        if (
+            item_cell
+            and normalize_currency_value(item_cell) is None
+            and values
+            and all(map(_has_number, values))
+        ):
+            fitting += 1
+    return 2 * fitting > len(rows)
+
+
+class LineItemStream:
+    """Incremental line-item parser fed one page of text at a time.
+
+    Each page's rows are parsed as soon as :meth:`add_page` receives it, so a
+    caller streaming pages out of OCR overlaps parsing with recognition of
+    later pages.  Page boundaries are row boundaries, exactly as the blank
+    line between pages makes them in the joined document text.  Document-wide
+    rules still hold: rows before the first ``Items:`` marker are dropped and
+    a table header found on a later page re-parses the rows seen so far.
+    :meth:`finish` returns the :func:`extract_line_items_with_diagnostics`
+    result for the joined text.
+    """
+
+    def __init__(self, confidence: float | None = None):
+        self.confidence = confidence
+        self._page_texts: list[str] = []
+        self._candidates: list[dict] = []
+        self._header_indices: dict = {}
+        # Column count and column map of the table that ended the previous
+        # page, when its columns are known; a table opening the next page
+        # may continue it.
+        self._open_table: tuple[int, dict] | None = None
+        self._items_marker_seen = False
+        self._reset_rows()
+
+    @property
+    def text(self) -> str:
+        """The pages received so far, joined by blank lines."""
+        return "\n\n".join(self._page_texts)
+
+    def _reset_rows(self) -> None:
+        self._items: list[dict] = []
+        self._seen: set[tuple] = set()
+        self._skipped_rows: list[dict] = []
+
+    def add_page(self, text: str, tables: list[dict] | None = None) -> None:
+        """Parse one page.
+
+        *tables*, as :func:`ocr.iter_pdf_pages` yields them in structured
+        table mode, hold rows of cells in column position; *text* is then the
+        page text outside those tables.  Rows of a table with a header row are
+        parsed from their cells by column; other table rows are parsed like
+        text rows.
+        """
+        text = str(text or "")
+        tables = [_table_cells(table) for table in tables or ()]
+        page_lines = [text] if text else []
+        page_lines.extend(line for rows in tables for line in map(_table_row_text, rows) if line)
+        if not page_lines:
+            return
+        self._page_texts.append("\n".join(page_lines))
+        open_table, self._open_table = self._open_table, None
+        table_entries = []
+        for position, rows in enumerate(tables):
+            table_entries.extend(self._table_entries(rows, open_table if position == 0 else None))
+
+        cleaned_text = _clean_ocr_text(text)
+        if not self._items_marker_seen and _ITEMS_MARKER_PATTERN.search(cleaned_text):
+            # Everything before the first "Items:" marker is document header.
+            self._items_marker_seen = True
+            cleaned_text = _ITEMS_MARKER_PATTERN.split(cleaned_text, maxsplit=1)[1]
+            self._candidates = []
+            self._reset_rows()
+        page_candidates = _candidate_lines_from_cleaned_text(cleaned_text) + table_entries
+        self._candidates.extend(page_candidates)
+
+        if not self._header_indices:
+            self._header_indices = _detect_header_indices(text)
+            if self._header_indices and len(self._candidates) > len(page_candidates):
+                # Earlier pages were parsed without the column layout.
+                self._reset_rows()
+                page_candidates = self._candidates
+        self._parse_rows(page_candidates)
+
+    def _table_entries(self, rows: list[list[str]], open_table: tuple[int, dict] | None = None) -> list[dict]:
+        """Candidate rows of one table; rows up to its header row are not items.
+
+        *open_table* is the layout of the table that ended the previous page,
+        passed for the first table of a page.  Without a header row of its
+        own, the table continues that one (a multi-page table) and is mapped
+        by its columns if it has as many columns and its rows hold text and
+        numbers where those columns expect them; an unrelated table of the
+        same width (tax summary, bank details) does not.
+        """
+        for position, cells in enumerate(rows[:_TABLE_HEADER_SEARCH_ROWS]):
+            columns = header_columns(cells, candidate=True)
+            if columns and "item" in columns:
+                logger.info("[HEADER-ALIGN] Table column header mapping: %s", columns)
+                width = len(cells)
+                rows = rows[position + 1:]
+                break
+        else:
+            columns = None
+            if open_table is not None and rows and len(rows[0]) == open_table[0]:
+                width, columns = open_table
+                if not _rows_fit_columns(rows, columns):
+                    columns = None
+        self._open_table = (width, columns) if columns else None
+        entries = []
+        for cells in rows:
+            line = _table_row_text(cells)
+            if line:
+                entries.append({"raw": line, "cleaned": line, "cells": cells, "columns": columns})
+        return entries
+
+    def _parse_rows(self, candidate_lines: list[dict]) -> None:
+        predicate = row_trace_predicate()
+        # The rows being parsed are always the tail of self._candidates.
+        offset = len(self._candidates) - len(candidate_lines)
+        for position, entry in enumerate(candidate_lines, start=offset):
+            row = _RowTokens(entry["cleaned"])
+            parsed, outcome = self._parse_row(entry, row)
+            if predicate is not None and predicate(entry["raw"]):
+                self._trace_row(position, row, parsed, outcome)
+
+    def _parse_row(self, entry: dict, row: _RowTokens) -> tuple[dict | None, str]:
+        """Parse one candidate row into the stream; returns the item and ``"parsed"`` or the skip reason."""
         raw_line = entry["raw"]
         cleaned_line = entry["cleaned"]
-        parsed = _parse_candidate_line(cleaned_line, confidence=confidence, header_indices=header_indices)
-        extracted_item_name = parsed.get("item") if parsed else _extract_item_name(cleaned_line)
+        if entry.get("columns"):
+            parsed = _parse_table_row(entry["cells"], entry["columns"], confidence=self.confidence)
+        else:
+            parsed = _parse_candidate_line(row, confidence=self.confidence, header_indices=self._header_indices)
+        extracted_item_name = parsed.get("item") if parsed else row.item_name
         logger.info(
             "Parser item extraction raw_row=%r cleaned_row=%r extracted_item_name=%r",
             raw_line,
@@ -829,10 +1031,10 @@ def extract_line_items_with_diagnostics(text: str, confidence: float | None = No
                     raw_line,
                     cleaned_line,
                 )
-            skip_reason = _classify_failed_row(cleaned_line)
-            skipped_rows.append({"raw": raw_line, "cleaned": cleaned_line, "reason": skip_reason})
+            skip_reason = _classify_failed_row(row)
+            self._skipped_rows.append({"raw": raw_line, "cleaned": cleaned_line, "reason": skip_reason})
             logger.info("Parser skipped row: %s", {"raw": raw_line, "cleaned": cleaned_line, "reason": skip_reason})
-            continue
+            return parsed, skip_reason
 
         key = (
             parsed.get("item"),
@@ -841,60 +1043,117 @@ def extract_line_items_with_diagnostics(text: str, confidence: float | None = No
             parsed.get("tax"),
             parsed.get("total"),
         )
-        if key in seen:
-            skipped_rows.append({"raw": raw_line, "cleaned": cleaned_line, "reason": "duplicate_row"})
+        if key in self._seen:
+            self._skipped_rows.append({"raw": raw_line, "cleaned": cleaned_line, "reason": "duplicate_row"})
             logger.info("Parser skipped row: %s", {"raw": raw_line, "cleaned": cleaned_line, "reason": "duplicate_row"})
-            continue
+            return parsed, "duplicate_row"
 
-        seen.add(key)
-        items.append(parsed)
-        trace["parsed_line_items"].append(parsed)
+        self._seen.add(key)
+        self._items.append(parsed)
         logger.info("Parser parsed row: %s", {"raw": raw_line, "cleaned": cleaned_line, "parsed": parsed})
+        return parsed, "parsed"
 
-    confidence_values = [item.get("confidence") for item in items if item.get("confidence") is not None]
-    base_score = sum(confidence_values) / len(confidence_values) if confidence_values else 0.0
-    coverage = len(items) / len(candidate_lines) if candidate_lines else 0.0
-    parser_confidence_score = round((base_score * 0.7) + (coverage * 0.3), 4) if items else 0.0
-    if not candidate_lines:
-        failure_reason = "no rows found"
-    elif not items and skipped_rows:
-        distinct_skip_reasons = {row.get("reason") for row in skipped_rows}
-        if distinct_skip_reasons == {"regex mismatch"}:
-            failure_reason = "regex mismatch"
-        elif distinct_skip_reasons == {"qty missing"}:
-            failure_reason = "qty missing"
-        elif distinct_skip_reasons == {"price missing"}:
-            failure_reason = "price missing"
+    def _trace_row(self, position: int, row: _RowTokens, parsed: dict | None, outcome: str) -> None:
+        """Log how the candidate row at *position* was read (see :mod:`parser.row_trace`)."""
+        parsed = parsed or {}
+        logger.info(
+            "[ROW-TRACE] row=%r outcome=%s strategy=%s numeric_tokens=%s qty=%r price=%r tax=%r total=%r "
+            "rows_before=%s rows_after=%s",
+            self._candidates[position]["raw"],
+            outcome,
+            parsed.get("parse_strategy"),
+            [(entry["text"], entry["kind"], entry["value"]) for entry in row.numbers],
+            parsed.get("qty"),
+            parsed.get("price"),
+            parsed.get("tax"),
+            parsed.get("total"),
+            [entry["raw"] for entry in self._candidates[max(0, position - 3):position]],
+            [entry["raw"] for entry in self._candidates[position + 1:position + 4]],
+        )
+
+    def finish(self) -> dict:
+        text = self.text
+        rejected = _unparseable_text_result(text)
+        if rejected is not None:
+            return rejected
+
+        items = self._items
+        skipped_rows = self._skipped_rows
+        candidate_lines = self._candidates
+        normalized_text = _clean_ocr_text(text)
+
+        trace = {
+            "raw_ocr_text": text,
+            "normalized_ocr_text": normalized_text,
+            "candidate_rows": [entry["raw"] for entry in candidate_lines],
+            "cleaned_rows": [entry["cleaned"] for entry in candidate_lines],
+            "parsed_line_items": list(items),
+            "skipped_rows": skipped_rows,
+        }
+
+        logger.info("Parser raw OCR text (%d chars): %s", len(text), text)
+        logger.info("Parser normalized OCR text (%d chars): %s", len(normalized_text), normalized_text)
+        logger.info("Parser split candidate rows (%d): %s", len(trace["candidate_rows"]), trace["candidate_rows"])
+        logger.info("Parser cleaned rows (%d): %s", len(trace["cleaned_rows"]), trace["cleaned_rows"])
+        logger.info(
+            "Parser entrypoint=extract_line_items_with_diagnostics active_paths=%s legacy_disabled=%s",
+            ["_extract_columnar_values", "_extract_labeled_values", "_extract_trailing_numeric_values"],
+            ["_extract_token_fallback"],
+        )
+
+        confidence_values = [item.get("confidence") for item in items if item.get("confidence") is not None]
+        base_score = sum(confidence_values) / len(confidence_values) if confidence_values else 0.0
+        coverage = len(items) / len(candidate_lines) if candidate_lines else 0.0
+        parser_confidence_score = round((base_score * 0.7) + (coverage * 0.3), 4) if items else 0.0
+        if not candidate_lines:
+            failure_reason = "no rows found"
+        elif not items and skipped_rows:
+            distinct_skip_reasons = {row.get("reason") for row in skipped_rows}
+            if distinct_skip_reasons == {"regex mismatch"}:
+                failure_reason = "regex mismatch"
+            elif distinct_skip_reasons == {"qty missing"}:
+                failure_reason = "qty missing"
+            elif distinct_skip_reasons == {"price missing"}:
+                failure_reason = "price missing"
+            else:
+                failure_reason = "all rows skipped"
+        elif not items:
+            failure_reason = "parser returned empty list"
         else:
-            failure_reason = "all rows skipped"
-    elif not items:
-        failure_reason = "parser returned empty list"
-    else:
-        failure_reason = None
+            failure_reason = None
 
-    trace["failure_reason"] = failure_reason
-    trace["skipped_row_count"] = len(skipped_rows)
-    trace["parsed_item_count"] = len(items)
-    trace["parser_confidence_score"] = parser_confidence_score
+        trace["failure_reason"] = failure_reason
+        trace["skipped_row_count"] = len(skipped_rows)
+        trace["parsed_item_count"] = len(items)
+        trace["parser_confidence_score"] = parser_confidence_score
 
-    logger.info(
-        "Structured parser extracted %d line item(s), skipped %d row(s), parser_confidence_score=%s",
-        len(items),
-        len(skipped_rows),
-        parser_confidence_score,
-    )
-    logger.info("Parser parsed line item objects: %s", items)
-    logger.info("Parser skipped rows: %s", skipped_rows)
-    if failure_reason:
-        logger.warning("Parser failure_reason=%s raw_ocr_preview=%s", failure_reason, _preview_text(text))
+        logger.info(
+            "Structured parser extracted %d line item(s), skipped %d row(s), parser_confidence_score=%s",
+            len(items),
+            len(skipped_rows),
+            parser_confidence_score,
+        )
+        logger.info("Parser parsed line item objects: %s", items)
+        logger.info("Parser skipped rows: %s", skipped_rows)
+        if failure_reason:
+            logger.warning("Parser failure_reason=%s raw_ocr_preview=%s", failure_reason, _preview_text(text))
+
+        return {
+            "items": items,
+            "skipped_rows": skipped_rows,
+            "parser_confidence_score": parser_confidence_score,
+            "failure_reason": failure_reason,
+            "trace": trace,
+        }
 
-    return {
-        "items": items,
-        "skipped_rows": skipped_rows,
-        "parser_confidence_score": parser_confidence_score,
-        "failure_reason": failure_reason,
-        "trace": trace,
-    }
+
+def extract_line_items_with_diagnostics(text: str, confidence: float | None = None) -> dict:
+    rejected = _unparseable_text_result(text)
+    if rejected is not None:
+        return rejected
+    stream = LineItemStream(confidence)
+    stream.add_page(text)
+    return stream.finish()
 
 
 def extract_line_items(text: str, confidence: float | None = None) -> list[dict]:
@@ -915,9 +1174,29 @@ def extract_totals(text: str) -> dict:
     return totals
 
 
-def build_structured_document(text: str, confidence: float | None = None) -> dict:
-    logger.info("CALL CHAIN parser entrypoint=build_structured_document text_len=%d", len(text or ""))
-    line_item_result = extract_line_items_with_diagnostics(text, confidence=confidence)
+def build_structured_document(text: str | Iterable[str | dict], confidence: float | None = None) -> dict:
+    """Parse line items and totals from document text.
+
+    *text* may also be an iterable of pages, either strings or page dicts
+    with a ``"text"`` key such as :func:`ocr.iter_pdf_pages` yields.  Rows
+    are then parsed as each page arrives instead of after the last one, and
+    the ``"tables"`` of structured pages are parsed from their cells.
+    """
+    if text is None or isinstance(text, str):
+        logger.info("CALL CHAIN parser entrypoint=build_structured_document text_len=%d", len(text or ""))
+        line_item_result = extract_line_items_with_diagnostics(text, confidence=confidence)
+    else:
+        stream = LineItemStream(confidence)
+        for page in text:
+            if not isinstance(page, dict):
+                stream.add_page(page)
+            elif "tables" in page:
+                stream.add_page(page.get("text_outside_tables", ""), page["tables"])
+            else:
+                stream.add_page(page.get("text", ""))
+        text = stream.text
+        logger.info("CALL CHAIN parser entrypoint=build_structured_document pages text_len=%d", len(text))
+        line_item_result = stream.finish()
     items = line_item_result["items"]
     totals = extract_totals(text)
     return {
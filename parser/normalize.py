@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+from collections import Counter
 from difflib import SequenceMatcher
+from functools import lru_cache
 import re
 
 
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_EDGE_PUNCTUATION_PATTERN = re.compile(r"^[\W_]+|[\W_]+$")
+
+
 def _compact_whitespace(value: str) -> str:
-    return re.sub(r"\s+", " ", value or "").strip()
+    return _WHITESPACE_PATTERN.sub(" ", value or "").strip()
 
 
 _ITEM_FIELD_LABELS = ("item", "qty", "quantity", "price", "rate", "amount")
 _ITEM_STOP_LABELS = _ITEM_FIELD_LABELS + ("tax", "gst", "vat", "total")
+_NON_LETTER_PATTERN = re.compile(r"[^a-z]")
 _OCR_FUZZY_TRANSLATION = str.maketrans(
     {
         "0": "o",
@@ -24,26 +31,50 @@ _OCR_FUZZY_TRANSLATION = str.maketrans(
 
 
 def _normalize_ocr_token_for_match(token: str) -> str:
-    token = re.sub(r"^[\W_]+|[\W_]+$", "", (token or "").lower())
+    token = _EDGE_PUNCTUATION_PATTERN.sub("", (token or "").lower())
     token = token.translate(_OCR_FUZZY_TRANSLATION)
-    return re.sub(r"[^a-z]", "", token)
+    return _NON_LETTER_PATTERN.sub("", token)
 
 
-def _looks_like_ocr_field_label(token: str, labels: tuple[str, ...] = _ITEM_STOP_LABELS) -> bool:
-    normalized_token = _normalize_ocr_token_for_match(token)
-    if not normalized_token:
-        return False
+# SequenceMatcher similarity at which a token counts as a misread label.
+_LABEL_MATCH_RATIO = 0.72
+_LABEL_MATCH_CACHE_SIZE = 4096
+
 
+@lru_cache(maxsize=None)
+def _char_counts(label: str) -> Counter:
+    return Counter(label)
+
+
+@lru_cache(maxsize=_LABEL_MATCH_CACHE_SIZE)
+def _matches_field_label(normalized_token: str, labels: tuple[str, ...]) -> bool:
+    """Whether *normalized_token* is one of *labels* or a close misreading of one.
+
+    Memoized because the same tokens recur on every row of a document.
+    """
+    token_counts = Counter(normalized_token)
     for label in labels:
         if normalized_token == label:
             return True
         if abs(len(normalized_token) - len(label)) > 2:
             continue
-        if SequenceMatcher(None, normalized_token, label).ratio() >= 0.72:
+        # SequenceMatcher only matches characters the two strings share, so
+        # too few shared characters rule the label out without running it.
+        shared = sum((token_counts & _char_counts(label)).values())
+        if 2.0 * shared / (len(normalized_token) + len(label)) < _LABEL_MATCH_RATIO:
+            continue
+        if SequenceMatcher(None, normalized_token, label).ratio() >= _LABEL_MATCH_RATIO:
             return True
     return False
 
 
+def _looks_like_ocr_field_label(token: str, labels: tuple[str, ...] = _ITEM_STOP_LABELS) -> bool:
+    normalized_token = _normalize_ocr_token_for_match(token)
+    if not normalized_token:
+        return False
+    return _matches_field_label(normalized_token, labels)
+
+
 def is_ocr_item_label_token(token: str) -> bool:
     return _looks_like_ocr_field_label(token, labels=("item",))
 
@@ -53,37 +84,60 @@ def is_ocr_stop_label_token(token: str) -> bool:
 
 
 def strip_ocr_field_labels(value: object) -> str:
-    tokens = re.findall(r"\S+", normalize_ocr_text(value).lower())
+    tokens = normalize_ocr_text(value).lower().split()
     cleaned_tokens: list[str] = []
     for token in tokens:
-        stripped = re.sub(r"^[\W_]+|[\W_]+$", "", token)
+        stripped = _EDGE_PUNCTUATION_PATTERN.sub("", token)
         if _looks_like_ocr_field_label(stripped):
             continue
         cleaned_tokens.append(token)
     return _compact_whitespace(" ".join(cleaned_tokens))
 
 
+# normalize_ocr_text runs once per numeric token and per candidate row, so its
+# patterns are compiled here and the literal replacements share one pass.
+_LITERAL_REPLACEMENTS = {
+    "\r\n": "\n",
+    "\r": "\n",
+    "â‚¹": " rs ",
+    "Ã¢â€šÂ¹": " rs ",
+    "|": " | ",
+    "â€”": "-",
+    "â€“": "-",
+}
+_LITERAL_PATTERN = re.compile("|".join(map(re.escape, _LITERAL_REPLACEMENTS)))
+# Characters that start a literal replacement; text without any skips the pass.
+_LITERAL_TRIGGERS = frozenset(key[0] for key in _LITERAL_REPLACEMENTS)
+_REPEATED_PUNCTUATION_PATTERN = re.compile(r"([:;.,\-])\1+")
+_LABEL_DIGIT_PATTERN = re.compile(r"(?i)\b(qty|quantity|qnty|price|rate|amount|tax|gst|vat)(\d)")
+_DIGIT_LABEL_PATTERN = re.compile(r"(?i)(\d)(qty|quantity|qnty|price|rate|amount|tax|gst|vat)\b")
+# Misread or letter-spaced field labels, each a named group for its label.
+_MISREAD_LABEL_PATTERN = re.compile(
+    r"(?i)\b(?:"
+    r"(?P<qty>q\s*t\s*y|qt[yv])"
+    r"|(?P<quantity>q\s*u\s*a\s*n\s*t\s*i\s*t\s*y)"
+    r"|(?P<price>pr1ce|prlce|p\s*r\s*i\s*c\s*e)"
+    r"|(?P<rate>r\s*a\s*t\s*e)"
+    r"|(?P<amount>am0unt)"
+    r"|(?P<item>1tem)"
+    r")\b"
+)
+_HORIZONTAL_SPACE_PATTERN = re.compile(r"[ \t]+")
+_NUMERIC_TRIGGERS = frozenset(":;.,-0123456789")
+
+
 def normalize_ocr_text(value: object) -> str:
     text = str(value or "")
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = text.replace("â‚¹", " rs ")
-    text = text.replace("Ã¢â€šÂ¹", " rs ")
-    text = text.replace("|", " | ")
-    text = text.replace("â€”", "-").replace("â€“", "-")
-    text = re.sub(r"([:;.,\-])\1+", r"\1", text)
-    text = re.sub(r"(?i)\b(qty|quantity|qnty)(\d)", r"\1 \2", text)
-    text = re.sub(r"(?i)\b(price|rate|amount|tax|gst|vat)(\d)", r"\1 \2", text)
-    text = re.sub(r"(?i)(\d)(qty|quantity|qnty|price|rate|amount|tax|gst|vat)\b", r"\1 \2", text)
-    text = re.sub(r"(?i)\bq\s*t\s*y\b", "qty", text)
-    text = re.sub(r"(?i)\bq\s*u\s*a\s*n\s*t\s*i\s*t\s*y\b", "quantity", text)
-    text = re.sub(r"(?i)\bpr1ce\b", "price", text)
-    text = re.sub(r"(?i)\bprlce\b", "price", text)
-    text = re.sub(r"(?i)\bp\s*r\s*i\s*c\s*e\b", "price", text)
-    text = re.sub(r"(?i)\br\s*a\s*t\s*e\b", "rate", text)
-    text = re.sub(r"(?i)\bam0unt\b", "amount", text)
-    text = re.sub(r"(?i)\bqt[yv]\b", "qty", text)
-    text = re.sub(r"(?i)\b1tem\b", "item", text)
-    text = re.sub(r"[ \t]+", " ", text)
+    if text.isdigit() and text.isascii():
+        return text
+    if not _LITERAL_TRIGGERS.isdisjoint(text):
+        text = _LITERAL_PATTERN.sub(lambda match: _LITERAL_REPLACEMENTS[match.group()], text)
+    if not _NUMERIC_TRIGGERS.isdisjoint(text):
+        text = _REPEATED_PUNCTUATION_PATTERN.sub(r"\1", text)
+        text = _LABEL_DIGIT_PATTERN.sub(r"\1 \2", text)
+        text = _DIGIT_LABEL_PATTERN.sub(r"\1 \2", text)
+    text = _MISREAD_LABEL_PATTERN.sub(lambda match: match.lastgroup, text)
+    text = _HORIZONTAL_SPACE_PATTERN.sub(" ", text)
     return text.strip()
 
 
@@ -134,6 +188,12 @@ def clean_ocr_numeric_token(text: str) -> str:
     return t
 
 
+_CURRENCY_PREFIX_PATTERN = re.compile(r"(?i)\b(?:rs|inr)\.?\s*")
+_THOUSANDS_SEPARATOR_PATTERN = re.compile(r"(\d)\s*,\s*(\d)")
+_NON_NUMERIC_PATTERN = re.compile(r"[^\d.\-]")
+_PLAIN_NUMBER_PATTERN = re.compile(r"-?[0-9]+(?:\.[0-9]+)?")
+
+
 def normalize_currency_value(value: object) -> float | int | None:
     """Parse a single numeric token into a Python int or float.
 
@@ -151,13 +211,19 @@ def normalize_currency_value(value: object) -> float | int | None:
     """
     if value is None:
         return None
+    if type(value) in (str, int, float) and value:
+        # Plain decimal numbers (already-parsed values included) need no OCR cleanup.
+        plain = value if type(value) is str else str(value)
+        if _PLAIN_NUMBER_PATTERN.fullmatch(plain):
+            number = float(plain)
+            return int(number) if number.is_integer() else round(number, 2)
 
     text = normalize_ocr_text(value).strip()
     if not text:
         return None
 
     # Remove currency prefixes first to prevent their letters (e.g. 's' in 'Rs.', 'i' in 'INR') from being translated as digits
-    text = re.sub(r"(?i)\b(?:rs|inr)\.?\s*", "", text)
+    text = _CURRENCY_PREFIX_PATTERN.sub("", text)
 
     # If the token is purely alphabetical and has no digits or symbols, reject it
     has_digit = any(c.isdigit() for c in text)
@@ -173,9 +239,9 @@ def normalize_currency_value(value: object) -> float | int | None:
     # Remove commas used as thousands separators, including any surrounding
     # whitespace strictly adjacent to a comma digit group
     # e.g. "1,500" -> "1500",  "1, 500" -> "1500", but "6 5000" -> kept as-is
-    text = re.sub(r"(\d)\s*,\s*(\d)", r"\1\2", text)
+    text = _THOUSANDS_SEPARATOR_PATTERN.sub(r"\1\2", text)
     # Strip all non-numeric chars except decimal point and negative sign
-    text = re.sub(r"[^\d.\-]", "", text)
+    text = _NON_NUMERIC_PATTERN.sub("", text)
 
     if not text or text in {".", "-", "-."}:
         return None
@@ -209,15 +275,23 @@ def normalize_percentage(value: object) -> float | int | None:
     return number
 
 
+_DOCUMENT_NUMBER_PREFIX_PATTERN = re.compile(
+    r"(?i)^(?:invoice|invoice no|invoice number|purchase order|po|po no|po number)\b[\s:#-]*[a-z0-9-]*\s*"
+)
+_LEADING_NUMBER_PATTERN = re.compile(r"^\d+\s+")
+_ITEM_LABEL_PATTERN = re.compile(r"(?i)\b(?:item|description|desc|particulars)\b\s*[:\-]?\s*")
+_SERIAL_PREFIX_PATTERN = re.compile(r"^\d+\s*[.)-]\s*")
+_ITEM_NAME_JUNK_PATTERN = re.compile(r"[^\w\s\-./&]")
+
+
 def normalize_item_name(value: object) -> str:
     text = strip_ocr_field_labels(value)
     text = _compact_whitespace(text)
-    text = re.sub(r"(?i)^(?:invoice|invoice no|invoice number|purchase order|po|po no|po number)\b[\s:#-]*[a-z0-9-]*\s*", "", text)
-    text = re.sub(r"^\d+\s+", "", text)
-    text = re.sub(r"^[\W_]+", "", text)
-    text = re.sub(r"[\W_]+$", "", text)
-    text = re.sub(r"(?i)\b(?:item|description|desc|particulars)\b\s*[:\-]?\s*", "", text)
-    text = re.sub(r"^\d+\s*[.)-]\s*", "", text)
-    text = re.sub(r"[^\w\s\-./&]", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _DOCUMENT_NUMBER_PREFIX_PATTERN.sub("", text)
+    text = _LEADING_NUMBER_PATTERN.sub("", text)
+    text = _EDGE_PUNCTUATION_PATTERN.sub("", text)
+    text = _ITEM_LABEL_PATTERN.sub("", text)
+    text = _SERIAL_PREFIX_PATTERN.sub("", text)
+    text = _ITEM_NAME_JUNK_PATTERN.sub(" ", text)
+    text = _WHITESPACE_PATTERN.sub(" ", text)
     return text
@@ -0,0 +1,51 @@
+"""Opt-in tracing of selected line-item rows.
+
+To see how particular rows were parsed, install a predicate with
+:func:`row_trace`; every candidate row it accepts is logged as one
+``[ROW-TRACE]`` record with its numeric tokens, the selected fields, the
+outcome, and its neighbouring rows.  The predicate lives in a context
+variable, so it is scoped to the current request.  ``PARSER_TRACE_ROWS``
+sets a process-wide substring instead.  With neither, the parser pays one
+context variable lookup per batch of rows.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable
+
+RowPredicate = Callable[[str], bool]
+
+_ROW_TRACE: ContextVar[RowPredicate | None] = ContextVar("parser_row_trace", default=None)
+
+
+def _substring_predicate(needle: str) -> RowPredicate:
+    needle = needle.lower()
+    return lambda row: needle in row.lower()
+
+
+_TRACE_ROWS = os.getenv("PARSER_TRACE_ROWS", "")
+_DEFAULT_PREDICATE = _substring_predicate(_TRACE_ROWS) if _TRACE_ROWS else None
+
+
+@contextmanager
+def row_trace(match: str | RowPredicate):
+    """Trace the rows selected by *match* for the code run inside the ``with`` block.
+
+    *match* is a case-insensitive substring of the raw row or a predicate
+    called with the raw row.
+    """
+    predicate = _substring_predicate(match) if isinstance(match, str) else match
+    token = _ROW_TRACE.set(predicate)
+    try:
+        yield
+    finally:
+        _ROW_TRACE.reset(token)
+
+
+def row_trace_predicate() -> RowPredicate | None:
+    """The predicate selecting rows to trace, or None when row tracing is off."""
+    predicate = _ROW_TRACE.get()
+    return predicate if predicate is not None else _DEFAULT_PREDICATE
@@ -0,0 +1,241 @@
+"""Table header detection.
+
+A header row names the columns that the columnar and table row parsers
+map cells by.  Each cell is first matched against the column keywords as
+substrings (``"Unit Price"`` is a price column).  Cells no keyword names
+are compared word by word with the column vocabulary after undoing common
+OCR misreads, so ``"Descrlption"``, ``"Particu1ars"`` and ``"Amt"`` still
+resolve.
+
+Resolved column maps are remembered per header signature (the row's
+cells, lowercased with whitespace collapsed).  Later documents with the
+same layout, and later pages repeating the header, are mapped by a
+dictionary lookup instead of being inferred again.  The signature is not
+misread-normalized: inference reads exact spellings and digits, so two
+misreadings of one header can resolve differently.  Header candidates (the
+first rows of a table) found not to be headers are remembered separately,
+so they are not inferred again and cannot push learned layouts out; body
+rows are never remembered.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from difflib import get_close_matches
+from functools import lru_cache
+
+from .normalize import _normalize_ocr_token_for_match
+
+_MAX_LAYOUTS = int(os.getenv("PARSER_HEADER_CACHE_SIZE", "1024"))
+_MAX_NON_HEADERS = int(os.getenv("PARSER_NON_HEADER_CACHE_SIZE", "4096"))
+# Rows at the top of a table that may be its header row.
+_HEADER_CANDIDATE_ROWS = 3
+
+# A row with a cell spelled exactly like one of these is a header row.
+_HEADER_KEYWORDS = frozenset(
+    ("item", "description", "particulars", "qty", "quantity", "price", "rate", "total", "amount", "hsn", "sac")
+)
+# (column, keywords, excluded) in priority order: the first rule whose
+# keywords occur in a cell decides it, and a cell that also contains an
+# excluded word is left unmapped.
+_COLUMN_RULES = (
+    ("item", re.compile(r"item|description|desc|particulars"), None),
+    ("qty", re.compile(r"qty|quantity|qnty"), None),
+    ("price", re.compile(r"price|rate|unit price"), re.compile(r"total|taxable")),
+    ("total", re.compile(r"total|amount"), re.compile(r"taxable")),
+    ("hsn", re.compile(r"hsn|sac"), None),
+    ("taxable", re.compile(r"taxable"), None),
+    ("gst", re.compile(r"cgst|sgst|igst|utgst|gst"), None),
+)
+# Column words recognised after OCR misreads are undone; see _fuzzy_column.
+_COLUMN_VOCABULARY = {
+    "item": ("item", "description", "particulars", "product"),
+    "qty": ("qty", "quantity", "qnty", "qnt"),
+    "price": ("price", "rate"),
+    "total": ("total", "amount", "amt"),
+    "hsn": ("hsn", "sac"),
+    "gst": ("gst", "cgst", "sgst", "igst"),
+}
+_VOCABULARY = {
+    _normalize_ocr_token_for_match(word): column for column, words in _COLUMN_VOCABULARY.items() for word in words
+}
+# Only words at least this long are matched approximately; shorter ones must
+# match exactly once misreads are undone.
+_MIN_FUZZY_LENGTH = 5
+_FUZZY_VOCABULARY = [word for word in _VOCABULARY if len(word) >= _MIN_FUZZY_LENGTH]
+_FUZZY_CUTOFF = 0.8
+# Words that may stand beside column words in a header cell ("S.No",
+# "Unit Price", "Taxable Value") without naming a column themselves.
+_HEADER_WORDS = frozenset(_VOCABULARY) | {
+    _normalize_ocr_token_for_match(word)
+    for word in ("desc", "taxable", "utgst", "unit", "s", "sl", "sr", "no", "rs", "value", "per", "code")
+}
+_WORD_PATTERN = re.compile(r"[^\s/.:()\-]+")
+_DIGIT_PATTERN = re.compile(r"\d")
+
+
+@lru_cache(maxsize=4096)
+def _word_column(normalized: str) -> str | None:
+    """Column named by one misread-normalized word, matched approximately if long enough."""
+    column = _VOCABULARY.get(normalized)
+    if column is None and len(normalized) >= _MIN_FUZZY_LENGTH:
+        close = get_close_matches(normalized, _FUZZY_VOCABULARY, n=1, cutoff=_FUZZY_CUTOFF)
+        column = _VOCABULARY[close[0]] if close else None
+    return column
+
+
+def _cell_words(cell: str) -> list[str]:
+    return [word for word in map(_normalize_ocr_token_for_match, _WORD_PATTERN.findall(cell)) if word]
+
+
+def _fuzzy_column(cell: str) -> str | None:
+    """Column named by a cell that no keyword rule matched, read word by word."""
+    for word in _cell_words(cell):
+        column = _word_column(word)
+        if column is not None:
+            return column
+    return None
+
+
+def _is_header_cell(cell: str) -> bool:
+    """Whether every word of *cell* is a column word or header filler."""
+    words = _cell_words(cell)
+    return bool(words) and all(word in _HEADER_WORDS or _word_column(word) is not None for word in words)
+
+
+def _cell_column(cell: str) -> tuple[str | None, bool]:
+    """The column *cell* names and whether a keyword rule decided it."""
+    for column, keywords, excluded in _COLUMN_RULES:
+        if keywords.search(cell):
+            if excluded is not None and excluded.search(cell):
+                return None, True
+            return column, True
+    return _fuzzy_column(cell), False
+
+
+def _infer_header_columns(cells: tuple[str, ...]) -> dict | None:
+    header_indices = {}
+    fuzzy_columns = set()
+    for idx, cell in enumerate(cells):
+        if not cell:
+            continue
+        column, by_keyword = _cell_column(cell)
+        if column is None:
+            continue
+        if by_keyword:
+            header_indices[column] = idx
+        elif column not in header_indices:
+            # A misread word never displaces a column a keyword already named.
+            header_indices[column] = idx
+            fuzzy_columns.add(column)
+
+    if not _HEADER_KEYWORDS.isdisjoint(cells):
+        return header_indices
+    # Without an exactly spelled keyword, a digit-free row naming two or
+    # more columns (at least one only after misread correction) is a header
+    # if most of its cells are nothing but header words, so free text that
+    # merely mentions a column word ("Shipping Amt") is not.
+    if not fuzzy_columns or len(header_indices) < 2 or any(_DIGIT_PATTERN.search(cell) for cell in cells):
+        return None
+    filled = [cell for cell in cells if cell]
+    if 2 * sum(map(_is_header_cell, filled)) > len(filled):
+        return header_indices
+    return None
+
+
+def _remember(entries: OrderedDict, signature: tuple[str, ...], value, limit: int) -> None:
+    entries[signature] = value
+    while len(entries) > limit:
+        entries.popitem(last=False)
+
+
+class HeaderLayouts:
+    """Column maps of recently seen header signatures, least-recently-used dropped first.
+
+    Signatures of header candidates that are not headers are kept in a
+    second LRU of their own size, so they never evict layouts.
+    """
+
+    def __init__(self, max_layouts: int = _MAX_LAYOUTS, max_non_headers: int = _MAX_NON_HEADERS):
+        self.max_layouts = max(1, max_layouts)
+        self.max_non_headers = max(0, max_non_headers)
+        self._columns: OrderedDict[tuple[str, ...], dict] = OrderedDict()
+        self._non_headers: OrderedDict[tuple[str, ...], None] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def columns(self, cells: list[str], candidate: bool = False) -> dict | None:
+        """Column positions named by header row *cells*, or None if they are not a header.
+
+        Only a *candidate* row (one of a table's first rows) is remembered
+        when it is not a header.
+        """
+        signature = tuple(" ".join(cell.lower().split()) for cell in cells)
+        with self._lock:
+            known = self._columns.get(signature)
+            if known is not None:
+                self._columns.move_to_end(signature)
+                self.hits += 1
+                return dict(known)
+            if signature in self._non_headers:
+                self._non_headers.move_to_end(signature)
+                self.hits += 1
+                return None
+            self.misses += 1
+        header_indices = _infer_header_columns(signature)
+        with self._lock:
+            if header_indices is not None:
+                _remember(self._columns, signature, dict(header_indices), self.max_layouts)
+            elif candidate and self.max_non_headers:
+                _remember(self._non_headers, signature, None, self.max_non_headers)
+        return header_indices
+
+    def clear(self) -> None:
+        with self._lock:
+            self._columns.clear()
+            self._non_headers.clear()
+            self.hits = self.misses = 0
+
+    def reinit_after_fork(self) -> None:
+        """Replace a lock that may have been held by another thread at fork time."""
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "layouts": len(self._columns),
+                "max_layouts": self.max_layouts,
+                "non_headers": len(self._non_headers),
+                "max_non_headers": self.max_non_headers,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_HEADER_LAYOUTS = HeaderLayouts()
+os.register_at_fork(after_in_child=_HEADER_LAYOUTS.reinit_after_fork)
+
+
+def get_header_layouts() -> HeaderLayouts:
+    return _HEADER_LAYOUTS
+
+
+def header_columns(cells: list[str], candidate: bool = False) -> dict | None:
+    """Column positions named by a table header row, or None if *cells* is not one."""
+    return _HEADER_LAYOUTS.columns(cells, candidate)
+
+
+def detect_header_columns(text: str) -> dict:
+    """Column positions from the first pipe-delimited header row of *text* (``{}`` if none)."""
+    pipe_rows = 0
+    for line in text.split("\n"):
+        if "|" in line:
+            header_indices = header_columns(line.split("|"), pipe_rows < _HEADER_CANDIDATE_ROWS)
+            if header_indices is not None:
+                return header_indices
+            pipe_rows += 1
+    return {}
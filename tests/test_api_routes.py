@@ -252,3 +252,130 @@ class TestExportPdf:
         response = client.post("/export-pdf", data={})
         assert response.status_code == 200
         assert response.data[:4] == b"%PDF"
+
+
+class TestReadinessRoute:
+    """Verify /ready reflects the OCR engine pool state."""
+
+    def test_ready_when_no_preload_requested(self, client, monkeypatch):
+        import ocr.extract as ocr_extract
+        from ocr.engine_pool import OcrEnginePool
+
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL", OcrEnginePool(lambda: None, size=1))
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.get_json()["ready"] is True
+
+    def test_not_ready_while_preloading(self, client, monkeypatch):
+        import ocr.extract as ocr_extract
+        from ocr.engine_pool import OcrEnginePool
+
+        pool = OcrEnginePool(lambda: object(), size=1)
+        pool.state = "loading"
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL", pool)
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.get_json()["engines"]["paddleocr"]["state"] == "loading"
+
+
+# ---------------------------------------------------------------------------
+# /verify with embedded tables
+# ---------------------------------------------------------------------------
+
+class TestVerifyTablePdf:
+    """Tables serialized into the /verify text parse to the table's rows."""
+
+    def test_line_items_match_table_rows(self, client, monkeypatch):
+        pytest.importorskip("fitz")
+        import app as app_module
+        from extractors import llm_structured_extractor
+        from ocr import extract as ocr_extract
+        from parser import build_structured_document
+        from tests.test_ocr_extract import make_table_pdf
+
+        def offline(system, user):
+            raise RuntimeError("no LLM provider in tests")
+
+        compared = []
+        compare = app_module.compare_invoice_po
+
+        def recording_compare(invoice_text, po_text):
+            result = compare(invoice_text, po_text)
+            compared.append(result)
+            return result
+
+        monkeypatch.setattr(llm_structured_extractor, "_call_provider", offline)
+        monkeypatch.setattr(ocr_extract, "get_result_cache", lambda: None)
+        monkeypatch.setattr(ocr_extract, "_TABLE_MODE", "structured")
+        monkeypatch.setattr(app_module, "compare_invoice_po", recording_compare)
+        response = client.post(
+            "/verify",
+            data={
+                "invoice": (io.BytesIO(make_table_pdf()), "invoice.pdf"),
+                "purchase_order": (io.BytesIO(make_table_pdf()), "po.pdf"),
+            },
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["total_issues"] == 0
+        row_items = build_structured_document(ocr_extract.iter_pdf_pages(make_table_pdf()))["line_items"]
+        expected = [(item["item"], item["qty"], item["price"]) for item in row_items]
+        assert expected == [("laptop", 10, 45000), ("mouse", 20, 500)]
+        for items in (compared[0]["invoice_items"], compared[0]["po_items"]):
+            assert [(item["item"], item["qty"], item["price"]) for item in items] == expected
+
+
+# ---------------------------------------------------------------------------
+# Per-request OCR trace flag
+# ---------------------------------------------------------------------------
+
+class TestOcrTraceHeader:
+    def test_header_scopes_trace_to_request(self, client, monkeypatch):
+        import app as app_module
+        from ocr.diagnostics import request_trace_enabled
+
+        seen = []
+
+        def fake_extract(file_bytes):
+            seen.append(request_trace_enabled())
+            return ""
+
+        monkeypatch.setattr(app_module, "extract_text_from_pdf", fake_extract)
+        for headers in ({"X-OCR-Trace": "1"}, {}):
+            client.post(
+                "/verify",
+                data={
+                    "invoice": (io.BytesIO(make_minimal_pdf()), "invoice.pdf"),
+                    "purchase_order": (io.BytesIO(make_minimal_pdf()), "po.pdf"),
+                },
+                content_type="multipart/form-data",
+                headers=headers,
+            )
+        assert seen == [True, True, False, False]
+        assert not request_trace_enabled()
+
+    def test_row_trace_header_scopes_predicate(self, client, monkeypatch):
+        import app as app_module
+        from parser.row_trace import row_trace_predicate
+
+        seen = []
+
+        def fake_extract(file_bytes):
+            predicate = row_trace_predicate()
+            seen.append(predicate is not None and predicate("Dell Monitor 24"))
+            return ""
+
+        monkeypatch.setattr(app_module, "extract_text_from_pdf", fake_extract)
+        for headers in ({"X-Parser-Trace-Rows": "monitor"}, {}):
+            client.post(
+                "/verify",
+                data={
+                    "invoice": (io.BytesIO(make_minimal_pdf()), "invoice.pdf"),
+                    "purchase_order": (io.BytesIO(make_minimal_pdf()), "po.pdf"),
+                },
+                content_type="multipart/form-data",
+                headers=headers,
+            )
+        assert seen == [True, True, False, False]
+        assert row_trace_predicate() is None
@@ -0,0 +1,111 @@
+"""Tests for ocr/engine_pool.py — warm OCR engine checkout/checkin."""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from ocr.engine_pool import OcrEnginePool
+
+
+class _CountingFactory:
+    def __init__(self, fail: bool = False):
+        self.created = 0
+        self.fail = fail
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        if self.fail:
+            return None
+        with self._lock:
+            self.created += 1
+            return {"engine": self.created}
+
+
+class TestOcrEnginePool:
+    """Verify engines are created at most ``size`` times and reused."""
+
+    def test_lazy_checkout_reuses_engine(self):
+        factory = _CountingFactory()
+        pool = OcrEnginePool(factory, size=2)
+        assert pool.status()["state"] == "cold"
+        with pool.checkout() as first:
+            pass
+        with pool.checkout() as second:
+            pass
+        assert first is second
+        assert factory.created == 1
+        assert pool.status()["state"] == "ready"
+
+    def test_concurrent_checkouts_get_distinct_engines(self):
+        pool = OcrEnginePool(_CountingFactory(), size=2)
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first is not second
+            assert pool.status()["in_use"] == 2
+        assert pool.status()["idle"] == 2
+
+    def test_checkout_waits_for_a_free_engine(self):
+        pool = OcrEnginePool(_CountingFactory(), size=1)
+        seen = []
+        with pool.checkout() as engine:
+            worker = threading.Thread(target=lambda: seen.append(pool._acquire(timeout=5)))
+            worker.start()
+            worker.join(timeout=0.1)
+            assert worker.is_alive()
+        worker.join(timeout=5)
+        assert seen == [engine]
+
+    def test_checkout_times_out_to_none(self):
+        pool = OcrEnginePool(_CountingFactory(), size=1)
+        with pool.checkout():
+            with pool.checkout(timeout=0.01) as engine:
+                assert engine is None
+
+    def test_preload_builds_every_engine(self):
+        factory = _CountingFactory()
+        pool = OcrEnginePool(factory, size=3)
+        assert pool.preload() is True
+        status = pool.status()
+        assert factory.created == 3
+        assert status["idle"] == 3
+        assert status["ready"] is True
+        assert pool.preload() is True
+        assert factory.created == 3
+
+    def test_unavailable_engine_yields_none(self):
+        pool = OcrEnginePool(_CountingFactory(fail=True), size=2)
+        assert pool.preload() is False
+        assert pool.status()["state"] == "unavailable"
+        assert pool.is_ready() is True
+        with pool.checkout() as engine:
+            assert engine is None
+
+    def test_requested_preload_blocks_readiness(self):
+        release = threading.Event()
+
+        def slow_factory():
+            release.wait(5)
+            return object()
+
+        pool = OcrEnginePool(slow_factory, size=1)
+        assert pool.is_ready() is True
+        thread = pool.preload_in_background()
+        assert pool.is_ready() is False
+        release.set()
+        thread.join(timeout=5)
+        assert pool.is_ready() is True
+
+    def test_reinit_after_fork_forgets_checked_out_engines(self):
+        pool = OcrEnginePool(_CountingFactory(), size=2)
+        pool.preload()
+        pool._acquire(timeout=None)  # held by a thread that does not survive the fork
+        pool.reinit_after_fork()
+        status = pool.status()
+        assert status["created"] == 1
+        assert status["idle"] == 1
+        with pool.checkout() as first, pool.checkout() as second:
+            assert first is not None and second is not None
@@ -0,0 +1,79 @@
+"""Tests for ocr/engine_preference.py — learned per-layout engine order."""
+from __future__ import annotations
+
+import os
+import sys
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from PIL import Image, ImageDraw
+
+from ocr.engine_preference import EnginePreference, layout_signature
+
+
+def _page(header: str, body: str) -> Image.Image:
+    image = Image.new("L", (800, 1100), 255)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((40, 40, 300, 160), fill=0)
+    draw.text((360, 60), header, fill=0)
+    draw.text((60, 500), body, fill=0)
+    return image
+
+
+class TestLayoutSignature:
+    def test_same_header_different_body(self):
+        assert layout_signature(_page("ACME SUPPLIES", "Laptop 2 45000")) == layout_signature(
+            _page("ACME SUPPLIES", "Monitor 7 12000")
+        )
+
+    def test_different_letterhead(self):
+        other = Image.new("L", (800, 1100), 255)
+        ImageDraw.Draw(other).rectangle((500, 30, 760, 120), fill=0)
+        assert layout_signature(_page("ACME SUPPLIES", "x")) != layout_signature(other)
+
+    def test_rgb_and_blank_pages(self):
+        assert layout_signature(_page("A", "b").convert("RGB")) == layout_signature(_page("A", "b"))
+        assert layout_signature(Image.new("L", (10, 3), 255)) == "0" * 16
+
+
+class TestEnginePreference:
+    def test_streak_sets_preference(self):
+        preference = EnginePreference()
+        for _ in range(2):
+            preference.record("layout", "pytesseract")
+        assert preference.preferred_engine("layout") is None
+        preference.record("layout", "pytesseract")
+        assert preference.preferred_engine("layout") == "pytesseract"
+        assert preference.preferred_engine("unknown") is None
+
+    def test_one_loss_breaks_the_streak(self):
+        preference = EnginePreference()
+        for engine in ("pytesseract", "pytesseract", "pytesseract", "paddleocr"):
+            preference.record("layout", engine)
+        assert preference.preferred_engine("layout") is None
+        assert preference.stats()["preferred"] == {}
+
+    def test_layout_count_is_bounded(self):
+        preference = EnginePreference(max_layouts=2)
+        for layout in ("a", "b", "c"):
+            for _ in range(3):
+                preference.record(layout, "pytesseract")
+        stats = preference.stats()
+        assert stats["layouts"] == 2
+        assert stats["preferred"] == {"pytesseract": 2}
+        assert preference.preferred_engine("a") is None
+
+    def test_preference_is_set_aside_every_nth_page(self):
+        preference = EnginePreference(explore_every=3)
+        for _ in range(3):
+            preference.record("layout", "pytesseract")
+        answers = [preference.preferred_engine("layout") for _ in range(6)]
+        assert answers == ["pytesseract", "pytesseract", None, "pytesseract", "pytesseract", None]
+
+    def test_zero_never_explores(self):
+        preference = EnginePreference(explore_every=0)
+        for _ in range(3):
+            preference.record("layout", "pytesseract")
+        assert {preference.preferred_engine("layout") for _ in range(50)} == {"pytesseract"}
@@ -19,6 +19,9 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 from parser.normalize import (
+    _matches_field_label,
+    is_ocr_item_label_token,
+    is_ocr_stop_label_token,
     normalize_currency_value,
     normalize_item_name,
     normalize_ocr_text,
@@ -219,3 +222,43 @@ class TestNormalizeOcrText:
         """OCR often corrupts ₹ into multi-byte garbage."""
         result = normalize_ocr_text("â‚¹5000")
         assert "5000" in result
+
+    def test_literal_replacements_in_one_pass(self):
+        result = normalize_ocr_text("Item|Qty\r\nLaptop|10 â€” â‚¹5000\rEnd")
+        assert result == "Item | qty\nLaptop | 10 - rs 5000\nEnd"
+
+    def test_repeated_punctuation_and_misread_labels(self):
+        assert normalize_ocr_text("Q T Y:: 5 am0unt.. 9 R a t e--3") == "qty: 5 amount. 9 rate-3"
+        assert normalize_ocr_text("10qty qtv") == "10 qty qty"
+
+    def test_plain_digits_unchanged(self):
+        assert normalize_ocr_text("45000") == "45000"
+        assert normalize_currency_value("007") == 7
+        assert normalize_currency_value("0") == 0
+
+
+# ---------------------------------------------------------------------------
+# OCR field label matching
+# ---------------------------------------------------------------------------
+
+class TestFieldLabelMatching:
+    """Tests for misread field label detection."""
+
+    @pytest.mark.parametrize("token", ["Qtv:", "PRlCE", "amout", "totai", "ltem"])
+    def test_misread_labels(self, token):
+        assert is_ocr_stop_label_token(token)
+
+    @pytest.mark.parametrize("token", ["laptop", "10", "rs", "description", ""])
+    def test_other_tokens(self, token):
+        assert not is_ocr_stop_label_token(token)
+
+    def test_item_label_only(self):
+        assert is_ocr_item_label_token("itm")
+        assert not is_ocr_item_label_token("qty")
+
+    def test_repeated_tokens_are_memoized(self):
+        _matches_field_label.cache_clear()
+        for _ in range(3):
+            is_ocr_stop_label_token("Laptop")
+        info = _matches_field_label.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
@@ -0,0 +1,167 @@
+"""Tests for ocr/cache.py — persistent OCR result cache.
+
+Covers:
+- Round-trip of extract_pdf_content-shaped results
+- Hit/miss counters
+- Size-bounded LRU eviction
+- Age-based expiry of stored results
+- Cache keys depend on both file bytes and OCR configuration
+- In-memory page cache bounded by entry count and size
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import pytest
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+import ocr.cache as cache_module
+from ocr.cache import OcrResultCache, PageOcrCache, make_cache_key
+
+
+SAMPLE_RESULT = {
+    "text": "Laptop | 10 | 45000",
+    "pages": [{"page_number": 1, "text": "Laptop | 10 | 45000", "confidence": 1.0, "engine": "pdfplumber"}],
+    "pdf_type": "text",
+    "engine": "pdfplumber",
+    "confidence": 1.0,
+}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OcrResultCache(tmp_path / "ocr.sqlite3", max_bytes=10_000)
+
+
+class TestOcrResultCache:
+    """Verify storage, counters and eviction."""
+
+    def test_round_trip(self, cache):
+        cache.put("k1", SAMPLE_RESULT)
+        assert cache.get("k1") == SAMPLE_RESULT
+
+    def test_hit_miss_counters(self, cache):
+        assert cache.get("missing") is None
+        cache.put("k1", SAMPLE_RESULT)
+        cache.get("k1")
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["entries"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        entry = {"text": "x" * 400}
+        cache = OcrResultCache(tmp_path / "ocr.sqlite3", max_bytes=1000)
+        cache.put("old", entry)
+        cache.put("recent", entry)
+        cache.get("old")  # refresh "old" so "recent" becomes least recently used
+        cache.put("new", entry)
+        assert cache.get("recent") is None
+        assert cache.get("old") == entry
+        assert cache.get("new") == entry
+        assert cache.stats()["stored_bytes"] <= 1000
+
+    def test_oversized_entry_not_stored(self, tmp_path):
+        cache = OcrResultCache(tmp_path / "ocr.sqlite3", max_bytes=100)
+        cache.put("big", {"text": "x" * 500})
+        assert cache.get("big") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        OcrResultCache(tmp_path / "ocr.sqlite3").put("k1", SAMPLE_RESULT)
+        assert OcrResultCache(tmp_path / "ocr.sqlite3").get("k1") == SAMPLE_RESULT
+
+    def test_entries_expire_after_max_age(self, tmp_path, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = OcrResultCache(tmp_path / "ocr.sqlite3", max_age_seconds=3600)
+        cache.put("k1", SAMPLE_RESULT)
+        now[0] += 1800
+        assert cache.get("k1") == SAMPLE_RESULT
+        now[0] += 1801  # reads do not extend an entry's lifetime
+        assert cache.get("k1") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_store_purges_expired_entries(self, tmp_path, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = OcrResultCache(tmp_path / "ocr.sqlite3", max_age_seconds=60)
+        cache.put("old", SAMPLE_RESULT)
+        now[0] += 61
+        cache.put("new", SAMPLE_RESULT)
+        assert cache.stats()["entries"] == 1
+
+    def test_zero_max_age_keeps_entries(self, tmp_path, monkeypatch):
+        now = [1_000_000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        cache = OcrResultCache(tmp_path / "ocr.sqlite3", max_age_seconds=0)
+        cache.put("k1", SAMPLE_RESULT)
+        now[0] += 10 * 365 * 86400
+        assert cache.get("k1") == SAMPLE_RESULT
+
+    def test_entries_from_store_without_ages_are_expired(self, tmp_path):
+        path = tmp_path / "ocr.sqlite3"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)")
+        conn.execute("INSERT INTO entries VALUES ('k1', '{}', 2, 0)")
+        conn.commit()
+        conn.close()
+        cache = OcrResultCache(path, max_age_seconds=3600)
+        assert cache.get("k1") is None
+        cache.put("k2", SAMPLE_RESULT)
+        assert cache.get("k2") == SAMPLE_RESULT
+
+
+class TestCacheKey:
+    """Verify keys are content-addressed and configuration-aware."""
+
+    def test_same_bytes_same_key(self):
+        assert make_cache_key(b"%PDF-1", "dpi=300") == make_cache_key(b"%PDF-1", "dpi=300")
+
+    def test_different_bytes_different_key(self):
+        assert make_cache_key(b"%PDF-1", "dpi=300") != make_cache_key(b"%PDF-2", "dpi=300")
+
+    def test_config_changes_key(self):
+        assert make_cache_key(b"%PDF-1", "dpi=300") != make_cache_key(b"%PDF-1", "dpi=200")
+
+
+class TestPageOcrCache:
+    """Verify the in-memory page cache and its two bounds."""
+
+    PAGE = {"text": "Terms and conditions", "confidence": 0.91, "engine": "pytesseract", "metadata": {"render_dpi": 300}}
+
+    def test_round_trip_returns_copies(self):
+        cache = PageOcrCache()
+        cache.put("k1", self.PAGE)
+        first = cache.get("k1")
+        first["metadata"]["page_cache_hit"] = True
+        assert cache.get("k1") == self.PAGE
+        assert cache.stats()["hits"] == 2
+
+    def test_entry_count_bound_evicts_least_recent(self):
+        cache = PageOcrCache(max_entries=2, max_bytes=10_000)
+        cache.put("old", self.PAGE)
+        cache.put("recent", self.PAGE)
+        cache.get("old")
+        cache.put("new", self.PAGE)
+        assert cache.get("recent") is None
+        assert cache.get("old") == self.PAGE
+        assert cache.stats()["entries"] == 2
+
+    def test_size_bound(self):
+        entry = {"text": "x" * 400}
+        cache = PageOcrCache(max_entries=100, max_bytes=1000)
+        for key in ("a", "b", "c"):
+            cache.put(key, entry)
+        assert cache.get("a") is None
+        assert cache.stats()["stored_bytes"] <= 1000
+
+    def test_oversized_entry_not_stored(self):
+        cache = PageOcrCache(max_entries=10, max_bytes=100)
+        cache.put("big", {"text": "x" * 500})
+        assert cache.get("big") is None
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,1397 @@
+"""Tests for ocr/extract.py — page-level OCR orchestration.
+
+OCR engines are stubbed out so these tests exercise only the page
+scheduling and merge logic, not Tesseract/PaddleOCR themselves.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import pytest
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+fitz = pytest.importorskip("fitz")
+
+from ocr import extract as ocr_extract
+
+
+def make_multipage_pdf(page_count: int) -> bytes:
+    doc = fitz.open()
+    for index in range(page_count):
+        doc.new_page(width=200, height=200)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _fake_ocr_page(page_number: int) -> dict:
+    return {
+        "page_number": page_number,
+        "text": f"page {page_number} text",
+        "confidence": 0.9,
+        "engine": "pytesseract",
+        "uncertain": False,
+    }
+
+
+def _fake_ocr_rendered_pages(images, page_numbers, batch_id):
+    return [_fake_ocr_page(page_number) for page_number in page_numbers]
+
+
+@pytest.fixture(autouse=True)
+def no_page_cache(monkeypatch):
+    """Keep OCR'd pages from leaking between tests through the page cache."""
+    monkeypatch.setattr(ocr_extract, "get_page_cache", lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def fresh_engine_preference(monkeypatch):
+    from ocr.engine_preference import EnginePreference
+
+    preference = EnginePreference()
+    monkeypatch.setattr(ocr_extract, "get_engine_preference", lambda: preference)
+    return preference
+
+
+@pytest.fixture
+def stub_page_ocr(monkeypatch):
+    monkeypatch.setattr(ocr_extract, "_RENDER_DPI", 36)
+    monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", _fake_ocr_rendered_pages)
+
+
+# ---------------------------------------------------------------------------
+# _extract_text_ocr
+# ---------------------------------------------------------------------------
+
+class TestExtractTextOcr:
+    """Verify sequential and page-parallel OCR produce the same result."""
+
+    def test_sequential_pages_in_order(self, stub_page_ocr):
+        text, pages, engine = ocr_extract._extract_text_ocr(make_multipage_pdf(3), workers=1)
+        assert [page["page_number"] for page in pages] == [1, 2, 3]
+        assert text == "page 1 text\n\npage 2 text\n\npage 3 text"
+        assert engine == "pytesseract"
+
+    @pytest.fixture
+    def forked_pool(self, monkeypatch):
+        # Forked workers inherit this test's stubs; spawned ones would not.
+        monkeypatch.setattr(ocr_extract, "_OCR_POOL_START_METHOD", "fork")
+        ocr_extract._discard_ocr_pool()
+        yield
+        ocr_extract._discard_ocr_pool()
+
+    @pytest.mark.skipif("OCR_WORKERS" in os.environ, reason="OCR_WORKERS overrides the default")
+    def test_workers_default_to_sequential(self):
+        assert ocr_extract._OCR_WORKERS == 1
+        assert ocr_extract._resolve_ocr_workers(None, 8) == 1
+
+    def test_pool_is_spawned_once_and_shared(self):
+        ocr_extract._discard_ocr_pool()
+        try:
+            pool = ocr_extract._get_ocr_pool(2)
+            assert ocr_extract._get_ocr_pool(4) is pool
+            if "OCR_POOL_START_METHOD" not in os.environ:
+                assert pool._mp_context.get_start_method() == "spawn"
+        finally:
+            ocr_extract._discard_ocr_pool()
+
+    def test_parallel_matches_sequential(self, stub_page_ocr, forked_pool):
+        data = make_multipage_pdf(5)
+        sequential = ocr_extract._extract_text_ocr(data, workers=1)
+        parallel = ocr_extract._extract_text_ocr(data, workers=3)
+        # RSS is sampled per process and legitimately differs.
+        for _, pages, _ in (sequential, parallel):
+            for page in pages:
+                for name in ocr_extract._RSS_METADATA:
+                    page["metadata"].pop(name)
+        assert parallel == sequential
+        assert ocr_extract._OCR_POOL is not None
+
+    def test_broken_pool_is_replaced(self, monkeypatch, stub_page_ocr, forked_pool):
+        from concurrent.futures.process import BrokenProcessPool
+
+        pool = ocr_extract._get_ocr_pool(2)
+
+        def broken(*args, **kwargs):
+            raise BrokenProcessPool("worker killed")
+
+        monkeypatch.setattr(pool, "submit", broken)
+        _, pages, _ = ocr_extract._extract_text_ocr(make_multipage_pdf(2), workers=2)
+        assert [page["text"] for page in pages] == ["page 1 text", "page 2 text"]
+        assert ocr_extract._OCR_POOL is None
+
+    def test_failed_page_does_not_abort_document(self, monkeypatch, stub_page_ocr):
+        def flaky(images, page_numbers, batch_id):
+            if 2 in page_numbers:
+                raise RuntimeError("render exploded")
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", flaky)
+        text, pages, engine = ocr_extract._extract_text_ocr(make_multipage_pdf(3), workers=1)
+        assert pages[1]["error"] == "render exploded"
+        assert pages[1]["engine"] == engine
+        assert "page 3 text" in text
+
+    def test_unreadable_pdf(self):
+        assert ocr_extract._extract_text_ocr(b"not a pdf", workers=1) == ("", [], "none")
+
+    def test_tesseract_only_pages_are_not_batched(self, monkeypatch):
+        monkeypatch.setenv("ENABLE_PADDLEOCR", "0")
+        assert ocr_extract._ocr_page_batches([0, 1, 2], 1) == [[0], [1], [2]]
+
+    def test_paddle_batches_shrink_to_keep_workers_busy(self, monkeypatch):
+        monkeypatch.setenv("ENABLE_PADDLEOCR", "1")
+        monkeypatch.setattr(ocr_extract, "_PADDLE_BATCH_SIZE", 4)
+        assert ocr_extract._ocr_page_batches(list(range(6)), 1) == [[0, 1, 2, 3], [4, 5]]
+        assert ocr_extract._ocr_page_batches(list(range(6)), 3) == [[0, 1], [2, 3], [4, 5]]
+
+    def test_worker_count_is_bounded_by_pages(self):
+        assert ocr_extract._resolve_ocr_workers(8, 2) == 2
+        assert ocr_extract._resolve_ocr_workers(0, 5) == 1
+
+
+# ---------------------------------------------------------------------------
+# Shared OpenedPdf handle
+# ---------------------------------------------------------------------------
+
+TEXT_PAGE = "Item | Qty | Rate\nLaptop | 10 | 45000\nMouse | 20 | 500\nMonitor | 5 | 12000\nKeyboard | 15 | 800"
+
+
+def make_text_pdf(text: str = TEXT_PAGE) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestOpenedPdf:
+    """Verify detection and extraction share one parse per document."""
+
+    def test_each_parser_opens_once(self, monkeypatch):
+        from ocr import document
+
+        data = make_text_pdf()
+        counts = {"fitz": 0, "pdfplumber": 0}
+        real_fitz_open = document.fitz.open
+        real_plumber_open = document.pdfplumber.open
+
+        def counting_fitz_open(*args, **kwargs):
+            counts["fitz"] += 1
+            return real_fitz_open(*args, **kwargs)
+
+        def counting_plumber_open(*args, **kwargs):
+            counts["pdfplumber"] += 1
+            return real_plumber_open(*args, **kwargs)
+
+        monkeypatch.setattr(document.fitz, "open", counting_fitz_open)
+        monkeypatch.setattr(document.pdfplumber, "open", counting_plumber_open)
+        monkeypatch.setattr(ocr_extract, "get_result_cache", lambda: None)
+
+        with document.open_pdf(data) as doc:
+            assert not doc.is_encrypted
+            result = ocr_extract.extract_pdf_content(doc)
+
+        assert result["engine"] == "pdfplumber"
+        assert "Laptop" in result["text"]
+        assert counts == {"fitz": 1, "pdfplumber": 1}
+
+    def test_bytes_and_handle_give_same_result(self, monkeypatch):
+        from ocr.document import open_pdf
+
+        monkeypatch.setattr(ocr_extract, "get_result_cache", lambda: None)
+        data = make_text_pdf()
+        with open_pdf(data) as doc:
+            from_handle = ocr_extract.extract_pdf_content(doc)
+        assert ocr_extract.extract_pdf_content(data) == from_handle
+
+    def test_unreadable_bytes_are_not_encrypted(self):
+        from ocr.document import open_pdf
+
+        with open_pdf(b"not a pdf") as doc:
+            assert doc.is_encrypted is False
+            assert doc.fitz_doc is None
+
+
+TABLE_ROWS = [
+    ["Description", "Qty", "Rate", "Amount"],
+    ["Laptop", "10", "45000", "450000"],
+    ["Mouse", "20", "500", "10000"],
+]
+
+
+def make_table_pdf(rows: list[list[str]] = TABLE_ROWS) -> bytes:
+    """A page with free text above and below a ruled table."""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 60), "Invoice No: INV-7")
+    edges, top, height = [72, 250, 330, 420, 520], 90, 20
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            page.insert_text((edges[c] + 4, top + r * height + 14), cell)
+    bottom = top + len(rows) * height
+    for r in range(len(rows) + 1):
+        page.draw_line((edges[0], top + r * height), (edges[-1], top + r * height))
+    for x in edges:
+        page.draw_line((x, top), (x, bottom))
+    page.insert_text((72, bottom + 30), "Grand Total: 460000")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestTableExtraction:
+    """Embedded tables appear once and reach the parser as rows of cells."""
+
+    def test_structured_mode_emits_each_table_once(self):
+        from ocr.document import open_pdf
+
+        with open_pdf(make_table_pdf()) as doc:
+            text, pages = ocr_extract._extract_text_pdfplumber(doc)
+
+        assert text.count("Laptop") == 1
+        assert "Laptop | 10 | 45000 | 450000" in text
+        page = pages[0]
+        assert page["tables"] == [{"rows": TABLE_ROWS}]
+        assert "Laptop" not in page["text_outside_tables"]
+        assert "Grand Total: 460000" in page["text_outside_tables"]
+
+    def test_structured_mode_keeps_tables_in_reading_order(self):
+        from ocr.document import open_pdf
+
+        with open_pdf(make_table_pdf()) as doc:
+            text, _ = ocr_extract._extract_text_pdfplumber(doc)
+
+        assert text.index("Invoice No: INV-7") < text.index("Laptop") < text.index("Grand Total")
+
+    def test_legacy_mode_repeats_tables(self, monkeypatch):
+        from ocr.document import open_pdf
+
+        monkeypatch.setattr(ocr_extract, "_TABLE_MODE", "legacy")
+        with open_pdf(make_table_pdf()) as doc:
+            text, pages = ocr_extract._extract_text_pdfplumber(doc)
+
+        assert text.count("Laptop") == 2
+        assert "tables" not in pages[0]
+
+    def test_only_legacy_mode_keeps_cell_whitespace(self, monkeypatch):
+        raw_tables = [[["Laptop\nPro", " 10 ", None]]]
+
+        class _Doc:
+            plumber_page_count = 1
+
+            def plumber_page_text(self, index):
+                return ""
+
+            def plumber_page_tables(self, index):
+                return raw_tables
+
+            def plumber_page_layout(self, index):
+                return raw_tables
+
+        assert ocr_extract._extract_text_pdfplumber(_Doc())[0] == "Laptop Pro | 10"
+        monkeypatch.setattr(ocr_extract, "_TABLE_MODE", "legacy")
+        assert ocr_extract._extract_text_pdfplumber(_Doc())[0] == "Laptop\nPro | 10"
+
+    def test_layouts_are_read_only_for_requested_pages(self):
+        from ocr.document import open_pdf
+
+        with open_pdf(make_mixed_pdf([True, True, True])) as doc:
+            _, pages = ocr_extract._extract_text_pdfplumber(doc, [1])
+            assert set(doc._plumber_layouts) == {1}
+            assert set(doc._plumber_texts) == {1}
+        assert [page["page_number"] for page in pages] == [2]
+
+    def test_pages_parse_from_cells(self):
+        from ocr.document import open_pdf
+        from parser import build_structured_document
+
+        with open_pdf(make_table_pdf()) as doc:
+            _, pages = ocr_extract._extract_text_pdfplumber(doc)
+        structured = build_structured_document(pages)
+
+        assert [(item["item"], item["qty"], item["total"]) for item in structured["line_items"]] == [
+            ("laptop", 10, 450000),
+            ("mouse", 20, 10000),
+        ]
+        assert {item["parse_strategy"] for item in structured["line_items"]} == {"table"}
+        assert structured["skipped_rows"] == []
+        assert structured["totals"]["grand_total"] == 460000
+
+
+def make_mixed_pdf(text_pages: list[bool]) -> bytes:
+    doc = fitz.open()
+    for has_text in text_pages:
+        page = doc.new_page()
+        if has_text:
+            page.insert_text((72, 72), TEXT_PAGE)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestDetectPdfType:
+    """Fast detection must agree with full detection while reading less."""
+
+    def test_fast_and_full_agree_on_document_type(self):
+        from ocr.detect_pdf_type import detect_pdf_type
+
+        for data in (make_text_pdf(), make_multipage_pdf(3), make_mixed_pdf([True, False, True])):
+            fast = detect_pdf_type(data, mode="fast")
+            full = detect_pdf_type(data, mode="full")
+            assert fast["pdf_type"] == full["pdf_type"]
+            assert fast["page_count"] == full["page_count"]
+            assert [p["page_type"] for p in fast["pages"]] == [p["page_type"] for p in full["pages"]]
+
+    def test_fast_mode_skips_text_of_pages_without_fonts(self):
+        from ocr.document import open_pdf
+        from ocr.detect_pdf_type import detect_pdf_type
+
+        with open_pdf(make_multipage_pdf(4)) as doc:
+            result = detect_pdf_type(doc, mode="fast")
+            assert doc._fitz_texts == {}
+        assert result["pdf_type"] == "scanned"
+        assert result["pages_read"] == 0
+        assert {p["page_type"] for p in result["pages"]} == {"scanned"}
+
+    def test_fast_mode_stops_once_threshold_is_met(self):
+        from ocr.detect_pdf_type import detect_pdf_type
+
+        result = detect_pdf_type(make_mixed_pdf([True, True, True]), mode="fast")
+        assert result["pdf_type"] == "text"
+        assert result["pages_read"] == 1
+        assert [p["chars"] is None for p in result["pages"]] == [False, True, True]
+        assert {p["page_type"] for p in result["pages"]} == {"text"}
+
+    def test_mixed_document_classifies_each_page(self):
+        from ocr.detect_pdf_type import detect_pdf_type
+
+        result = detect_pdf_type(make_mixed_pdf([True, False, False]), mode="fast")
+        assert [p["page_type"] for p in result["pages"]] == ["text", "scanned", "scanned"]
+
+
+class TestHybridExtraction:
+    """Only pages without embedded text should be rendered and OCR'd."""
+
+    @pytest.fixture
+    def ocr_calls(self, monkeypatch, stub_page_ocr):
+        calls: list[int] = []
+
+        def recording_ocr(images, page_numbers, batch_id):
+            calls.extend(page_numbers)
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", recording_ocr)
+        monkeypatch.setattr(ocr_extract, "get_result_cache", lambda: None)
+        monkeypatch.setattr(ocr_extract, "_OCR_WORKERS", 1)
+        return calls
+
+    def test_mixed_document_ocrs_only_image_pages(self, ocr_calls):
+        result = ocr_extract.extract_pdf_content(make_mixed_pdf([True, False, True]))
+
+        assert ocr_calls == [2]
+        assert result["pdf_type"] == "mixed"
+        assert result["engine"] == "hybrid"
+        assert [page["page_number"] for page in result["pages"]] == [1, 2, 3]
+        assert [page["engine"] for page in result["pages"]] == ["pdfplumber", "pytesseract", "pdfplumber"]
+        assert result["text"].index("Laptop") < result["text"].index("page 2 text")
+
+    def test_image_pages_skip_table_extraction(self, ocr_calls):
+        from ocr.document import open_pdf
+
+        with open_pdf(make_mixed_pdf([True, False, True])) as doc:
+            ocr_extract.extract_pdf_content(doc)
+            assert set(doc._plumber_layouts) == {0, 2}
+
+    def test_results_with_failed_pages_are_not_cached(self, monkeypatch, ocr_calls):
+        stored = []
+
+        class _Cache:
+            def get(self, key):
+                return None
+
+            def put(self, key, value):
+                stored.append(value)
+
+        def flaky(images, page_numbers, batch_id):
+            if 2 in page_numbers:
+                raise MemoryError("render exploded")
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "get_result_cache", _Cache)
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", flaky)
+        result = ocr_extract.extract_pdf_content(make_multipage_pdf(3))
+        assert "error" not in result
+        assert result["pages"][1]["error"] == "render exploded"
+        assert stored == []
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", _fake_ocr_rendered_pages)
+        ocr_extract.extract_pdf_content(make_multipage_pdf(3))
+        assert len(stored) == 1
+
+    def test_text_document_skips_ocr(self, ocr_calls):
+        result = ocr_extract.extract_pdf_content(make_mixed_pdf([True, True]))
+
+        assert ocr_calls == []
+        assert result["pdf_type"] == "text"
+        assert result["engine"] == "pdfplumber"
+
+    def test_scanned_document_ocrs_every_page(self, ocr_calls):
+        result = ocr_extract.extract_pdf_content(make_multipage_pdf(2))
+
+        assert ocr_calls == [1, 2]
+        assert result["pdf_type"] == "scanned"
+        assert result["engine"] == "pytesseract"
+
+
+class TestIterPdfPages:
+    """Pages stream out in order, each extracted only when requested."""
+
+    @pytest.fixture
+    def ocr_calls(self, monkeypatch, stub_page_ocr):
+        calls: list[int] = []
+
+        def recording_ocr(images, page_numbers, batch_id):
+            calls.extend(page_numbers)
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", recording_ocr)
+        monkeypatch.setattr(ocr_extract, "get_result_cache", lambda: None)
+        return calls
+
+    def test_pages_are_routed_and_yielded_in_order(self, ocr_calls):
+        pages = list(ocr_extract.iter_pdf_pages(make_mixed_pdf([True, False, True])))
+
+        assert ocr_calls == [2]
+        assert [page["page_number"] for page in pages] == [1, 2, 3]
+        assert [page["engine"] for page in pages] == ["pdfplumber", "pytesseract", "pdfplumber"]
+        assert "Laptop" in pages[0]["text"]
+
+    def test_pages_are_ocrd_lazily(self, ocr_calls):
+        pages = ocr_extract.iter_pdf_pages(make_multipage_pdf(3))
+
+        assert next(pages)["page_number"] == 1
+        assert ocr_calls == [1]
+        pages.close()
+        assert ocr_calls == [1]
+
+    def test_failed_ocr_keeps_thin_text_layer(self, monkeypatch, ocr_calls):
+        def failing_ocr(images, page_numbers, batch_id):
+            raise RuntimeError("no engine")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", failing_ocr)
+        monkeypatch.setattr(ocr_extract, "_MIN_PAGE_TEXT_CHARS", 10_000)
+        pages = list(ocr_extract.iter_pdf_pages(make_text_pdf()))
+
+        assert pages[0]["engine"] == "pdfplumber"
+        assert "Laptop" in pages[0]["text"]
+
+    def test_failed_ocr_page_names_an_engine(self, monkeypatch, ocr_calls):
+        def failing_ocr(images, page_numbers, batch_id):
+            raise RuntimeError("no engine")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", failing_ocr)
+        page = next(ocr_extract.iter_pdf_pages(make_multipage_pdf(1)))
+
+        assert page["error"]
+        assert (page["engine"], page["confidence"]) == ("pytesseract", 0.0)
+
+    def test_text_pages_are_read_one_at_a_time(self, ocr_calls):
+        from ocr.document import open_pdf
+
+        with open_pdf(make_mixed_pdf([True, True, True])) as doc:
+            pages = ocr_extract.iter_pdf_pages(doc)
+            assert "Laptop" in next(pages)["text"]
+            assert set(doc._plumber_layouts) == {0}
+            assert set(doc._plumber_texts) <= {0}
+            next(pages)
+            assert set(doc._plumber_layouts) == {0, 1}
+            pages.close()
+
+    def test_cached_result_is_replayed(self, monkeypatch, ocr_calls):
+        class _Cache:
+            def get(self, key):
+                return {"pages": [_fake_ocr_page(1)]}
+
+        monkeypatch.setattr(ocr_extract, "get_result_cache", _Cache)
+        assert list(ocr_extract.iter_pdf_pages(make_multipage_pdf(1))) == [_fake_ocr_page(1)]
+        assert ocr_calls == []
+
+    def test_encrypted_pdf_raises(self, ocr_calls):
+        doc = fitz.open()
+        doc.new_page()
+        data = doc.tobytes(encryption=fitz.PDF_ENCRYPT_AES_256, owner_pw="owner", user_pw="user")
+        doc.close()
+
+        with pytest.raises(ValueError):
+            list(ocr_extract.iter_pdf_pages(data))
+
+    def test_empty_input_yields_nothing(self):
+        assert list(ocr_extract.iter_pdf_pages(b"")) == []
+
+
+class _FakePaddle:
+    """Stands in for a PaddleOCR 3.x instance: ``predict`` takes an array or a list."""
+
+    def __init__(self, drop_from_batches: bool = False):
+        self.calls: list = []
+        self.drop_from_batches = drop_from_batches
+
+    def predict(self, images, use_textline_orientation=False, return_word_box=False):
+        self.calls.append(len(images) if isinstance(images, list) else "single")
+        if isinstance(images, list):
+            results = [{"shape": image.shape} for image in images]
+            return results[:-1] if self.drop_from_batches else results
+        return [{"shape": images.shape}]
+
+
+class TestPaddleBatching:
+    """Verify batched PaddleOCR calls are split back into per-page results."""
+
+    @pytest.fixture
+    def fake_paddle(self, monkeypatch):
+        def install(**kwargs):
+            from ocr.engine_pool import OcrEnginePool
+
+            fake = _FakePaddle(**kwargs)
+            monkeypatch.setenv("ENABLE_PADDLEOCR", "1")
+            monkeypatch.setattr(ocr_extract, "_PADDLE_POOL", OcrEnginePool(lambda: fake, size=1))
+            monkeypatch.setattr(ocr_extract, "_PADDLE_OCR_RUNNER_NAME", "uninitialized")
+            monkeypatch.setattr(ocr_extract, "_PADDLE_OCR_RUNNER_KWARGS", {})
+            monkeypatch.setattr(ocr_extract, "_PADDLE_WORD_BOX_SUPPORTED", False)
+            monkeypatch.setattr(ocr_extract, "_PADDLE_BATCH_SIZE", 2)
+            return fake
+
+        return install
+
+    @staticmethod
+    def _images(count: int) -> list:
+        from PIL import Image
+
+        return [Image.new("L", (10 + index, 10)) for index in range(count)]
+
+    def test_pages_are_sent_in_batches(self, fake_paddle):
+        fake = fake_paddle()
+        results, method_name = ocr_extract._run_paddle_ocr_batch(self._images(5))
+
+        assert method_name == "predict"
+        assert fake.calls == [2, 2, "single"]
+        assert [result[0]["shape"][1] for result in results] == [10, 11, 12, 13, 14]
+        assert ocr_extract._PADDLE_OCR_RUNNER_KWARGS == {"use_textline_orientation": True}
+        assert ocr_extract._PADDLE_WORD_BOX_SUPPORTED is True
+
+    def test_mismatched_batch_falls_back_per_page(self, fake_paddle):
+        fake = fake_paddle(drop_from_batches=True)
+        results, _ = ocr_extract._run_paddle_ocr_batch(self._images(2))
+
+        assert fake.calls == [2, "single", "single"]
+        assert [result[0]["shape"][1] for result in results] == [10, 11]
+
+
+class _FakeLayoutPaddle:
+    """Recognises a known tall page: reports every text line lying whole inside
+    the image it is given, plus a clipped fragment for lines cut at its edges."""
+
+    def __init__(self, page, lines):
+        self.page = page
+        self.lines = lines  # (top, bottom, words) in page rows
+        self.calls: list = []
+
+    def _top_of(self, array) -> int:
+        for top in range(self.page.shape[0] - array.shape[0] + 1):
+            if (self.page[top] == array[0]).all() and (self.page[top + array.shape[0] - 1] == array[-1]).all():
+                return top
+        raise AssertionError("input is not a slice of the page")
+
+    def _recognise(self, array) -> dict:
+        top = self._top_of(array[:, :, 0])
+        bottom = top + array.shape[0]
+        texts, scores, polys = [], [], []
+        for line_top, line_bottom, words in self.lines:
+            if line_bottom <= top or line_top >= bottom:
+                continue
+            whole = top <= line_top and line_bottom <= bottom
+            y0, y1 = max(line_top, top) - top, min(line_bottom, bottom) - top
+            for index, word in enumerate(words):
+                x0 = 20 + index * 120
+                texts.append(word if whole else word[:2])
+                scores.append(0.95 if whole else 0.4)
+                polys.append([[x0, y0], [x0 + 100, y0], [x0 + 100, y1], [x0, y1]])
+        return {"rec_texts": texts, "rec_scores": scores, "dt_polys": polys}
+
+    def predict(self, images, use_textline_orientation=False, return_word_box=False):
+        batch = images if isinstance(images, list) else [images]
+        self.calls.append(len(batch))
+        return [self._recognise(array) for array in batch]
+
+
+INVOICE_LINES = [
+    "TAX INVOICE No. INV-2024-0193  Date: 12/03/2024",
+    "Bill To: Acme Industries Pvt Ltd, Bangalore 560001",
+    "Item            Qty      Rate       Amount",
+    "Laptop Dell Latitude 5440   10   45,000.00   4,50,000.00",
+    "Wireless Mouse Logitech      20      500.00      10,000.00",
+    "Keyboard mechanical          15      800.00      12,000.00",
+    "Grand total payable within thirty days   6,27,760.00",
+]
+
+
+def make_scanned_page(rotation=None):
+    """A synthetic 150-DPI invoice scan as a BGR array, optionally rotated."""
+    cv2 = pytest.importorskip("cv2")
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("L", (1240, 1754), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=18)
+    y = 100
+    for _ in range(3):
+        for line in INVOICE_LINES:
+            draw.text((80, y), line, fill=0, font=font)
+            y += 30
+    page = cv2.cvtColor(np.array(image), cv2.COLOR_GRAY2BGR)
+    return page if rotation is None else cv2.rotate(page, rotation)
+
+
+class TestOrientationPrecheck:
+    """OSD should only run when the projection-profile check is unsure."""
+
+    def test_upright_page_is_recognised(self):
+        assert ocr_extract._looks_upright(make_scanned_page()) is True
+
+    def test_rotated_and_blank_pages_are_uncertain(self):
+        cv2 = pytest.importorskip("cv2")
+        import numpy as np
+
+        for rotation in (cv2.ROTATE_180, cv2.ROTATE_90_CLOCKWISE, cv2.ROTATE_90_COUNTERCLOCKWISE):
+            assert ocr_extract._looks_upright(make_scanned_page(rotation)) is False
+        assert ocr_extract._looks_upright(np.full((400, 300, 3), 255, dtype=np.uint8)) is False
+
+    def test_upright_page_skips_osd(self, monkeypatch):
+        monkeypatch.setattr(ocr_extract.tesseract_backend, "detect_orientation", pytest.fail)
+        page = make_scanned_page()
+        meta: dict = {}
+        assert ocr_extract._correct_orientation(page, 1, "batch", meta) is page
+        assert meta == {"osd_skipped": 1, "osd_executed": 0}
+
+    def test_uncertain_page_runs_osd(self, monkeypatch):
+        cv2 = pytest.importorskip("cv2")
+
+        monkeypatch.setattr(ocr_extract.tesseract_backend, "detect_orientation", lambda image: {"rotate": 180})
+        page = make_scanned_page(cv2.ROTATE_180)
+        meta: dict = {}
+        corrected = ocr_extract._correct_orientation(page, 1, "batch", meta)
+        assert meta == {"osd_skipped": 0, "osd_executed": 1}
+        assert ocr_extract._looks_upright(corrected) is True
+
+
+def _skew(page, degrees: float):
+    cv2 = pytest.importorskip("cv2")
+
+    height, width = page.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), degrees, 1.0)
+    return cv2.warpAffine(page, matrix, (width, height), borderValue=(255, 255, 255))
+
+
+class TestProxyPreprocessing:
+    """Proxy geometry should crop and level the page like the full pipeline."""
+
+    @staticmethod
+    def _full_geometry(page):
+        cv2 = pytest.importorskip("cv2")
+
+        image = ocr_extract._resize_long_edge(page, ocr_extract._WORKING_LONG_EDGE)
+        image = ocr_extract._crop_main_document_region(image)
+        image = ocr_extract._crop_text_region(image)
+        return cv2.cvtColor(ocr_extract._deskew_image(image), cv2.COLOR_BGR2GRAY)
+
+    def test_proxy_matches_full_crop_size(self):
+        page = _skew(make_scanned_page(), 2.0)
+        full = self._full_geometry(page)
+        proxy = ocr_extract._crop_and_deskew_via_proxy(page)
+        assert abs(proxy.shape[0] - full.shape[0]) <= 0.1 * full.shape[0]
+        assert abs(proxy.shape[1] - full.shape[1]) <= 0.1 * full.shape[1]
+
+    def test_proxy_output_is_level(self):
+        cv2 = pytest.importorskip("cv2")
+
+        proxy = ocr_extract._crop_and_deskew_via_proxy(_skew(make_scanned_page(), 2.0))
+        assert ocr_extract._skew_angle(cv2.cvtColor(proxy, cv2.COLOR_GRAY2BGR)) == 0.0
+
+    def test_level_page_is_cropped_without_warping(self):
+        page = make_scanned_page()
+        proxy = ocr_extract._crop_and_deskew_via_proxy(page)
+        full = self._full_geometry(page)
+        assert proxy.shape[0] <= page.shape[0] and proxy.shape[1] < page.shape[1]
+        assert abs(proxy.shape[1] - full.shape[1]) <= 0.1 * full.shape[1]
+
+    def test_proxy_mode_produces_binarised_page(self, monkeypatch):
+        from PIL import Image
+
+        monkeypatch.setattr(ocr_extract, "_ORIENTATION_PRECHECK", True)
+        page = Image.fromarray(make_scanned_page()[:, :, ::-1])
+        full = ocr_extract._preprocess_for_ocr(page, 1, "batch", {})
+        monkeypatch.setattr(ocr_extract, "_PREPROCESS_MODE", "proxy")
+        proxy = ocr_extract._preprocess_for_ocr(page, 1, "batch", {})
+        assert proxy.mode == full.mode == "L"
+        assert abs(proxy.width - full.width) <= 0.1 * full.width
+        assert abs(proxy.height - full.height) <= 0.1 * full.height
+
+
+# ---------------------------------------------------------------------------
+# Adaptive render DPI
+# ---------------------------------------------------------------------------
+
+def make_lined_pdf(width: float, height: float, fontsize: float) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page(width=width, height=height)
+    y = 72.0
+    while y < height - 72:
+        page.insert_text((72, y), "Widget 12 x 45.00 = 540.00 Invoice Total", fontsize=fontsize)
+        y += fontsize * 1.3
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _open_pdfium(data: bytes):
+    from io import BytesIO
+
+    import pypdfium2 as pdfium
+
+    return pdfium.PdfDocument(BytesIO(data))
+
+
+class TestAdaptiveRenderDpi:
+    """Pages render at the DPI their text needs, re-rendering on low confidence."""
+
+    def test_large_format_page_renders_fewer_bytes(self, monkeypatch):
+        monkeypatch.setattr(ocr_extract, "_RENDER_PIXEL_BUDGET", 10**9)
+        pdf = _open_pdfium(make_lined_pdf(1224, 792, 10))
+        _, adaptive = ocr_extract._render_pdf_page(pdf, 0)
+        monkeypatch.setattr(ocr_extract, "_ADAPTIVE_DPI", False)
+        _, fixed = ocr_extract._render_pdf_page(pdf, 0)
+        assert fixed["render_dpi"] == ocr_extract._RENDER_DPI
+        assert adaptive["render_dpi"] <= adaptive["max_render_dpi"] < ocr_extract._RENDER_DPI
+        assert adaptive["render_bytes"] < fixed["render_bytes"] / 3
+
+    def test_large_text_renders_at_lower_dpi(self):
+        small = ocr_extract._render_pdf_page(_open_pdfium(make_lined_pdf(595, 842, 10)), 0)[1]
+        large = ocr_extract._render_pdf_page(_open_pdfium(make_lined_pdf(595, 842, 16)), 0)[1]
+        assert large["line_height_pt"] > small["line_height_pt"]
+        assert large["render_dpi"] < small["render_dpi"]
+
+    def test_blank_page_renders_at_maximum(self):
+        _, info = ocr_extract._render_pdf_page(_open_pdfium(make_multipage_pdf(1)), 0)
+        assert info["line_height_pt"] is None
+        assert info["render_dpi"] == info["max_render_dpi"]
+
+    def test_low_confidence_page_is_rerendered(self, monkeypatch):
+        widths = []
+
+        def width_sensitive_ocr(images, page_numbers, batch_id):
+            widths.extend(image.width for image in images)
+            return [
+                {**_fake_ocr_page(page_number), "confidence": 0.9 if len(widths) > 1 else 0.3}
+                for image, page_number in zip(images, page_numbers)
+            ]
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", width_sensitive_ocr)
+        pdf = _open_pdfium(make_lined_pdf(595, 842, 20))
+        page = ocr_extract._ocr_pdf_pages(pdf, [0], "batch")[0]
+        assert len(widths) == 2 and widths[1] > widths[0]
+        assert page["confidence"] == 0.9
+        assert page["metadata"]["rerendered"] is True
+        assert page["metadata"]["render_dpi"] == page["metadata"]["max_render_dpi"]
+
+    def test_confident_page_is_not_rerendered(self, monkeypatch):
+        calls = []
+
+        def confident_ocr(images, page_numbers, batch_id):
+            calls.append(page_numbers)
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", confident_ocr)
+        page = ocr_extract._ocr_pdf_pages(_open_pdfium(make_lined_pdf(595, 842, 20)), [0], "batch")[0]
+        assert calls == [[1]]
+        assert "rerendered" not in page["metadata"]
+
+
+# ---------------------------------------------------------------------------
+# Memory-bounded rendering
+# ---------------------------------------------------------------------------
+
+class TestStripRendering:
+    """Pages over the pixel budget render as grayscale strips."""
+
+    def test_strips_match_single_grayscale_render(self, monkeypatch):
+        import numpy as np
+
+        monkeypatch.setattr(ocr_extract, "_ADAPTIVE_DPI", False)
+        monkeypatch.setattr(ocr_extract, "_RENDER_PIXEL_BUDGET", 1_000_000)
+        pdf = _open_pdfium(make_lined_pdf(842, 1191, 10))
+        image, info = ocr_extract._render_pdf_page(pdf, 0)
+
+        assert image.mode == "L"
+        assert info["render_strips"] > 1
+        assert info["render_bytes"] == image.width * image.height
+        reference = pdf[0].render(scale=ocr_extract._RENDER_DPI / 72, grayscale=True).to_numpy()
+        reference = reference[:, :, 0] if reference.ndim == 3 else reference
+        assert np.array_equal(np.asarray(image), reference)
+
+    def test_pages_within_budget_render_in_color(self):
+        image, info = ocr_extract._render_pdf_page(_open_pdfium(make_multipage_pdf(1)), 0)
+        assert image.mode != "L"
+        assert info["render_strips"] == 1
+
+    def test_grayscale_page_preprocesses_like_color_page(self):
+        from PIL import Image
+
+        pytest.importorskip("cv2")
+        page = make_scanned_page()
+        color = ocr_extract._preprocess_for_ocr(Image.fromarray(page[:, :, ::-1]), 1, "batch", {})
+        gray = ocr_extract._preprocess_for_ocr(Image.fromarray(page[:, :, ::-1]).convert("L"), 1, "batch", {})
+        assert gray.size == color.size
+
+    def test_peak_rss_is_recorded_per_page(self, stub_page_ocr):
+        _, pages, _ = ocr_extract._extract_text_ocr(make_multipage_pdf(2), workers=1)
+        for page in pages:
+            assert "peak_rss_mb" in page["metadata"]
+            assert "rss_delta_mb" in page["metadata"]
+            if os.path.exists("/proc/self/statm"):
+                assert page["metadata"]["peak_rss_mb"] > 0
+
+    def test_rss_is_sampled_per_page_without_resetting_the_process_peak(self, monkeypatch, stub_page_ocr):
+        # Before and after rendering page 1, then page 2.
+        samples = iter([100.0, 150.0, 110.0, 120.0])
+        monkeypatch.setattr(ocr_extract, "_current_rss_mb", lambda: next(samples))
+
+        def ocr_with_samples(images, page_numbers, batch_id):
+            pages = _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+            for page in pages:
+                # Highest sample taken during preprocessing and OCR.
+                page["metadata"] = {"peak_rss_mb": 130.0 if page["page_number"] == 1 else 180.0}
+            return pages
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", ocr_with_samples)
+        real_open = open
+
+        def guarded_open(path, *args, **kwargs):
+            assert "clear_refs" not in str(path)
+            return real_open(path, *args, **kwargs)
+
+        monkeypatch.setattr("builtins.open", guarded_open)
+        _, pages, _ = ocr_extract._extract_text_ocr(make_multipage_pdf(2), workers=1)
+        assert [page["metadata"]["peak_rss_mb"] for page in pages] == [150.0, 180.0]
+        assert [page["metadata"]["rss_delta_mb"] for page in pages] == [50.0, 70.0]
+
+
+# ---------------------------------------------------------------------------
+# Stripe OCR for tall pages
+# ---------------------------------------------------------------------------
+
+class TestStripeOcr:
+    """Tall pages are OCR'd in overlapping stripes and merged without duplicates."""
+
+    @pytest.fixture
+    def tall_page(self, monkeypatch):
+        import numpy as np
+        from PIL import Image
+
+        from ocr.engine_pool import OcrEnginePool
+
+        rng = np.random.default_rng(0)
+        page = rng.integers(0, 256, size=(3000, 600), dtype=np.uint8)
+        lines = [(top, top + 40, [f"item{row}", f"{row}", f"{row * 10}.00"]) for row, top in enumerate(range(10, 2950, 60))]
+        fake = _FakeLayoutPaddle(page, lines)
+        monkeypatch.setenv("ENABLE_PADDLEOCR", "1")
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL", OcrEnginePool(lambda: fake, size=1))
+        monkeypatch.setattr(ocr_extract, "_PADDLE_OCR_RUNNER_NAME", "uninitialized")
+        monkeypatch.setattr(ocr_extract, "_PADDLE_OCR_RUNNER_KWARGS", {})
+        monkeypatch.setattr(ocr_extract, "_PADDLE_WORD_BOX_SUPPORTED", False)
+        return Image.fromarray(page), fake, lines
+
+    def test_short_pages_are_not_striped(self):
+        assert ocr_extract._stripe_bounds(1000, 1400) == []
+
+    def test_stripes_cover_page_and_owned_rows_partition_it(self):
+        bounds = ocr_extract._stripe_bounds(600, 3000)
+
+        assert len(bounds) > 1
+        assert bounds[0][0] == 0 and bounds[-1][1] == 3000
+        assert [own_top for _, _, own_top, _ in bounds[1:]] == [own_bottom for _, _, _, own_bottom in bounds[:-1]]
+        for (_, previous_bottom, _, _), (top, _, own_top, _) in zip(bounds, bounds[1:]):
+            assert previous_bottom - top >= 600 * ocr_extract._STRIPE_OVERLAP
+            assert top < own_top < previous_bottom
+
+    def test_striped_text_matches_whole_page(self, monkeypatch, tall_page):
+        image, fake, lines = tall_page
+        striped_text, striped_confidence = ocr_extract._ocr_pages_with_paddle([image])[0]
+        assert fake.calls == [ocr_extract._PADDLE_BATCH_SIZE] * (len(fake.calls) - 1) + [fake.calls[-1]]
+        assert sum(fake.calls) == len(ocr_extract._stripe_bounds(image.width, image.height))
+
+        monkeypatch.setattr(ocr_extract, "_STRIPE_OCR", False)
+        whole_text, whole_confidence = ocr_extract._ocr_pages_with_paddle([image])[0]
+
+        assert striped_text == whole_text
+        assert striped_confidence == whole_confidence
+        assert len(whole_text.splitlines()) == len(lines)
+
+    def test_stripes_spread_across_pooled_engines(self, monkeypatch, tall_page):
+        from ocr.engine_pool import OcrEnginePool
+
+        image, fake, lines = tall_page
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL_SIZE", 2)
+        monkeypatch.setattr(ocr_extract, "_PADDLE_BATCH_SIZE", 1)
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL", OcrEnginePool(lambda: fake, size=2))
+        text, _ = ocr_extract._ocr_pages_with_paddle([image])[0]
+
+        rows = text.splitlines()
+        assert len(rows) == len(lines)
+        assert rows[0] == "item 0 0 0.00" and rows[-1] == "item 48 48 480.00"
+
+
+def _entry(text: str, x: float, y: float, width: float = 60.0, height: float = 20.0, confidence: float = 0.9) -> dict:
+    box = [[x, y], [x + width, y], [x + width, y + height], [x, y + height]]
+    return {"text": text, "confidence": confidence, "box": box}
+
+
+class TestGroupPaddleLines:
+    def test_rows_are_grouped_by_y_and_ordered_by_x(self):
+        entries = [
+            _entry("45000", 400, 103),
+            _entry("Laptop", 10, 100),
+            _entry("Total", 10, 160),
+            _entry("qty5", 200, 98),
+            _entry("90000", 400, 161),
+        ]
+        lines, confidences, average = ocr_extract._group_paddle_lines(entries)
+        assert lines == ["Laptop qty 5 45000", "Total 90000"]
+        assert confidences == [0.9] * 5
+        assert average == 0.9
+
+    def test_boxless_and_empty_entries(self):
+        entries = [
+            {"text": "footer note", "confidence": 0.5, "box": None},
+            _entry("   ", 10, 10, confidence=0.1),
+            _entry("Header", 10, 10, confidence=0.7),
+        ]
+        lines, confidences, average = ocr_extract._group_paddle_lines(entries)
+        assert lines == ["Header", "footer note"]
+        assert confidences == [0.5, 0.7]
+        assert average == 0.6
+
+    def test_threshold_follows_median_box_height(self):
+        # 60 px boxes give the 40 px cap; 20 px apart stays on one row.
+        tall = [_entry("A", 10, 100, height=60), _entry("B", 100, 120, height=60)]
+        assert ocr_extract._group_paddle_lines(tall)[0] == ["A B"]
+        # 10 px boxes give the 8 px floor; the same offset splits the row.
+        short = [_entry("A", 10, 100, height=10), _entry("B", 100, 120, height=10)]
+        assert ocr_extract._group_paddle_lines(short)[0] == ["A", "B"]
+
+    def test_empty_result(self):
+        assert ocr_extract._group_paddle_lines([]) == ([], [], 0.0)
+        assert ocr_extract._group_paddle_lines(None) == ([], [], 0.0)
+
+
+class TestOcrDiagnostics:
+    """Per-box/per-row detail only while tracing; one summary record per page."""
+
+    @pytest.fixture
+    def entries(self):
+        return [_entry("Laptop", 10, 100), _entry("45000", 400, 100), _entry("Total", 10, 160)]
+
+    @staticmethod
+    def _detail_records(caplog):
+        return [record for record in caplog.records if "[OCR-ROW]" in record.message or "[OCR-DIAG]" in record.message]
+
+    def test_production_level_skips_detail(self, caplog, entries):
+        caplog.set_level("INFO", logger="ocr.extract")
+        text, _ = ocr_extract._paddle_entries_to_page_text(entries, "predict")
+        assert text == "Laptop 45000\nTotal"
+        assert self._detail_records(caplog) == []
+
+    def test_request_trace_logs_detail_at_info(self, caplog, entries):
+        from ocr import ocr_trace
+
+        caplog.set_level("INFO", logger="ocr.extract")
+        with ocr_trace():
+            ocr_extract._paddle_entries_to_page_text(entries, "predict")
+        detail = self._detail_records(caplog)
+        assert sum("[OCR-ROW]" in record.message for record in detail) == 2
+        assert {record.levelname for record in detail} == {"INFO"}
+
+        caplog.clear()
+        ocr_extract._paddle_entries_to_page_text(entries, "predict")
+        assert self._detail_records(caplog) == []
+
+    def test_debug_level_logs_detail(self, caplog, entries):
+        caplog.set_level("DEBUG", logger="ocr.extract")
+        ocr_extract._paddle_entries_to_page_text(entries, "predict")
+        assert {record.levelname for record in self._detail_records(caplog)} == {"DEBUG"}
+
+    def test_trace_follows_pooled_paddle_threads(self, monkeypatch):
+        from ocr.diagnostics import request_trace_enabled
+        from ocr import ocr_trace
+
+        seen = []
+
+        def fake_engine_run(images):
+            seen.append(request_trace_enabled())
+            return [None] * len(images), "predict"
+
+        monkeypatch.setattr(ocr_extract, "_paddle_enabled", lambda: True)
+        monkeypatch.setattr(ocr_extract, "_PADDLE_POOL_SIZE", 2)
+        monkeypatch.setattr(ocr_extract, "_PADDLE_BATCH_SIZE", 1)
+        monkeypatch.setattr(ocr_extract, "_run_paddle_ocr_on_engine", fake_engine_run)
+        with ocr_trace():
+            ocr_extract._run_paddle_ocr_batch([object(), object()])
+        ocr_extract._run_paddle_ocr_batch([object(), object()])
+        assert seen == [True, True, False, False]
+
+    def test_one_summary_record_per_page(self, caplog, stub_page_ocr):
+        caplog.set_level("INFO", logger="ocr.extract")
+        ocr_extract._extract_text_ocr(make_multipage_pdf(3), workers=1)
+        summaries = [record.message for record in caplog.records if record.message.startswith("[OCR-PAGE]")]
+        assert len(summaries) == 3
+        assert all("engine=pytesseract" in summary for summary in summaries)
+
+
+def encode_scan(image_format: str = "PNG", mode: str = "L") -> bytes:
+    """:func:`make_scanned_page` encoded as an image file."""
+    from io import BytesIO
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.fromarray(make_scanned_page()[:, :, 0]).convert(mode).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def make_image_pdf(image_bytes: bytes, with_text: str | None = None, rect=None) -> bytes:
+    """A page holding only *image_bytes*, followed by an optional text page."""
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.insert_image(rect or page.rect, stream=image_bytes)
+    if with_text:
+        doc.new_page(width=595, height=842).insert_text((72, 72), with_text, fontsize=12)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestPageCache:
+    """Identical page images skip preprocessing and OCR across documents."""
+
+    @pytest.fixture
+    def page_cache(self, monkeypatch, stub_page_ocr):
+        from ocr.cache import PageOcrCache
+
+        cache = PageOcrCache(max_entries=16, max_bytes=1_000_000)
+        monkeypatch.setattr(ocr_extract, "get_page_cache", lambda: cache)
+        ocr_calls: list[int] = []
+
+        def counting_ocr(images, page_numbers, batch_id):
+            ocr_calls.extend(page_numbers)
+            return _fake_ocr_rendered_pages(images, page_numbers, batch_id)
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", counting_ocr)
+        return cache, ocr_calls
+
+    @pytest.fixture
+    def letterhead_png(self):
+        return encode_scan()
+
+    def test_shared_image_page_skips_render_and_ocr(self, monkeypatch, page_cache, letterhead_png):
+        cache, ocr_calls = page_cache
+        ocr_extract._extract_text_ocr(make_image_pdf(letterhead_png), workers=1)
+        assert ocr_calls == [1]
+
+        renders: list[int] = []
+        real_render = ocr_extract._render_pdf_page
+        monkeypatch.setattr(
+            ocr_extract,
+            "_render_pdf_page",
+            lambda pdf, index, dpi=None: renders.append(index) or real_render(pdf, index, dpi),
+        )
+        ocr_calls.clear()
+        _, pages, _ = ocr_extract._extract_text_ocr(make_image_pdf(letterhead_png, with_text="Invoice 42"), workers=1)
+
+        assert renders == [1] and ocr_calls == [2]
+        assert pages[0]["text"] == "page 1 text" and pages[0]["metadata"]["page_cache_hit"] is True
+        assert "page_cache_hit" not in pages[1]["metadata"]
+        assert cache.stats()["hits"] == 1
+
+    def test_image_placement_is_part_of_the_key(self, page_cache, letterhead_png):
+        _, ocr_calls = page_cache
+        ocr_extract._extract_text_ocr(make_image_pdf(letterhead_png), workers=1)
+        ocr_extract._extract_text_ocr(make_image_pdf(letterhead_png, rect=fitz.Rect(0, 0, 400, 600)), workers=1)
+        assert ocr_calls == [1, 1]
+
+    def test_other_pages_keyed_by_rendered_bitmap(self, page_cache):
+        cache, ocr_calls = page_cache
+        ocr_extract._extract_text_ocr(make_text_pdf(), workers=1)
+        _, pages, _ = ocr_extract._extract_text_ocr(make_text_pdf(), workers=1)
+        assert ocr_calls == [1]
+        assert pages[0]["metadata"]["page_cache_hit"] is True
+        assert cache.stats()["entries"] == 1
+
+    def test_failed_pages_are_not_cached(self, monkeypatch, page_cache):
+        cache, _ = page_cache
+
+        def failing_ocr(images, page_numbers, batch_id):
+            raise RuntimeError("engine crashed")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_rendered_pages", failing_ocr)
+        ocr_extract._extract_text_ocr(make_text_pdf(), workers=1)
+        assert cache.stats()["entries"] == 0
+
+
+class TestEmbeddedImagePages:
+    """Single full-page images are decoded directly instead of rendered."""
+
+    @staticmethod
+    def _load(data: bytes, index: int = 0):
+        pdf = _open_pdfium(data)
+        try:
+            return ocr_extract._render_pdf_page(pdf, index)
+        finally:
+            pdf.close()
+
+    @pytest.mark.parametrize("image_format,mode", [("PNG", "L"), ("JPEG", "L"), ("JPEG", "RGB"), ("PNG", "1")])
+    def test_scan_page_decoded_at_native_resolution(self, image_format, mode):
+        import numpy as np
+
+        image, info = self._load(make_image_pdf(encode_scan(image_format, mode)))
+        assert info["render_source"] == "embedded_image"
+        assert image.mode == "L" and image.size == (1240, 1754)
+        assert info["render_dpi"] == pytest.approx(150, abs=0.5)
+        assert info["render_dpi"] == info["max_render_dpi"]
+        original = make_scanned_page()[:, :, 0].astype(int)
+        assert np.abs(np.asarray(image, dtype=int) - original).mean() < 3
+
+    @pytest.mark.parametrize("rotation", [90, 180, 270])
+    def test_page_rotation_matches_rendering(self, rotation):
+        import numpy as np
+
+        doc = fitz.open(stream=make_image_pdf(encode_scan()))
+        doc[0].set_rotation(rotation)
+        data = doc.tobytes()
+        doc.close()
+        image, info = self._load(data)
+        pdf = _open_pdfium(data)
+        rendered = pdf[0].render(scale=info["render_dpi"] / 72, grayscale=True).to_numpy()[:, :, 0]
+        pdf.close()
+        height, width = min(image.height, rendered.shape[0]), min(image.width, rendered.shape[1])
+        assert abs(image.height - rendered.shape[0]) <= 2 and abs(image.width - rendered.shape[1]) <= 2
+        assert np.abs(np.asarray(image, dtype=int)[:height, :width] - rendered[:height, :width]).mean() < 10
+
+    def test_other_pages_are_rendered(self, monkeypatch):
+        partial = make_image_pdf(encode_scan(), rect=fitz.Rect(0, 0, 400, 600))
+        assert self._load(partial)[1]["render_source"] == "pdfium"
+
+        doc = fitz.open(stream=make_image_pdf(encode_scan()))
+        doc[0].insert_text((72, 72), "Stamped copy", fontsize=12)
+        stamped = doc.tobytes()
+        doc.close()
+        assert self._load(stamped)[1]["render_source"] == "pdfium"
+
+        monkeypatch.setattr(ocr_extract, "_DIRECT_IMAGE", False)
+        assert self._load(make_image_pdf(encode_scan()))[1]["render_source"] == "pdfium"
+
+    def test_large_colour_images_fall_back_to_strip_rendering(self, monkeypatch):
+        monkeypatch.setattr(ocr_extract, "_RENDER_PIXEL_BUDGET", 1_000_000)
+        assert self._load(make_image_pdf(encode_scan("PNG", "RGB")))[1]["render_source"] == "pdfium"
+        # JPEG decodes straight to luma, so its size is not limited.
+        assert self._load(make_image_pdf(encode_scan("JPEG", "RGB")))[1]["render_source"] == "embedded_image"
+
+
+class _EngineStubs:
+    """Scripted PaddleOCR/Tesseract results per page image, with call logs."""
+
+    def __init__(self, monkeypatch, paddle: dict, tesseract: dict):
+        self.paddle, self.tesseract = paddle, tesseract
+        self.paddle_calls: list[list[str]] = []
+        self.tesseract_calls: list[str] = []
+        self.paddle_gate = None
+        monkeypatch.setattr(ocr_extract, "_paddle_available", lambda: True)
+        monkeypatch.setattr(ocr_extract, "_preprocess_for_ocr", lambda image, *args: image)
+        monkeypatch.setattr(ocr_extract, "_ocr_pages_with_paddle", self.run_paddle)
+        monkeypatch.setattr(ocr_extract, "_ocr_page_with_tesseract", self.run_tesseract)
+
+    def run_paddle(self, images):
+        self.paddle_calls.append([image.info["name"] for image in images])
+        if self.paddle_gate is not None:
+            self.paddle_gate.wait(5)
+        return [self.paddle[image.info["name"]] for image in images]
+
+    def run_tesseract(self, image):
+        self.tesseract_calls.append(image.info["name"])
+        return self.tesseract[image.info["name"]]
+
+
+def _named_page(name: str, header_box=(40, 40, 300, 160)):
+    from PIL import Image, ImageDraw
+
+    image = Image.new("L", (400, 560), 255)
+    ImageDraw.Draw(image).rectangle(header_box, fill=0)
+    image.info["name"] = name
+    return image
+
+
+GOOD = ("Laptop 2 45000 Total 90000", 0.93)
+LOW = ("12 34 56 78 90 12 34", 0.31)
+
+
+class TestEngineRace:
+    """OCR_ENGINE_MODE=race: first accepted result per page wins."""
+
+    @pytest.fixture(autouse=True)
+    def race_mode(self, monkeypatch):
+        monkeypatch.setattr(ocr_extract, "_ENGINE_MODE", "race")
+
+    def test_tesseract_wins_while_paddle_is_busy(self, monkeypatch):
+        import threading
+
+        stubs = _EngineStubs(monkeypatch, paddle={"p1": GOOD}, tesseract={"p1": ("Tesseract text here", 0.9)})
+        stubs.paddle_gate = threading.Event()
+        try:
+            pages = ocr_extract._ocr_rendered_pages([_named_page("p1")], [1], "race")
+        finally:
+            stubs.paddle_gate.set()
+        assert pages[0]["engine"] == "pytesseract"
+        assert pages[0]["text"] == "Tesseract text here"
+        assert pages[0]["metadata"]["ocr_strategy"] == "race"
+        assert pages[0]["metadata"]["engine_win"] == "pytesseract"
+
+    def test_rejected_result_waits_for_other_engine(self, monkeypatch):
+        stubs = _EngineStubs(monkeypatch, paddle={"p1": GOOD, "p2": LOW}, tesseract={"p1": LOW, "p2": GOOD})
+        pages = ocr_extract._ocr_rendered_pages([_named_page("p1"), _named_page("p2")], [1, 2], "race")
+        assert [page["engine"] for page in pages] == ["paddleocr", "pytesseract"]
+        assert stubs.paddle_calls == [["p1", "p2"]]
+
+    def test_neither_accepted_keeps_tesseract(self, monkeypatch):
+        _EngineStubs(monkeypatch, paddle={"p1": ("", 0.0)}, tesseract={"p1": LOW})
+        page = ocr_extract._ocr_rendered_pages([_named_page("p1")], [1], "race")[0]
+        assert (page["text"], page["confidence"], page["engine"]) == (*LOW, "pytesseract")
+        assert "engine_win" not in page["metadata"]
+
+    def test_tesseract_failure_keeps_paddle_result(self, monkeypatch):
+        from pytesseract import TesseractError
+
+        stubs = _EngineStubs(monkeypatch, paddle={"p1": GOOD, "p2": LOW}, tesseract={})
+
+        def broken(image):
+            stubs.tesseract_calls.append(image.info["name"])
+            raise TesseractError(1, "page unreadable")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_page_with_tesseract", broken)
+        pages = ocr_extract._ocr_rendered_pages([_named_page("p1"), _named_page("p2")], [1, 2], "race")
+        assert [(page["text"], page["engine"]) for page in pages] == [(GOOD[0], "paddleocr"), (LOW[0], "paddleocr")]
+        assert pages[0]["metadata"]["engine_win"] == "paddleocr"
+        assert "engine_win" not in pages[1]["metadata"]
+
+    def test_page_both_engines_fail_on_raises(self, monkeypatch):
+        from pytesseract import TesseractError
+
+        _EngineStubs(monkeypatch, paddle={}, tesseract={})
+
+        def broken_paddle(images):
+            raise RuntimeError("paddle crashed")
+
+        def broken_tesseract(image):
+            raise TesseractError(1, "page unreadable")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_pages_with_paddle", broken_paddle)
+        monkeypatch.setattr(ocr_extract, "_ocr_page_with_tesseract", broken_tesseract)
+        with pytest.raises(TesseractError):
+            ocr_extract._race_ocr_engines([_named_page("p1")])
+
+    def test_paddle_failure_falls_back_to_tesseract(self, monkeypatch):
+        _EngineStubs(monkeypatch, paddle={}, tesseract={"p1": GOOD})
+
+        def broken(images):
+            raise RuntimeError("paddle crashed")
+
+        monkeypatch.setattr(ocr_extract, "_ocr_pages_with_paddle", broken)
+        assert ocr_extract._ocr_rendered_pages([_named_page("p1")], [1], "race")[0]["engine"] == "pytesseract"
+
+
+class TestLearnedEnginePreference:
+    """Ordered mode tries Tesseract first on layouts where it keeps winning."""
+
+    def test_tesseract_first_after_winning_streak(self, monkeypatch, fresh_engine_preference):
+        stubs = _EngineStubs(monkeypatch, paddle={"acme": LOW}, tesseract={"acme": GOOD})
+        for _ in range(3):
+            page = ocr_extract._ocr_rendered_pages([_named_page("acme")], [1], "learn")[0]
+            ocr_extract._learn_engine_wins([page])
+            assert page["metadata"]["ocr_strategy"] == "paddleocr_first"
+        assert len(stubs.paddle_calls) == 3
+
+        page = ocr_extract._ocr_rendered_pages([_named_page("acme")], [1], "learn")[0]
+        assert page["metadata"]["ocr_strategy"] == "pytesseract_first"
+        assert page["engine"] == "pytesseract" and page["text"] == GOOD[0]
+        assert stubs.paddle_calls[3:] == [[]]
+
+    def test_preference_is_per_layout(self, monkeypatch, fresh_engine_preference):
+        stubs = _EngineStubs(monkeypatch, paddle={"acme": LOW, "other": GOOD}, tesseract={"acme": GOOD, "other": GOOD})
+        signature = ocr_extract.layout_signature(_named_page("acme"))
+        for _ in range(3):
+            fresh_engine_preference.record(signature, "pytesseract")
+        pages = ocr_extract._ocr_rendered_pages(
+            [_named_page("acme"), _named_page("other", header_box=(200, 20, 380, 90))], [1, 2], "learn"
+        )
+        assert [page["metadata"]["ocr_strategy"] for page in pages] == ["pytesseract_first", "paddleocr_first"]
+        assert stubs.paddle_calls == [["other"]]
+        assert stubs.tesseract_calls == ["acme"]
+
+    def test_rejected_tesseract_first_page_goes_to_paddle(self, monkeypatch, fresh_engine_preference):
+        stubs = _EngineStubs(monkeypatch, paddle={"acme": GOOD}, tesseract={"acme": LOW})
+        for _ in range(3):
+            fresh_engine_preference.record(ocr_extract.layout_signature(_named_page("acme")), "pytesseract")
+        page = ocr_extract._ocr_rendered_pages([_named_page("acme")], [1], "learn")[0]
+        assert page["engine"] == "paddleocr"
+        assert stubs.tesseract_calls == ["acme"]
+        ocr_extract._learn_engine_wins([page])
+        assert fresh_engine_preference.preferred_engine(page["metadata"]["layout_signature"]) is None
+
+    def test_exploration_lets_paddle_win_the_layout_back(self, monkeypatch):
+        from ocr.engine_preference import EnginePreference
+
+        preference = EnginePreference(explore_every=2)
+        monkeypatch.setattr(ocr_extract, "get_engine_preference", lambda: preference)
+        signature = ocr_extract.layout_signature(_named_page("acme"))
+        for _ in range(3):
+            preference.record(signature, "pytesseract")
+        # The scans improved: both engines now read the layout well.
+        stubs = _EngineStubs(monkeypatch, paddle={"acme": GOOD}, tesseract={"acme": GOOD})
+
+        strategies, engines = [], []
+        for _ in range(5):
+            page = ocr_extract._ocr_rendered_pages([_named_page("acme")], [1], "learn")[0]
+            ocr_extract._learn_engine_wins([page])
+            strategies.append(page["metadata"]["ocr_strategy"])
+            engines.append(page["engine"])
+
+        assert strategies == ["pytesseract_first", "paddleocr_first", "paddleocr_first", "paddleocr_first", "paddleocr_first"]
+        assert engines == ["pytesseract", "paddleocr", "paddleocr", "paddleocr", "paddleocr"]
+        assert preference.stats()["preferred"] == {"paddleocr": 1}
+        assert stubs.paddle_calls[0] == []
+
+    def test_uncertain_tesseract_page_is_offered_to_paddle(self, monkeypatch, fresh_engine_preference):
+        signature = ocr_extract.layout_signature(_named_page("acme"))
+        for _ in range(3):
+            fresh_engine_preference.record(signature, "pytesseract")
+        stubs = _EngineStubs(monkeypatch, paddle={"acme": GOOD}, tesseract={"acme": ("Laptop 2 45000", 0.55)})
+
+        page = ocr_extract._ocr_rendered_pages([_named_page("acme")], [1], "learn")[0]
+        ocr_extract._learn_engine_wins([page])
+
+        assert page["metadata"]["ocr_strategy"] == "pytesseract_first"
+        assert (page["text"], page["engine"]) == (GOOD[0], "paddleocr")
+        assert stubs.paddle_calls == [["acme"]]
+        assert fresh_engine_preference.preferred_engine(signature) is None
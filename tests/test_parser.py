@@ -19,11 +19,14 @@ if _PROJECT_ROOT not in sys.path:
     sys.path.insert(0, _PROJECT_ROOT)
 
 from parser.line_items import (
+    LineItemStream,
+    _RowTokens,
     extract_line_items,
     extract_line_items_with_diagnostics,
     extract_totals,
     build_structured_document,
 )
+from parser.row_trace import row_trace, row_trace_predicate
 from tests.conftest import (
     CLEAN_INVOICE_OCR,
     CORRUPTED_OCR_TEXT,
@@ -206,3 +209,193 @@ class TestBuildStructuredDocument:
         assert doc["line_items"] == []
         assert doc["line_item_count"] == 0
         assert doc["failure_reason"] == "no rows found"
+
+    def test_grand_total_line_stays_off_the_last_row(self):
+        text = "Item | Qty | Rate | Amount\nMouse | 20 | 500 | 10000\nGrand Total: 10000"
+        doc = build_structured_document(text)
+        assert [item["item"] for item in doc["line_items"]] == ["mouse"]
+
+
+# ---------------------------------------------------------------------------
+# Page-by-page parsing
+# ---------------------------------------------------------------------------
+
+class TestLineItemStream:
+    """Streaming pages must parse exactly like the joined document text."""
+
+    @staticmethod
+    def _assert_matches_joined(pages):
+        joined = "\n\n".join(pages)
+        assert build_structured_document(pages) == build_structured_document(joined)
+
+    def test_pages_match_joined_text(self):
+        self._assert_matches_joined(CLEAN_INVOICE_OCR.strip().split("\n\n"))
+        self._assert_matches_joined(GST_INVOICE_OCR.strip().split("\n\n"))
+
+    def test_header_on_later_page_reparses_earlier_rows(self):
+        self._assert_matches_joined(
+            ["Laptop | 10 | 45000 | 450000", "Item | Qty | Rate | Amount\nMouse | 20 | 500 | 10000"]
+        )
+
+    def test_items_marker_on_later_page_drops_earlier_rows(self):
+        pages = ["Laptop qty 2 price 500", "Items:\nMouse qty 3 price 20"]
+        self._assert_matches_joined(pages)
+        items = build_structured_document(pages)["line_items"]
+        assert [item["item"].lower() for item in items] == ["mouse"]
+
+    def test_accepts_page_dicts(self):
+        pages = [{"page_number": 1, "text": part} for part in DUPLICATE_ITEMS_OCR.strip().split("\n\n")]
+        assert build_structured_document(iter(pages)) == build_structured_document(DUPLICATE_ITEMS_OCR.strip())
+
+    def test_finish_matches_diagnostics(self):
+        stream = LineItemStream(confidence=0.9)
+        for part in CLEAN_INVOICE_OCR.strip().split("\n\n"):
+            stream.add_page(part)
+        assert stream.finish() == extract_line_items_with_diagnostics(CLEAN_INVOICE_OCR.strip(), confidence=0.9)
+
+    def test_no_pages(self):
+        assert build_structured_document([])["failure_reason"] == "no rows found"
+
+
+# ---------------------------------------------------------------------------
+# Structured table rows
+# ---------------------------------------------------------------------------
+
+class TestTableRows:
+    """Rows of a structured table are typed by their header's columns."""
+
+    @staticmethod
+    def _page(rows, text=""):
+        return {"page_number": 1, "text_outside_tables": text, "tables": [{"rows": rows}]}
+
+    def test_cells_mapped_by_header(self):
+        rows = [
+            ["Sl", "Description", "HSN", "Qty", "Rate", "Amount"],
+            ["1", "HP 250 G8 Laptop", "8471", "2", "45,000.00", "90,000.00"],
+        ]
+        items = build_structured_document([self._page(rows)])["line_items"]
+
+        assert len(items) == 1
+        assert items[0]["qty"] == 2
+        assert items[0]["price"] == 45000
+        assert items[0]["total"] == 90000
+        assert items[0]["parse_strategy"] == "table"
+        assert "laptop" in items[0]["item"].lower()
+
+    def test_tax_rows_skipped(self):
+        rows = [["Item", "Qty", "Rate", "Amount"], ["Mouse", "20", "500", "10000"], ["CGST 9%", "", "", "900"]]
+        doc = build_structured_document([self._page(rows)])
+
+        assert [item["item"].lower() for item in doc["line_items"]] == ["mouse"]
+        assert [row["raw"] for row in doc["skipped_rows"]] == ["CGST 9% | 900"]
+
+    def test_table_without_header_parsed_as_text_rows(self):
+        rows = [["Laptop", "10", "45000", "450000"]]
+        items = build_structured_document([self._page(rows)])["line_items"]
+
+        assert items[0]["qty"] == 10
+        assert items[0]["parse_strategy"] == "columnar"
+
+    def test_headerless_table_continues_previous_table(self):
+        header = ["Description", "HSN", "Qty", "Amount"]
+        pages = [
+            self._page([header, ["Laptop", "8471", "2", "90000"]]),
+            self._page([["Mouse", "8471", "4", "2000"]]),
+        ]
+        items = build_structured_document(pages)["line_items"]
+
+        assert [(item["item"], item["qty"], item["total"]) for item in items] == [
+            ("laptop", 2, 90000),
+            ("mouse", 4, 2000),
+        ]
+        assert {item["parse_strategy"] for item in items} == {"table"}
+
+    def test_same_width_unrelated_table_does_not_continue(self):
+        header = ["Description", "HSN", "Qty", "Amount"]
+        pages = [
+            self._page([header, ["Laptop", "8471", "2", "90000"]]),
+            self._page([["Bank Name", "HDFC Bank", "Account No", "50100012345678"], ["Branch", "Andheri", "IFSC", "HDFC0000123"]]),
+        ]
+        items = build_structured_document(pages)["line_items"]
+
+        assert [item["parse_strategy"] for item in items if item["item"] != "laptop"] == ["columnar"]
+
+    def test_only_a_table_opening_the_next_page_continues(self):
+        header = ["Description", "HSN", "Qty", "Amount"]
+        stream = LineItemStream()
+        stream.add_page("", [{"rows": [header, ["Laptop", "8471", "2", "90000"]]}, {"rows": [["Note", "", "", ""]]}])
+        stream.add_page("", [{"rows": [["Mouse", "8471", "4", "2000"]]}])
+        items = stream.finish()["items"]
+
+        assert [item["parse_strategy"] for item in items] == ["table", "columnar"]
+
+    def test_text_includes_tables_once(self):
+        rows = [["Item", "Qty", "Rate"], ["Mouse", "20", "500"]]
+        stream = LineItemStream()
+        stream.add_page("Invoice No: 7", [{"rows": rows}])
+
+        assert stream.text == "Invoice No: 7\nItem | Qty | Rate\nMouse | 20 | 500"
+
+
+# ---------------------------------------------------------------------------
+# Row tokenization
+# ---------------------------------------------------------------------------
+
+class TestRowTokens:
+    """A row is tokenized once and shared by every extractor."""
+
+    def test_typed_tokens(self):
+        row = _RowTokens("Laptop | qty 10 | Rs. 450 | 18%")
+
+        assert [(entry["kind"], entry["value"]) for entry in row.numbers] == [
+            ("numeric", 10),
+            ("currency", 450),
+            ("percent", 18),
+        ]
+        assert [kind for _, kind in row.words][:3] == ["word", "pipe", "label"]
+        assert row.cells == ["Laptop", "qty 10", "Rs. 450", "18%"]
+        assert row.item_name == "laptop"
+
+    def test_tokens_computed_once(self):
+        row = _RowTokens("Mouse qty 2 price 500")
+        assert row.numbers is row.numbers
+        assert row.words is row.words
+
+
+# ---------------------------------------------------------------------------
+# Row tracing
+# ---------------------------------------------------------------------------
+
+class TestRowTrace:
+    """Selected rows are traced only inside a row_trace block."""
+
+    TEXT = "Item | Qty | Rate | Amount\nLaptop | 10 | 45000 | 450000\nMonitor | 5 | 12000 | 60000"
+
+    @staticmethod
+    def _trace_records(caplog):
+        return [record.getMessage() for record in caplog.records if record.getMessage().startswith("[ROW-TRACE]")]
+
+    def test_traces_matching_rows(self, caplog):
+        caplog.set_level("INFO", logger="parser.line_items")
+        with row_trace("monitor"):
+            build_structured_document(self.TEXT)
+
+        records = self._trace_records(caplog)
+        assert len(records) == 1
+        assert "row='Monitor | 5 | 12000 | 60000'" in records[0]
+        assert "outcome=parsed" in records[0]
+        assert "rows_before=['Item | qty | rate | Amount', 'Laptop | 10 | 45000 | 450000']" in records[0]
+
+    def test_off_by_default(self, caplog):
+        caplog.set_level("INFO", logger="parser.line_items")
+        build_structured_document(self.TEXT)
+
+        assert self._trace_records(caplog) == []
+        assert row_trace_predicate() is None
+
+    def test_predicate_callable(self, caplog):
+        caplog.set_level("INFO", logger="parser.line_items")
+        with row_trace(lambda row: row.startswith("Laptop")):
+            build_structured_document(self.TEXT)
+
+        assert [record.split()[1] for record in self._trace_records(caplog)] == ["row='Laptop"]
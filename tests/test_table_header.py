@@ -0,0 +1,134 @@
+"""Tests for parser/table_header.py — table header detection and learned layouts."""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from parser import build_structured_document
+from parser import table_header
+from parser.table_header import HeaderLayouts, detect_header_columns
+
+
+class TestHeaderColumns:
+    @pytest.mark.parametrize(
+        "cells, expected",
+        [
+            (["Item", "Qty", "Rate", "Amount"], {"item": 0, "qty": 1, "price": 2, "total": 3}),
+            (["Descrlption", "Qnty", "Rate", "Amt"], {"item": 0, "qty": 1, "price": 2, "total": 3}),
+            (["Particu1ars", "Quantlty", "Amount"], {"item": 0, "qty": 1, "total": 2}),
+            (["S.No", "Descrlption", "Qnty", "Unit Prlce", "Amt"], {"item": 1, "qty": 2, "price": 3, "total": 4}),
+            (["Sl", "Description", "HSN/SAC", "Taxable Value", "CGST"], {"item": 1, "hsn": 2, "taxable": 3, "gst": 4}),
+        ],
+    )
+    def test_headers(self, cells, expected):
+        assert HeaderLayouts().columns(cells) == expected
+
+    @pytest.mark.parametrize(
+        "cells",
+        [
+            ["Laptop", "10", "45000"],
+            ["Mouse", "Keyboard"],
+            ["Amt 500", "Qnty 2"],
+            ["Product", "Monitor"],
+            ["Shipping Amt", "Descriptlon"],
+            ["Total Amt payable", "Descrlption of goods", "Qnty"],
+        ],
+    )
+    def test_data_rows_are_not_headers(self, cells):
+        assert HeaderLayouts().columns(cells) is None
+
+    def test_keyword_column_kept_over_misread_word(self):
+        assert HeaderLayouts().columns(["Item", "Product", "Qty"]) == {"item": 0, "qty": 2}
+
+    def test_detect_header_columns_uses_first_header_row(self):
+        text = "Invoice No: 7\nLaptop | 10 | 45000\nDescrlption | Qnty | Amt\nMouse | 2 | 1000"
+        assert detect_header_columns(text) == {"item": 0, "qty": 1, "total": 2}
+
+
+class TestLearnedLayouts:
+    def test_known_layout_skips_inference(self, monkeypatch):
+        layouts = HeaderLayouts()
+        calls = []
+        real_infer = table_header._infer_header_columns
+
+        def counting_infer(cells):
+            calls.append(cells)
+            return real_infer(cells)
+
+        monkeypatch.setattr(table_header, "_infer_header_columns", counting_infer)
+        first = layouts.columns(["Unit  Price ", "Description", "Qnty"])
+        first["item"] = 5
+        assert layouts.columns(["unit price", "DESCRIPTION", " qnty"]) == {"price": 0, "item": 1, "qty": 2}
+        assert len(calls) == 1
+        assert layouts.stats() == {
+            "layouts": 1,
+            "max_layouts": 1024,
+            "non_headers": 0,
+            "max_non_headers": 4096,
+            "hits": 1,
+            "misses": 1,
+        }
+
+    def test_known_non_header_skips_inference(self, monkeypatch):
+        layouts = HeaderLayouts()
+        calls = []
+        real_infer = table_header._infer_header_columns
+
+        def counting_infer(cells):
+            calls.append(cells)
+            return real_infer(cells)
+
+        monkeypatch.setattr(table_header, "_infer_header_columns", counting_infer)
+        for _ in range(3):
+            assert layouts.columns(["Laptop", "10", "45000"], candidate=True) is None
+        assert len(calls) == 1
+        assert layouts.stats()["non_headers"] == 1
+
+    def test_body_rows_are_not_remembered(self):
+        layouts = HeaderLayouts()
+        for _ in range(2):
+            assert layouts.columns(["Laptop", "10", "45000"]) is None
+        stats = layouts.stats()
+        assert (stats["non_headers"], stats["misses"]) == (0, 2)
+
+    def test_detect_remembers_only_leading_pipe_rows(self):
+        layouts = table_header.get_header_layouts()
+        layouts.clear()
+        rows = [f"Laptop {row} | 10 | 45000" for row in range(6)]
+        try:
+            assert detect_header_columns("\n".join(rows)) == {}
+            assert layouts.stats()["non_headers"] == table_header._HEADER_CANDIDATE_ROWS
+        finally:
+            layouts.clear()
+
+    def test_non_headers_do_not_evict_layouts(self):
+        layouts = HeaderLayouts(max_layouts=1, max_non_headers=2)
+        layouts.columns(["Item", "Qty"])
+        for row in range(5):
+            layouts.columns([f"Laptop {row}", "10"], candidate=True)
+        stats = layouts.stats()
+        assert (stats["layouts"], stats["non_headers"]) == (1, 2)
+        layouts.columns(["Item", "Qty"])
+        assert layouts.stats()["hits"] == 1
+
+    def test_least_recently_used_layout_dropped(self):
+        layouts = HeaderLayouts(max_layouts=2)
+        layouts.columns(["Item", "Qty"])
+        layouts.columns(["Item", "Rate"])
+        layouts.columns(["Item", "Qty"])
+        layouts.columns(["Item", "Amount"])
+        assert layouts.stats()["layouts"] == 2
+        layouts.columns(["Item", "Rate"])
+        assert layouts.stats()["misses"] == 4
+
+    def test_misread_header_parses_like_clean_header(self):
+        misread = build_structured_document("Descrlption | Qnty | Amt\nLaptop | 10 | 450000")
+        clean = build_structured_document("Description | Qty | Amount\nLaptop | 10 | 450000")
+        assert misread["line_items"] == clean["line_items"]
+        assert misread["line_items"][0]["parse_strategy"] == "columnar"
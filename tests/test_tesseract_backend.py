@@ -0,0 +1,138 @@
+"""Tests for ocr/tesseract_backend.py — persistent tesserocr vs pytesseract.
+
+tesserocr is replaced by a minimal fake so these tests run without
+Tesseract language data installed.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+_PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, _PROJECT_ROOT)
+
+from ocr import tesseract_backend
+from ocr.engine_pool import OcrEnginePool
+
+
+class _FakeWord:
+    def __init__(self, text, conf, box):
+        self.text, self.conf, self.box = text, conf, box
+
+    def GetUTF8Text(self, level):
+        return self.text
+
+    def Confidence(self, level):
+        return self.conf
+
+    def BoundingBox(self, level):
+        return self.box
+
+
+class _FakeApi:
+    instances: list = []
+
+    def __init__(self, psm=None, lang=None, oem=None, path=None):
+        self.psm = psm
+        self.images = 0
+        self.cleared = 0
+        _FakeApi.instances.append(self)
+
+    def SetImage(self, image):
+        self.images += 1
+
+    def Recognize(self):
+        return True
+
+    def GetIterator(self):
+        return [
+            _FakeWord("Laptop", 91.5, (10, 20, 60, 35)),
+            _FakeWord("", 0.0, None),
+            _FakeWord("45000", 88.0, (70, 20, 120, 35)),
+        ]
+
+    def DetectOrientationScript(self):
+        return {"orient_deg": 90, "orient_conf": 12.5, "script_name": "Latin", "script_conf": 3.0}
+
+    def Clear(self):
+        self.cleared += 1
+
+    def End(self):
+        pass
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    _FakeApi.instances = []
+    fake = SimpleNamespace(
+        PyTessBaseAPI=_FakeApi,
+        PSM=SimpleNamespace(SINGLE_BLOCK=6, OSD_ONLY=0),
+        OEM=SimpleNamespace(DEFAULT=3),
+        RIL=SimpleNamespace(WORD=3),
+        iterate_level=lambda iterator, level: iter(iterator),
+        tesseract_version=lambda: "tesseract 5.5.1\n leptonica-1.85.0",
+    )
+    monkeypatch.setattr(tesseract_backend, "tesserocr", fake)
+    monkeypatch.setattr(tesseract_backend, "_BACKEND", "auto")
+    pool = OcrEnginePool(tesseract_backend._create_tesserocr_engine, size=1, name="tesseract")
+    monkeypatch.setattr(tesseract_backend, "_ENGINE_POOL", pool)
+    return fake
+
+
+class TestTesserocrBackend:
+    """Verify the persistent engine is reused and matches pytesseract's layout."""
+
+    def test_image_to_data_uses_one_persistent_api(self, fake_tesserocr, monkeypatch):
+        monkeypatch.setattr(tesseract_backend.pytesseract, "image_to_data", pytest.fail)
+        image = Image.new("L", (200, 50), 255)
+
+        first = tesseract_backend.image_to_data(image)
+        tesseract_backend.image_to_data(image)
+
+        assert first["text"] == ["Laptop", "45000"]
+        assert first["conf"] == [91.5, 88.0]
+        assert first["width"] == [50, 50]
+        assert len(_FakeApi.instances) == 1
+        assert _FakeApi.instances[0].images == 2
+        assert _FakeApi.instances[0].cleared == 2
+        assert tesseract_backend.backend_name() == "tesserocr"
+
+    def test_orientation_reports_correction_angle(self, fake_tesserocr):
+        osd = tesseract_backend.detect_orientation(Image.new("L", (50, 50), 255))
+        assert osd["rotate"] == 270
+        assert osd["script"] == "Latin"
+        assert [api.psm for api in _FakeApi.instances] == [6, 0]
+
+    def test_falls_back_to_pytesseract_when_init_fails(self, fake_tesserocr, monkeypatch):
+        def broken_api(**kwargs):
+            raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+
+        monkeypatch.setattr(fake_tesserocr, "PyTessBaseAPI", broken_api)
+        monkeypatch.setattr(tesseract_backend, "_initialize_tesseract", lambda: None)
+        monkeypatch.setattr(
+            tesseract_backend.pytesseract,
+            "image_to_data",
+            lambda image, config, output_type: {"text": ["via-subprocess"], "conf": ["90"]},
+        )
+
+        data = tesseract_backend.image_to_data(Image.new("L", (10, 10)))
+
+        assert data["text"] == ["via-subprocess"]
+        assert tesseract_backend.backend_name() == "pytesseract"
+
+    def test_pytesseract_backend_never_builds_engines(self, fake_tesserocr, monkeypatch):
+        monkeypatch.setattr(tesseract_backend, "_BACKEND", "pytesseract")
+        assert tesseract_backend._create_tesserocr_engine() is None
+        assert _FakeApi.instances == []
+
+    def test_page_ocr_reads_backend_word_data(self, fake_tesserocr):
+        from ocr import extract as ocr_extract
+
+        text, confidence = ocr_extract._ocr_page_with_tesseract(Image.new("L", (200, 50), 255))
+        assert text == "Laptop 45000"
+        assert confidence == pytest.approx(0.8975)